@@ -40,6 +40,7 @@ class EngineeringMicroorganismIdentificationAgent:
             #    - "多氯联苯" -> "Polychlorinated biphenyls"
             # 3. 特别注意：如果识别到的污染物名称已经是英文，则保留原文不进行翻译
             # 4. 使用翻译后的标准科学术语（或保留的英文原文）作为pollutant_name参数调用数据查询工具
+            # 5. 任务描述中"本地词典按字面匹配给出的候选污染物"仅供参考，需结合上下文核实后再使用
             
             # 工具使用规范（严格遵守以下格式）：
             # - Action: PollutantDataQueryTool
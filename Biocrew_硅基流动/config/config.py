@@ -30,10 +30,106 @@ class Config:
     PROJECT_NAME = "BioCrew"
     VERSION = "1.0.0"
     
-    # 数据库配置
+    # 数据库配置（DB_TYPE: postgresql, mysql, sqlite, duckdb；后两者读取本地离线快照）
     DB_TYPE = os.getenv('DB_TYPE', 'postgresql')
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_PORT = int(os.getenv('DB_PORT', '5432'))
     DB_NAME = os.getenv('DB_NAME', 'Bio_data')
     DB_USER = os.getenv('DB_USER', 'nju_bio')
-    DB_PASSWORD = os.getenv('DB_PASSWORD', '980605Hyz')
\ No newline at end of file
+    DB_PASSWORD = os.getenv('DB_PASSWORD', '980605Hyz')
+    # 数据库连接池配置（所有数据库工具共享同一个连接池）
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '5'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '10'))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '30000'))
+
+    # 查询结果缓存配置（基因/微生物数据查询工具共享）
+    QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'True').lower() == 'true'
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '512'))
+    QUERY_CACHE_TTL = int(os.getenv('QUERY_CACHE_TTL', '600'))
+    QUERY_CACHE_VERSION_CHECK_INTERVAL = int(os.getenv('QUERY_CACHE_VERSION_CHECK_INTERVAL', '30'))
+
+    # 污染物名称内存索引配置
+    NAME_INDEX_ENABLED = os.getenv('NAME_INDEX_ENABLED', 'True').lower() == 'true'
+    NAME_INDEX_REFRESH_INTERVAL = int(os.getenv('NAME_INDEX_REFRESH_INTERVAL', '600'))
+    # 查询名称不在索引中时返回的相似候选名称数量和最低相似度（只作为建议，不替换查询名称）
+    NAME_INDEX_SUGGEST_LIMIT = int(os.getenv('NAME_INDEX_SUGGEST_LIMIT', '5'))
+    NAME_INDEX_SUGGEST_MIN_SCORE = float(os.getenv('NAME_INDEX_SUGGEST_MIN_SCORE', '0.4'))
+    # 污染物别名表（pollutant_aliases）配置
+    POLLUTANT_ALIAS_ENABLED = os.getenv('POLLUTANT_ALIAS_ENABLED', 'True').lower() == 'true'
+    # 污染物中英文词典配置（在任务描述中注入识别出的标准英文名称；扩展词典为CSV，表头 term,english_name）
+    POLLUTANT_DICTIONARY_ENABLED = os.getenv('POLLUTANT_DICTIONARY_ENABLED', 'True').lower() == 'true'
+    POLLUTANT_DICTIONARY_PATH = os.getenv('POLLUTANT_DICTIONARY_PATH', '')
+
+    # 数据库工具输出配置（控制写入智能体上下文的数据量）
+    TOOL_OUTPUT_DEFAULT_PROFILE = os.getenv('TOOL_OUTPUT_DEFAULT_PROFILE', 'evidence')
+    TOOL_OUTPUT_MAX_BYTES = int(os.getenv('TOOL_OUTPUT_MAX_BYTES', '8000'))
+    TOOL_OUTPUT_MAX_TEXT_LENGTH = int(os.getenv('TOOL_OUTPUT_MAX_TEXT_LENGTH', '160'))
+
+    # 分页查询配置（genes_data/organism_data按主键做keyset分页，DB_PRIMARY_KEY列不存在时自动检测表主键）
+    DB_PRIMARY_KEY = os.getenv('DB_PRIMARY_KEY', 'id')
+    DB_MAX_PAGE_SIZE = int(os.getenv('DB_MAX_PAGE_SIZE', '200'))
+    DB_STREAM_BATCH_SIZE = int(os.getenv('DB_STREAM_BATCH_SIZE', '1000'))
+
+    # 数据库并发查询线程数（PollutantDataQueryTool同时查询基因和微生物数据）
+    DB_QUERY_WORKERS = int(os.getenv('DB_QUERY_WORKERS', '4'))
+
+    # 污染物统计表配置
+    ORGANISM_NAME_COLUMN = os.getenv('ORGANISM_NAME_COLUMN', 'organism_name')
+    POLLUTANT_STATS_TOP_ORGANISMS = int(os.getenv('POLLUTANT_STATS_TOP_ORGANISMS', '5'))
+
+    # 离线快照配置（DB_TYPE为sqlite或duckdb时使用，相对路径以项目根目录为基准）
+    DB_SNAPSHOT_PATH = os.getenv('DB_SNAPSHOT_PATH', 'data/bio_data_snapshot.db')
+
+    # 启动时检查数据库工具查询模板的执行计划，出现全表扫描时打印警告
+    DB_PLAN_CHECK_ON_STARTUP = os.getenv('DB_PLAN_CHECK_ON_STARTUP', 'True').lower() == 'true'
+
+    # KEGG响应磁盘缓存配置（相对路径以项目根目录为基准；离线模式只读缓存，不访问网络）
+    KEGG_CACHE_ENABLED = os.getenv('KEGG_CACHE_ENABLED', 'True').lower() == 'true'
+    KEGG_CACHE_PATH = os.getenv('KEGG_CACHE_PATH', 'data/kegg_cache.sqlite')
+    KEGG_CACHE_MAX_MB = int(os.getenv('KEGG_CACHE_MAX_MB', '256'))
+    KEGG_OFFLINE = os.getenv('KEGG_OFFLINE', 'False').lower() == 'true'
+
+    # KEGG并发请求数（批量获取条目时的线程数，KEGG限制约每秒3次请求）
+    KEGG_MAX_WORKERS = int(os.getenv('KEGG_MAX_WORKERS', '3'))
+
+    # KEGG请求传输配置（每秒请求数、连接池大小、超时和截止时间（秒）、403/429/5xx重试次数和退避基数（秒））
+    KEGG_RATE_LIMIT = float(os.getenv('KEGG_RATE_LIMIT', '3'))
+    KEGG_POOL_SIZE = int(os.getenv('KEGG_POOL_SIZE', '6'))
+    KEGG_CONNECT_TIMEOUT = float(os.getenv('KEGG_CONNECT_TIMEOUT', '5'))
+    KEGG_READ_TIMEOUT = float(os.getenv('KEGG_READ_TIMEOUT', '30'))
+    KEGG_REQUEST_DEADLINE = float(os.getenv('KEGG_REQUEST_DEADLINE', '60'))
+    KEGG_MAX_RETRIES = int(os.getenv('KEGG_MAX_RETRIES', '4'))
+    KEGG_BACKOFF_BASE = float(os.getenv('KEGG_BACKOFF_BASE', '0.5'))
+
+    # KEGG关联关系本地镜像（由 python -m tools.kegg_link_mirror import 生成，文件不存在时使用REST接口）
+    KEGG_LINK_MIRROR_ENABLED = os.getenv('KEGG_LINK_MIRROR_ENABLED', 'True').lower() == 'true'
+    KEGG_LINK_MIRROR_PATH = os.getenv('KEGG_LINK_MIRROR_PATH', 'data/kegg_links.sqlite')
+
+    # KEGG条目结构化记录中列表/字典字段保留的最大条目数（0表示不截断）
+    KEGG_ENTRY_MAX_ITEMS = int(os.getenv('KEGG_ENTRY_MAX_ITEMS', '50'))
+
+    # KEGG列表/关联流式读取配置（智能体调用时默认返回的条数、可写入缓存的最大响应大小（MB））
+    KEGG_STREAM_DEFAULT_LIMIT = int(os.getenv('KEGG_STREAM_DEFAULT_LIMIT', '100'))
+    KEGG_STREAM_CACHE_MAX_MB = int(os.getenv('KEGG_STREAM_CACHE_MAX_MB', '16'))
+
+    # KEGG降解路线搜索配置（最大反应步数、反应图化合物数上限、有基因证据的反应边权系数、读取的基因记录数）
+    KEGG_PATHFINDER_MAX_DEPTH = int(os.getenv('KEGG_PATHFINDER_MAX_DEPTH', '6'))
+    KEGG_PATHFINDER_MAX_COMPOUNDS = int(os.getenv('KEGG_PATHFINDER_MAX_COMPOUNDS', '400'))
+    KEGG_PATHFINDER_EVIDENCE_WEIGHT = float(os.getenv('KEGG_PATHFINDER_EVIDENCE_WEIGHT', '0.3'))
+    KEGG_PATHFINDER_EVIDENCE_ROWS = int(os.getenv('KEGG_PATHFINDER_EVIDENCE_ROWS', '200'))
+
+    # EnviPath客户端配置（创建工具时是否在后台预热客户端、调用时等待初始化的最长时间（秒）、初始化失败后的重试间隔（秒））
+    ENVIPATH_WARMUP = os.getenv('ENVIPATH_WARMUP', 'True').lower() == 'true'
+    ENVIPATH_INIT_TIMEOUT = float(os.getenv('ENVIPATH_INIT_TIMEOUT', '30'))
+    ENVIPATH_RETRY_AFTER = float(os.getenv('ENVIPATH_RETRY_AFTER', '300'))
+
+    # EnviPath搜索配置（搜索使用的包ID或完整URL，默认EAWAG-BBD；搜索结果缓存开关、文件路径、总大小上限（MB）和有效期（秒））
+    ENVIPATH_PACKAGE_ID = os.getenv('ENVIPATH_PACKAGE_ID', '32de3cf4-e3e6-4168-956e-32fa5ddb0ce1')
+    ENVIPATH_CACHE_ENABLED = os.getenv('ENVIPATH_CACHE_ENABLED', 'True').lower() == 'true'
+    ENVIPATH_CACHE_PATH = os.getenv('ENVIPATH_CACHE_PATH', 'data/envipath_cache.sqlite')
+    ENVIPATH_CACHE_MAX_MB = int(os.getenv('ENVIPATH_CACHE_MAX_MB', '64'))
+    ENVIPATH_SEARCH_TTL = int(os.getenv('ENVIPATH_SEARCH_TTL', str(7 * 24 * 3600)))
@@ -4,6 +4,9 @@
 负责根据水质净化目标识别工程微生物组
 """
 
+from config.config import Config
+from tools.pollutant_dictionary import extract_pollutants
+
 class MicroorganismIdentificationTask:
     def __init__(self, llm):
         self.llm = llm
@@ -40,6 +43,7 @@ class MicroorganismIdentificationTask:
           · pollutant_summary_tool._run({"pollutant_name": "标准名"})
           · envipath_tool._run({"operation": "search_compound", "compound_name": "标准名"})
           · kegg_tool._run({"operation": "find_entries", "database": "genes", "keywords": "标准关键词"})
+          · kegg_pathfinder_tool._run({"pollutant": "标准名", "k": 5})（降解途径假设优先以返回的候选路线及EC/KO为依据）
         - 调用前先在答案中写出：ToolJustification（≤30字），并严格使用双引号；
         - 对单一污染物，最多尝试 2–3 个名称变体（原文/翻译/常见别名）。
 
@@ -68,6 +72,7 @@ class MicroorganismIdentificationTask:
         # 添加用户自定义需求到描述中
         if user_requirement:
             description += f"\n\n用户具体需求：{user_requirement}"
+            description += self._format_recognized_pollutants(user_requirement)
         
         if feedback:
             description += f"\n\n根据评估反馈进行优化设计：\n{feedback}"
@@ -118,4 +123,31 @@ class MicroorganismIdentificationTask:
         if context_task:
             task_params['context'] = [context_task]
             
-        return Task(**task_params)
\ No newline at end of file
+        return Task(**task_params)
+
+    @staticmethod
+    def _format_recognized_pollutants(user_requirement):
+        """
+        使用本地中英文词典识别用户需求中的候选污染物，生成注入任务描述的参考映射（由模型核实）
+        
+        Args:
+            user_requirement (str): 用户需求原文
+            
+        Returns:
+            str: 污染物映射说明，未识别到污染物或词典关闭时为空字符串
+        """
+        if not Config.POLLUTANT_DICTIONARY_ENABLED:
+            return ""
+        pollutants = extract_pollutants(user_requirement)
+        if not pollutants:
+            return ""
+        lines = [
+            f'- {item["term"]} -> "{item["english_name"]}"'
+            for item in pollutants
+        ]
+        return (
+            "\n\n本地词典按字面匹配给出的候选污染物（原始表达 -> 可能的标准科学术语(英文)，仅供参考）：\n"
+            + "\n".join(lines)
+            + "\n请结合需求上下文核实这些候选是否确为目标污染物（字面匹配可能误识别或遗漏），"
+            "确认后再作为pollutant_name使用；词典未覆盖的污染物仍需自行识别。"
+        )
\ No newline at end of file
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+外部数据库工具并发基准
+启动本地录制回放服务（tests/replay_server.py），将KeggTool/EnviPathTool的base_url指向它，
+按给定并发度重复执行每种工具操作，统计吞吐量和p50/p99延迟。
+回放模式不访问外部服务，延迟和抖动由参数控制，结果可复现。
+
+用法（在项目根目录执行）:
+    # 重新录制cassette（访问真实服务，按KEGG限速逐个请求；仓库已提交KEGG的cassette）
+    python tests/benchmark_external_tools.py --record
+    # 回放基准
+    python tests/benchmark_external_tools.py --requests 200 --concurrency 8 --latency 80 --jitter 40
+    python tests/benchmark_external_tools.py --tools kegg --operations get,get_entries --json result.json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+# 添加项目根目录到Python路径（replay_server与本脚本同目录，直接导入）
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.config import Config
+from replay_server import ReplayServer
+
+# 默认cassette目录
+CASSETTE_DIR = os.path.join(project_root, "tests", "fixtures", "cassettes")
+
+# 各工具的上游地址
+UPSTREAMS = {
+    "kegg": "https://rest.kegg.jp",
+    "envipath": "https://envipath.org"
+}
+
+# 各工具的基准操作：(操作名, _run参数)
+OPERATIONS: Dict[str, List[Tuple[str, Dict]]] = {
+    "kegg": [
+        ("info", {"database": "compound"}),
+        ("list", {"database": "pathway", "organism": None, "limit": 50}),
+        ("find", {"database": "compound", "keywords": "hexachlorocyclohexane"}),
+        ("get", {"entry_id": "C07491"}),
+        ("get_entries", {"entry_ids": ["C07491", "C00042", "K01011"]}),
+        ("link", {"target_db": "pathway", "source_db_entries": "C07491"}),
+        ("conv", {"target_db": "pubchem", "source_ids": "C07491"})
+    ],
+    "envipath": [
+        ("search_compound", {"compound_name": "lindane"}),
+        ("search_pathways", {"keyword": "hexachlorocyclohexane"})
+    ]
+}
+
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    最近秩法计算百分位数
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def configure(args):
+    """
+    按基准参数覆盖配置，必须在创建工具之前调用（传输层和缓存在首次创建工具时按配置初始化）
+    """
+    # 本地服务不需要KEGG的访问频率限制，连接池与并发度一致
+    Config.KEGG_RATE_LIMIT = args.rate
+    Config.KEGG_POOL_SIZE = max(args.concurrency, 1)
+    Config.KEGG_MAX_WORKERS = max(Config.KEGG_MAX_WORKERS, args.concurrency)
+    # 关联镜像会绕过HTTP请求，基准只测量经过服务的调用
+    Config.KEGG_LINK_MIRROR_ENABLED = False
+    Config.KEGG_OFFLINE = False
+    Config.KEGG_CACHE_ENABLED = args.with_cache
+    Config.ENVIPATH_CACHE_ENABLED = args.with_cache
+    if args.with_cache:
+        # 使用临时缓存文件，避免污染或受项目缓存影响
+        cache_dir = tempfile.mkdtemp(prefix="external_bench_")
+        Config.KEGG_CACHE_PATH = os.path.join(cache_dir, "kegg_cache.sqlite")
+        Config.ENVIPATH_CACHE_PATH = os.path.join(cache_dir, "envipath_cache.sqlite")
+
+
+def create_tool(name: str, base_url: str):
+    """
+    创建指向回放服务的工具，依赖未安装时返回None
+    """
+    try:
+        if name == "kegg":
+            from tools.kegg_tool import KeggTool
+            return KeggTool(base_url=base_url)
+        from tools.envipath_tool import EnviPathTool
+        tool = EnviPathTool(base_url=base_url)
+        # 客户端在后台创建，等待完成以免初始化时间计入第一个操作
+        error = tool.warm_up().exception()
+        if error is not None:
+            raise ImportError(error)
+        return tool
+    except ImportError as e:
+        print(f"[警告] 跳过 {name}: {e}")
+        return None
+
+
+def record(tool_names: List[str], cassette_dir: str) -> int:
+    """
+    通过record模式的服务逐个执行每种操作一次，录制cassette
+    """
+    failures = 0
+    for name in tool_names:
+        cassette = os.path.join(cassette_dir, f"{name}.json")
+        with ReplayServer(cassette, "record", UPSTREAMS[name]) as server:
+            tool = create_tool(name, server.base_url)
+            if tool is None:
+                continue
+            for operation, kwargs in OPERATIONS[name]:
+                result = tool._run(**kwargs)
+                ok = result.get("status") == "success"
+                failures += not ok
+                print(f"  {'✓' if ok else '✗'} {name}.{operation}: {result.get('message', '')}")
+            print(f"  录制 {server.stats()['recorded']} 条响应 -> {cassette}")
+    return failures
+
+
+def run_operation(tool, kwargs: Dict, requests: int, concurrency: int) -> Dict:
+    """
+    以给定并发度执行requests次同一操作
+    """
+    def call(_):
+        started = time.perf_counter()
+        try:
+            ok = tool._run(**kwargs).get("status") == "success"
+        except Exception:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for latency, _ in results]
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, ok in results if not ok),
+        "elapsed": round(elapsed, 4),
+        "throughput": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="外部数据库工具并发基准（本地录制回放）")
+    parser.add_argument("--tools", default="kegg,envipath", help="逗号分隔的工具: kegg, envipath")
+    parser.add_argument("--operations", default=None, help="逗号分隔的操作名，默认全部")
+    parser.add_argument("--requests", type=int, default=100, help="每种操作的调用次数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发调用数")
+    parser.add_argument("--latency", type=float, default=50.0, help="回放延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=20.0, help="回放延迟抖动（毫秒）")
+    parser.add_argument("--seed", type=int, default=42, help="抖动随机种子")
+    parser.add_argument("--rate", type=float, default=10000.0, help="传输层每秒请求数上限")
+    parser.add_argument("--with-cache", action="store_true", help="启用响应缓存（默认关闭，测量每次请求的开销）")
+    parser.add_argument("--cassette-dir", default=CASSETTE_DIR, help="cassette目录")
+    parser.add_argument("--record", action="store_true", help="先访问真实服务录制cassette")
+    parser.add_argument("--json", default=None, help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    tool_names = [name.strip() for name in args.tools.split(",") if name.strip() in OPERATIONS]
+    selected = set(args.operations.split(",")) if args.operations else None
+
+    if args.record:
+        # 录制时遵守KEGG的访问频率限制（转发限速由服务负责），不使用缓存
+        args.with_cache = False
+        configure(args)
+        print("录制cassette:")
+        if record(tool_names, args.cassette_dir):
+            print("✗ 部分操作录制失败，回放时这些操作会计为错误")
+    else:
+        configure(args)
+
+    results = {}
+    print(f"每种操作 {args.requests} 次调用，并发 {args.concurrency}，"
+          f"回放延迟 {args.latency}±{args.jitter} 毫秒，缓存{'开启' if args.with_cache else '关闭'}:")
+    print(f"  {'操作':<28}{'吞吐量(次/秒)':>14}{'p50(ms)':>10}{'p99(ms)':>10}{'错误':>6}")
+    for name in tool_names:
+        cassette = os.path.join(args.cassette_dir, f"{name}.json")
+        if not os.path.exists(cassette):
+            print(f"[警告] 缺少 {cassette}，请先使用 --record 录制")
+            continue
+        with ReplayServer(cassette, "replay", latency_ms=args.latency, jitter_ms=args.jitter,
+                          seed=args.seed) as server:
+            tool = create_tool(name, server.base_url)
+            if tool is None:
+                continue
+            for operation, kwargs in OPERATIONS[name]:
+                if selected and operation not in selected:
+                    continue
+                result = run_operation(tool, kwargs, args.requests, args.concurrency)
+                results[f"{name}.{operation}"] = result
+                print(f"  {name + '.' + operation:<28}{result['throughput']:>14,.1f}"
+                      f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['errors']:>6}")
+            misses = server.stats()["misses"]
+            if misses:
+                print(f"[警告] {name}: {misses} 个请求在cassette中没有录制的响应")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"parameters": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+    return 1 if any(result["errors"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+污染物名称标准化微基准
+对比旧实现（逐个str.replace + 每次编译正则）、新实现（无缓存/LRU缓存）和standardize_many的吞吐量
+
+用法（在项目根目录执行）:
+    python tests/benchmark_standardize_pollutant_name.py
+    python tests/benchmark_standardize_pollutant_name.py --count 1000000 --unique 20000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from tools.pollutant_name_utils import _standardize, standardize_many, standardize_pollutant_name
+
+
+def legacy_standardize_pollutant_name(pollutant_name: str) -> str:
+    """
+    重写前的实现，仅用于对比
+    """
+    if not pollutant_name:
+        return ""
+    name = pollutant_name.lower()
+    greek_map = {
+        'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon', 'ζ': 'zeta',
+        'η': 'eta', 'θ': 'theta', 'ι': 'iota', 'κ': 'kappa', 'λ': 'lambda', 'μ': 'mu',
+        'ν': 'nu', 'ξ': 'xi', 'ο': 'omicron', 'π': 'pi', 'ρ': 'rho', 'σ': 'sigma',
+        'τ': 'tau', 'υ': 'upsilon', 'φ': 'phi', 'χ': 'chi', 'ψ': 'psi', 'ω': 'omega'
+    }
+    for greek_char, english_name in greek_map.items():
+        name = name.replace(greek_char, english_name)
+    abbreviations = {
+        'hch': 'hexachlorocyclohexane',
+        'pcb': 'polychlorinated_biphenyl',
+        'pah': 'polycyclic_aromatic_hydrocarbon'
+    }
+    for abbrev, full_name in abbreviations.items():
+        name = re.sub(r'\b' + re.escape(abbrev) + r'\b', full_name, name)
+    name = re.sub(r'[-\s]+', '_', name)
+    name = re.sub(r'[^\w]', '_', name)
+    name = re.sub(r'_+', '_', name)
+    return name.strip('_')
+
+
+def generate_names(count: int, unique: int, seed: int = 42) -> list:
+    """
+    生成测试名称：从unique个不同名称中按Zipf分布抽样，模拟工具调用中名称的重复
+    """
+    rng = random.Random(seed)
+    prefixes = ["", "alpha-", "Beta-", "β-", "γ-", "delta ", "2,4-", "p,p'-"]
+    stems = [
+        "HCH", "hexachlorocyclohexane", "PCB", "PAH", "Endrin", "Lindane", "DDT",
+        "Benzene", "Toluene", "Phenanthrene", "Atrazine", "Chlorpyrifos", "Dichlorophenol"
+    ]
+    suffixes = ["", " isomer", "-degradation", " (technical)", "_mix", " 123"]
+    pool = [
+        f"{rng.choice(prefixes)}{rng.choice(stems)}{rng.choice(suffixes)}{i if i % 3 else ''}"
+        for i in range(unique)
+    ]
+    weights = [1.0 / (rank + 1) for rank in range(unique)]
+    return rng.choices(pool, weights=weights, k=count)
+
+
+def run_case(label: str, func, names: list) -> float:
+    """
+    执行一个测试用例并打印吞吐量
+    """
+    started = time.perf_counter()
+    func(names)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<32} {elapsed:8.3f} 秒  {len(names) / elapsed:>12,.0f} 个/秒")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="污染物名称标准化微基准")
+    parser.add_argument("--count", type=int, default=1_000_000, help="标准化的名称总数")
+    parser.add_argument("--unique", type=int, default=20_000, help="不同名称的数量")
+    args = parser.parse_args()
+
+    names = generate_names(args.count, args.unique)
+    unique_names = set(names)
+
+    # 先校验新旧实现结果一致
+    mismatches = [name for name in unique_names if legacy_standardize_pollutant_name(name) != _standardize(name)]
+    if mismatches:
+        print(f"✗ 新旧实现结果不一致: {mismatches[:5]}")
+        return 1
+    print(f"✓ {len(unique_names)} 个不同名称的新旧实现结果一致")
+
+    print(f"标准化 {args.count:,} 个名称（{len(unique_names):,} 个不同名称）:")
+    legacy = run_case("旧实现", lambda batch: [legacy_standardize_pollutant_name(n) for n in batch], names)
+    run_case("新实现（无缓存）", lambda batch: [_standardize(n) for n in batch], names)
+    standardize_pollutant_name.cache_clear()
+    cached = run_case("standardize_pollutant_name", lambda batch: [standardize_pollutant_name(n) for n in batch], names)
+    many = run_case("standardize_many", standardize_many, names)
+    print(f"加速比: 缓存版 {legacy / cached:.1f}x，批量版 {legacy / many:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
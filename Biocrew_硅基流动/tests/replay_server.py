@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+KEGG/enviPath本地录制回放服务
+record模式将请求转发到真实服务并把响应写入cassette文件，replay模式只从cassette回放响应，
+可配置固定延迟和随机抖动（随机种子固定），使工具测试和基准测试不依赖外部服务且结果可复现。
+KeggTool/EnviPathTool通过base_url指向本服务即可。
+
+用法（在项目根目录执行）:
+    python tests/replay_server.py --mode record --upstream https://rest.kegg.jp --cassette tests/fixtures/cassettes/kegg.json
+    python tests/replay_server.py --mode replay --cassette tests/fixtures/cassettes/kegg.json --latency 80 --jitter 40
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# 录制时保存的响应头
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+# 响应体中上游地址的占位符，回放时替换为本服务地址（enviPath响应中的链接为绝对URL）
+BASE_URL_PLACEHOLDER = "{{base_url}}"
+
+
+def interaction_key(method: str, path: str, accept: Optional[str] = None) -> str:
+    """
+    生成请求的cassette键：方法、路径（含查询串），以及非默认的Accept头（enviPath按Accept返回JSON或HTML）
+    """
+    key = f"{method} {path}"
+    if accept and accept != "*/*":
+        key += f" [{accept}]"
+    return key
+
+
+class Cassette:
+    """
+    保存录制响应的JSON文件（线程安全，键排序写入以便比较差异）
+    """
+
+    def __init__(self, path: str):
+        """
+        加载cassette文件，文件不存在时为空
+
+        Args:
+            path (str): cassette文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.upstream = None
+        self.interactions: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.upstream = data.get("upstream")
+            self.interactions = data.get("interactions", {})
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            return self.interactions.get(key)
+
+    def put(self, key: str, interaction: Dict):
+        """
+        写入一条响应并立即保存文件（先写临时文件再替换，避免中断时损坏cassette）
+        """
+        with self._lock:
+            self.interactions[key] = interaction
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"upstream": self.upstream, "interactions": self.interactions},
+                          f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+
+def _encode_body(body: bytes, upstream: str) -> Dict:
+    """
+    文本响应体按UTF-8保存并把上游地址替换为占位符，二进制响应体按base64保存
+    """
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"body": base64.b64encode(body).decode("ascii"), "encoding": "base64"}
+    return {"body": text.replace(upstream, BASE_URL_PLACEHOLDER), "encoding": "text"}
+
+
+def _decode_body(interaction: Dict, base_url: str) -> bytes:
+    if interaction.get("encoding") == "base64":
+        return base64.b64decode(interaction["body"])
+    return interaction["body"].replace(BASE_URL_PLACEHOLDER, base_url).encode("utf-8")
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """
+    请求处理器，逻辑由所属的ReplayServer实现
+    """
+    # 支持keep-alive，使客户端连接池的行为与访问真实服务时一致
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体分两次写出，关闭Nagle算法避免与延迟确认叠加产生约40毫秒的额外延迟
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        status, headers, body = self.server.replay.handle(
+            "GET", self.path, self.headers.get("Accept"), self.headers.get("If-None-Match")
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.replay.verbose:
+            super().log_message(format, *args)
+
+
+class _ReplayHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 客户端关闭keep-alive连接属于正常情况，不打印堆栈
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class ReplayServer:
+    """
+    录制回放服务，可在后台线程中运行（用于基准测试）或作为命令行服务运行
+    """
+
+    def __init__(
+        self,
+        cassette_path: str,
+        mode: str = "replay",
+        upstream: Optional[str] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        upstream_rate: float = 3.0,
+        verbose: bool = False
+    ):
+        """
+        初始化服务
+
+        Args:
+            cassette_path (str): cassette文件路径
+            mode (str): record（转发并录制）或 replay（只回放）
+            upstream (str, optional): 上游服务地址，record模式必需，默认使用cassette中记录的地址
+            latency_ms (float): 回放时每个响应的固定延迟（毫秒）
+            jitter_ms (float): 回放延迟的随机抖动幅度（毫秒），实际延迟在 latency±jitter 之间均匀分布
+            seed (int): 抖动的随机种子
+            host (str): 监听地址
+            port (int): 监听端口，0表示由系统分配
+            upstream_rate (float): record模式下每秒转发到上游的请求数上限（KEGG限制约每秒3次）
+            verbose (bool): 是否打印每个请求的访问日志
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"不支持的模式: {mode}")
+        self.mode = mode
+        self.cassette = Cassette(cassette_path)
+        if upstream:
+            self.cassette.upstream = upstream.rstrip("/")
+        if mode == "record" and not self.cassette.upstream:
+            raise ValueError("record模式需要指定上游服务地址")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.verbose = verbose
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._upstream_interval = 1.0 / upstream_rate if upstream_rate > 0 else 0.0
+        self._upstream_lock = threading.Lock()
+        self._upstream_next = 0.0
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "replayed": 0, "recorded": 0, "not_modified": 0, "misses": 0}
+        self._httpd = _ReplayHTTPServer((host, port), _ReplayHandler)
+        self._httpd.replay = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _delay(self) -> float:
+        with self._random_lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def _record(self, key: str, path: str, accept: Optional[str]) -> Optional[Dict]:
+        """
+        转发请求到上游并录制响应（包括404等错误响应），网络错误时返回None且不录制
+        """
+        with self._upstream_lock:
+            wait = self._upstream_next - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._upstream_next = time.monotonic() + self._upstream_interval
+
+        request = urllib.request.Request(self.cassette.upstream + path, headers={"Accept": accept or "*/*"})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                status, headers, body = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, headers, body = e.code, e.headers, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            print(f"[警告] 转发请求失败: {path}: {e}", file=sys.stderr)
+            return None
+
+        interaction = {
+            "status": status,
+            "headers": {name: headers[name] for name in RECORDED_HEADERS if headers.get(name)},
+            **_encode_body(body, self.cassette.upstream)
+        }
+        self.cassette.put(key, interaction)
+        self._count("recorded")
+        return interaction
+
+    def handle(self, method: str, path: str, accept: Optional[str] = None,
+               if_none_match: Optional[str] = None):
+        """
+        处理一个请求
+
+        Args:
+            method (str): 请求方法
+            path (str): 请求路径（含查询串）
+            accept (str, optional): Accept请求头
+            if_none_match (str, optional): If-None-Match请求头，与录制的ETag一致时返回304
+
+        Returns:
+            tuple: (状态码, 响应头, 响应体)
+        """
+        self._count("requests")
+        key = interaction_key(method, path, accept)
+        interaction = self.cassette.get(key)
+        if self.mode == "record":
+            interaction = self._record(key, path, accept)
+            if interaction is None:
+                return 502, {"Content-Type": "text/plain; charset=utf-8"}, "上游请求失败".encode("utf-8")
+        else:
+            time.sleep(self._delay())
+            if interaction is None:
+                self._count("misses")
+                print(f"[警告] cassette中没有录制的响应: {key}", file=sys.stderr)
+                return 404, {"Content-Type": "text/plain; charset=utf-8", "X-Replay-Miss": "1"}, b""
+            self._count("replayed")
+
+        headers = dict(interaction["headers"])
+        etag = headers.get("ETag")
+        if self.mode == "replay" and etag and if_none_match == etag:
+            self._count("not_modified")
+            return 304, {"ETag": etag}, b""
+        return interaction["status"], headers, _decode_body(interaction, self.base_url)
+
+    def start(self) -> str:
+        """
+        在后台线程中启动服务
+
+        Returns:
+            str: 服务地址，作为工具的base_url
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        """
+        在当前线程中运行服务，直到被中断
+        """
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        """
+        停止后台服务并释放端口
+        """
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取请求、回放、录制、304和未命中次数
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def __enter__(self) -> "ReplayServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="KEGG/enviPath本地录制回放服务")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay", help="运行模式")
+    parser.add_argument("--cassette", required=True, help="cassette文件路径")
+    parser.add_argument("--upstream", default=None, help="上游服务地址（record模式），如 https://rest.kegg.jp")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.0, help="回放延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="回放延迟抖动（毫秒）")
+    parser.add_argument("--seed", type=int, default=0, help="抖动随机种子")
+    parser.add_argument("--upstream-rate", type=float, default=3.0, help="record模式下每秒转发的请求数上限")
+    args = parser.parse_args(argv)
+
+    try:
+        server = ReplayServer(
+            args.cassette, args.mode, args.upstream, args.latency, args.jitter, args.seed,
+            args.host, args.port, args.upstream_rate, verbose=True
+        )
+    except (ValueError, OSError) as e:
+        print(f"启动失败: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{args.mode}模式，cassette: {args.cassette}（{len(server.cassette)} 条响应），地址: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"统计: {server.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,10 +36,10 @@ def check_pollutant_data(pollutant_name):
     # 使用数据库工具查询数据
     print("1. 查询基因数据...")
     gene_tool = GeneDataQueryTool()
-    gene_result = gene_tool._run(pollutant_name)
+    gene_result = gene_tool._run(pollutant_name, output_format="records")
     
     if gene_result.get("status") == "success":
-        gene_data = gene_result.get("data", [])
+        gene_data = gene_result.get("data", {}).get("rows", [])
         print(f"   ✓ 基因数据查询成功，共有 {len(gene_data)} 条数据")
         if gene_data:
             # 显示前几行数据
@@ -54,10 +54,10 @@ def check_pollutant_data(pollutant_name):
     # 检查微生物数据
     print("2. 查询微生物数据...")
     organism_tool = OrganismDataQueryTool()
-    organism_result = organism_tool._run(pollutant_name)
+    organism_result = organism_tool._run(pollutant_name, output_format="records")
     
     if organism_result.get("status") == "success":
-        organism_data = organism_result.get("data", [])
+        organism_data = organism_result.get("data", {}).get("rows", [])
         print(f"   ✓ 微生物数据查询成功，共有 {len(organism_data)} 条数据")
         if organism_data:
             # 显示前几行数据
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+执行计划检查测试：模板共用一个连接，单个模板失败不影响后续检查，数据库不可达时只尝试连接一次（SQLite内存库）
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_db_schema.py
+"""
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("sqlalchemy")
+
+import sqlite3
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from tools import db_schema
+
+
+def test_failed_template_does_not_stop_later_checks():
+    # organism_data缺失：其模板报错，之后的统计表模板仍然检查
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE genes_data (id INTEGER PRIMARY KEY, pollutant_name TEXT, enzyme_type TEXT)"))
+        connection.execute(text("CREATE INDEX idx_genes_data_pollutant_name_enzyme_type ON genes_data (pollutant_name, enzyme_type)"))
+    db_schema.ensure_pollutant_stats_table(engine)
+
+    findings = {finding["name"]: finding for finding in db_schema.check_query_plans(engine)}
+
+    assert all(finding["error"] for name, finding in findings.items() if name.startswith("organism_data"))
+    genes = [finding for name, finding in findings.items() if name.startswith("genes_data")]
+    assert genes and all(not finding["error"] and not finding["full_scans"] for finding in genes)
+    stats = findings[f"{db_schema.STATS_TABLE} 主键点查"]
+    assert stats["error"] is None and stats["plan"]
+
+
+def test_unreachable_database_is_tried_once():
+    attempts = []
+
+    def refuse():
+        attempts.append(1)
+        raise sqlite3.OperationalError("connection refused")
+
+    engine = create_engine("sqlite://", creator=refuse)
+    with pytest.raises(Exception):
+        db_schema.check_query_plans(engine)
+    assert len(attempts) == 1
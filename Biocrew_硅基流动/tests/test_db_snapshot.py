@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+离线快照导出测试：快照保留源表检测到的主键，离线查询仍按主键keyset分页（SQLite文件库）
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_db_snapshot.py
+"""
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, text
+
+from config.config import Config
+from tools import pollutant_queries
+from tools.db_snapshot import export_snapshot
+
+
+def test_snapshot_keeps_detected_primary_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "QUERY_CACHE_ENABLED", False)
+    source = create_engine(f"sqlite:///{tmp_path / 'source.sqlite'}")
+    with source.begin() as connection:
+        connection.execute(text("CREATE TABLE genes_data (gene_id INTEGER PRIMARY KEY, pollutant_name TEXT, enzyme_type TEXT)"))
+        connection.execute(text("CREATE TABLE organism_data (id INTEGER PRIMARY KEY, pollutant_name TEXT, organism_type TEXT, organism_name TEXT)"))
+        for gene_id in (3, 7, 11, 20, 42):
+            connection.execute(text(
+                "INSERT INTO genes_data (gene_id, pollutant_name, enzyme_type) VALUES (:gene_id, 'lindane', 'LinA')"
+            ), {"gene_id": gene_id})
+
+    output_path = str(tmp_path / "snapshot.sqlite")
+    counts = export_snapshot(source, output_path)
+    assert counts["genes_data"] == 5
+
+    snapshot = create_engine(f"sqlite:///{output_path}")
+    assert pollutant_queries.resolve_primary_key(snapshot, "genes_data") == "gene_id"
+
+    gene_ids, after = [], None
+    while True:
+        page = pollutant_queries.fetch_pollutant_page(snapshot, "genes_data", "lindane", page_size=2, after=after)
+        gene_ids.extend(row["gene_id"] for row in page["rows"])
+        if not page["has_more"]:
+            break
+        after = page["next_cursor"]
+    assert gene_ids == [3, 7, 11, 20, 42]
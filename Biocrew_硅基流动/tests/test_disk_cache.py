@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+SQLite磁盘缓存测试：读写、TTL过期与过期兜底、LRU淘汰、跨实例持久化
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_disk_cache.py
+"""
+import os
+import sys
+import time
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from tools.disk_cache import DiskCache
+
+
+def test_set_get_and_persistence(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = DiskCache(path)
+    cache.set("https://rest.kegg.jp/get/C00042", "ENTRY C00042", 3600, namespace="get", etag='"abc"')
+
+    entry = cache.get("https://rest.kegg.jp/get/C00042")
+    assert entry.value == "ENTRY C00042" and entry.etag == '"abc"' and entry.fresh
+    assert cache.get("https://rest.kegg.jp/get/C00043") is None
+    cache.close()
+
+    reopened = DiskCache(path)
+    assert reopened.get("https://rest.kegg.jp/get/C00042").value == "ENTRY C00042"
+    assert reopened.stats()["namespaces"] == {"get": {"entries": 1, "bytes": len("ENTRY C00042")}}
+    reopened.close()
+
+
+def test_expired_entries_only_returned_when_stale_allowed(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    cache.set("key", "value", -1)
+
+    assert cache.get("key") is None
+    stale = cache.get("key", allow_stale=True)
+    assert stale.value == "value" and not stale.fresh
+
+    cache.refresh("key", 3600)
+    assert cache.get("key").fresh
+    assert cache.stats()["revalidated"] == 1
+    cache.close()
+
+
+def test_evicts_least_recently_accessed_entries(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=35)
+    for key in ("a", "b", "c"):
+        cache.set(key, "x" * 10, 3600)
+        time.sleep(0.01)
+    # 访问a后，b成为最久未访问的条目；写入d超出上限，淘汰到上限的90%只需删除b
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("d", "x" * 10, 3600)
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] == 30
+    cache.close()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+KEGG flat file解析测试，记录摘自KEGG的化合物、KO、酶和反应条目
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_kegg_flatfile.py
+"""
+import os
+import sys
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from tools.kegg_flatfile import iter_flat_records, parse_flat_record
+
+COMPOUND = """ENTRY       C00469                      Compound
+NAME        Ethanol;
+            Ethyl alcohol;
+            Methylcarbinol
+FORMULA     C2H6O
+EXACT_MASS  46.0419
+MOL_WEIGHT  46.0684
+REACTION    R00746 R00754 R02124 R04880 R05198 R06917 R06927
+            R08310 R09127 R09479 R09552
+PATHWAY     map00010  Glycolysis / Gluconeogenesis
+            map00071  Fatty acid degradation
+ENZYME      1.1.1.1         1.1.1.71        1.1.2.7         1.1.2.8
+            1.1.5.5         1.1.9.1         1.1.99.36       1.1.99.37
+DBLINKS     CAS: 64-17-5
+            PubChem: 3752
+            ChEBI: 16236
+///
+"""
+
+KO = """ENTRY       K00001                      KO
+SYMBOL      E1.1.1.1, adh
+NAME        alcohol dehydrogenase [EC:1.1.1.1]
+PATHWAY     map00010  Glycolysis / Gluconeogenesis
+            map00071  Fatty acid degradation
+DBLINKS     RN: R00623 R00754 R02124
+            COG: COG1012 COG1064
+            GO: 0004022 0004024 0004025
+GENES       HSA: 124(ADH1A) 125(ADH1B) 126(ADH1C) 127(ADH4)
+            PTR: 461394(ADH1A) 461395(ADH1B)
+///
+"""
+
+ENZYME = """ENTRY       EC 1.1.1.1                  Enzyme
+NAME        alcohol dehydrogenase;
+            aldehyde reductase;
+            ADH
+CLASS       Oxidoreductases;
+            Acting on the CH-OH group of donors;
+            With NAD+ or NADP+ as acceptor
+SYSNAME     alcohol:NAD+ oxidoreductase
+REACTION    a primary alcohol + NAD+ = an aldehyde + NADH + H+ [RN:R07326];
+            a secondary alcohol + NAD+ = a ketone + NADH + H+ [RN:R07327]
+ALL_REAC    R07326 > R00623 R00754 R02124;
+            R07327 > R02878
+PATHWAY     ec00010  Glycolysis / Gluconeogenesis
+            ec00071  Fatty acid degradation
+ORTHOLOGY   K00001  alcohol dehydrogenase
+            K00121  S-(hydroxymethyl)glutathione dehydrogenase / alcohol dehydrogenase
+GENES       HSA: 124(ADH1A) 125(ADH1B) 126(ADH1C)
+DBLINKS     ExplorEnz - The Enzyme Database: 1.1.1.1
+            IUBMB Enzyme Nomenclature: 1.1.1.1
+            CAS: 9031-72-5
+///
+"""
+
+REACTION = """ENTRY       R00754                      Reaction
+NAME        ethanol:NAD+ oxidoreductase
+DEFINITION  Ethanol + NAD+ <=> Acetaldehyde + NADH + H+
+EQUATION    C00469 + C00003 <=> C00084 + C00004 + C00080
+RCLASS      RC00050  C00084_C00469
+ENZYME      1.1.1.1         1.1.1.71
+PATHWAY     rn00010  Glycolysis / Gluconeogenesis
+            rn00071  Fatty acid degradation
+ORTHOLOGY   K00001  alcohol dehydrogenase
+            K00121  S-(hydroxymethyl)glutathione dehydrogenase / alcohol dehydrogenase
+///
+"""
+
+
+def test_compound_record():
+    record = parse_flat_record(COMPOUND, fields=["all"], max_items=0)
+    assert record["entry"] == "C00469"
+    assert record["entry_type"] == "Compound"
+    assert record["name"] == ["Ethanol", "Ethyl alcohol", "Methylcarbinol"]
+    assert record["exact_mass"] == 46.0419
+    assert record["reaction"][:2] == ["R00746", "R00754"] and len(record["reaction"]) == 11
+    assert record["enzyme"][-1] == "1.1.99.37"
+    assert record["pathway"]["map00071"] == "Fatty acid degradation"
+    assert record["dblinks"] == {"CAS": ["64-17-5"], "PubChem": ["3752"], "ChEBI": ["16236"]}
+
+
+def test_ko_record():
+    record = parse_flat_record(KO, fields=["all"], max_items=0)
+    assert record["entry"] == "K00001"
+    assert record["symbol"] == ["E1.1.1.1", "adh"]
+    assert record["name"] == ["alcohol dehydrogenase [EC:1.1.1.1]"]
+    assert record["dblinks"]["RN"] == ["R00623", "R00754", "R02124"]
+    assert record["genes"]["HSA"][0] == "124(ADH1A)"
+    assert record["genes"]["PTR"] == ["461394(ADH1A)", "461395(ADH1B)"]
+
+
+def test_enzyme_record():
+    record = parse_flat_record(ENZYME, fields=["all"], max_items=0)
+    assert record["entry"] == "1.1.1.1"
+    assert record["entry_type"] == "Enzyme"
+    assert record["name"] == ["alcohol dehydrogenase", "aldehyde reductase", "ADH"]
+    # 酶记录的REACTION是反应方程式，保留为文本
+    assert record["reaction"].startswith("a primary alcohol + NAD+ = an aldehyde + NADH + H+ [RN:R07326];")
+    assert "[RN:R07327]" in record["reaction"]
+    assert record["orthology"]["K00001"] == "alcohol dehydrogenase"
+    assert record["pathway"]["ec00010"] == "Glycolysis / Gluconeogenesis"
+    assert record["dblinks"]["ExplorEnz - The Enzyme Database"] == ["1.1.1.1"]
+    assert record["dblinks"]["CAS"] == ["9031-72-5"]
+
+
+def test_reaction_record():
+    record = parse_flat_record(REACTION, fields=["all"], max_items=0)
+    assert record["entry"] == "R00754"
+    assert record["equation"] == "C00469 + C00003 <=> C00084 + C00004 + C00080"
+    assert record["enzyme"] == ["1.1.1.1", "1.1.1.71"]
+    assert record["rclass"] == {"RC00050": "C00084_C00469"}
+    assert set(record["orthology"]) == {"K00001", "K00121"}
+
+
+def test_stream_selects_fields_and_truncates():
+    records = list(iter_flat_records((COMPOUND + ENZYME).splitlines(), fields=["reaction"], max_items=3))
+    assert [record["entry"] for record in records] == ["C00469", "1.1.1.1"]
+    assert set(records[0]) == {"entry", "entry_type", "reaction", "truncated"}
+    assert records[0]["reaction"] == ["R00746", "R00754", "R02124"]
+    assert records[0]["truncated"] == {"reaction": 11}
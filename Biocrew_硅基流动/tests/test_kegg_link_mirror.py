@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+KEGG关联关系本地镜像测试：导入、正反向查询、按物种匹配genes、整库查询和回退条件
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_kegg_link_mirror.py
+"""
+import os
+import sys
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from tools.kegg_link_mirror import KeggLinkMirror, qualify_entry
+
+COMPOUND_PATHWAY = """cpd:C07491\tpath:map00361
+cpd:C07491\tpath:map01100
+cpd:C00042\tpath:map00020
+cpd:C00042\tpath:map01100
+"""
+
+KO_GENES = """ko:K01011\thsa:7263
+ko:K01011\teco:b2521
+ko:K00001\thsa:124
+"""
+
+
+def make_mirror(tmp_path) -> KeggLinkMirror:
+    compound_pathway = tmp_path / "compound_pathway.tsv"
+    compound_pathway.write_text(COMPOUND_PATHWAY, encoding="utf-8")
+    ko_genes = tmp_path / "ko_genes.tsv"
+    ko_genes.write_text(KO_GENES, encoding="utf-8")
+
+    mirror = KeggLinkMirror(str(tmp_path / "links.sqlite"))
+    imported = mirror.import_files([str(compound_pathway), str(ko_genes)])
+    assert imported["cpd->path"] == 4 and imported["path->cpd"] == 4
+    return mirror
+
+
+def test_qualify_entry():
+    assert qualify_entry("C00042") == "cpd:C00042"
+    assert qualify_entry("map00010") == "path:map00010"
+    assert qualify_entry("1.1.1.1") == "ec:1.1.1.1"
+    assert qualify_entry("CPD:C00042") == "cpd:C00042"
+
+
+def test_lookup_both_directions(tmp_path):
+    mirror = make_mirror(tmp_path)
+
+    assert mirror.lookup("link", "pathway", "C07491") == [
+        ("cpd:C07491", "path:map00361"), ("cpd:C07491", "path:map01100")
+    ]
+    assert mirror.lookup("link", "compound", "path:map01100") == [
+        ("path:map01100", "cpd:C00042"), ("path:map01100", "cpd:C07491")
+    ]
+    assert len(mirror.lookup("link", "pathway", "C07491+C00042")) == 4
+    mirror.close()
+
+
+def test_genes_target_matches_all_organisms(tmp_path):
+    mirror = make_mirror(tmp_path)
+
+    assert sorted(mirror.lookup("link", "genes", "K01011")) == [
+        ("ko:K01011", "eco:b2521"), ("ko:K01011", "hsa:7263")
+    ]
+    assert mirror.lookup("link", "hsa", "K01011") == [("ko:K01011", "hsa:7263")]
+    mirror.close()
+
+
+def test_whole_database_lookup_and_fallback(tmp_path):
+    mirror = make_mirror(tmp_path)
+
+    assert len(mirror.lookup("link", "pathway", "compound")) == 4
+    # 任一条目或关联种类不在镜像中时返回None，由调用方回退到REST接口
+    assert mirror.lookup("link", "pathway", "C07491+C99999") is None
+    assert mirror.lookup("link", "reaction", "C07491") is None
+    assert mirror.lookup("conv", "pubchem", "C07491") is None
+    mirror.close()
+
+
+def test_mirror_persists_across_instances(tmp_path):
+    make_mirror(tmp_path).close()
+
+    reopened = KeggLinkMirror(str(tmp_path / "links.sqlite"))
+    assert reopened.lookup("link", "pathway", "C00042") == [
+        ("cpd:C00042", "path:map00020"), ("cpd:C00042", "path:map01100")
+    ]
+    assert {row["relation"] for row in reopened.stats()} >= {"cpd->path", "path->cpd", "ko->hsa", "eco->ko"}
+    reopened.close()
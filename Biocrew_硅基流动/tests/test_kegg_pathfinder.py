@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+KEGG降解路线搜索测试：Yen算法k条最短路线、基因证据加权，以及基因证据列检测（SQLite内存库）
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_kegg_pathfinder.py
+"""
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("crewai")
+pytest.importorskip("requests")
+pytest.importorskip("sqlalchemy")
+
+from collections import Counter
+
+from sqlalchemy import create_engine, text
+
+from config.config import Config
+from tools import db_engine_registry
+from tools import kegg_pathfinder
+from tools import pollutant_name_utils
+
+
+def edges(**weights):
+    return {neighbor: (weight, f"R_{neighbor}") for neighbor, weight in weights.items()}
+
+
+# S经A或B到达中心代谢入口T1/T2；T1之后的边不应被使用
+GRAPH = {
+    "S": edges(A=1.0, B=2.0),
+    "A": edges(T1=1.0, B=0.5),
+    "B": edges(T1=1.0, T2=3.0),
+    "T1": edges(X=0.1),
+    "X": edges(T2=0.1),
+}
+
+
+def test_k_shortest_routes_in_cost_order():
+    routes = kegg_pathfinder.k_shortest_routes(GRAPH, "S", {"T1", "T2"}, 10)
+
+    assert routes == [
+        (2.0, ["S", "A", "T1"]),
+        (2.5, ["S", "A", "B", "T1"]),
+        (3.0, ["S", "B", "T1"]),
+        (4.5, ["S", "A", "B", "T2"]),
+        (5.0, ["S", "B", "T2"]),
+    ]
+    assert kegg_pathfinder.k_shortest_routes(GRAPH, "S", {"T1", "T2"}, 2) == routes[:2]
+
+
+def test_k_shortest_routes_without_route():
+    assert kegg_pathfinder.k_shortest_routes({"S": edges(A=1.0)}, "S", {"T1"}, 3) == []
+    # 源化合物本身就是中心代谢入口时只有一条零长度路线
+    assert kegg_pathfinder.k_shortest_routes(GRAPH, "T1", {"T1"}, 3) == [(0.0, ["T1"])]
+
+
+def test_gene_evidence_lowers_reaction_weight(monkeypatch):
+    monkeypatch.setattr(Config, "KEGG_PATHFINDER_EVIDENCE_WEIGHT", 0.3)
+    graph = kegg_pathfinder.ReactionGraph(kegg_tool=None)
+    graph.compound_reactions = {"cpd:C00001": [], "cpd:C07491": ["rn:R1", "rn:R2"]}
+    graph.reactions = {
+        # 两个反应连接同一对化合物，保留权重较小的一个
+        "rn:R1": {"left": ["cpd:C07491"], "right": ["cpd:C11111"], "ec": ["4.5.1.-"], "ko": []},
+        "rn:R2": {"left": ["cpd:C07491"], "right": ["cpd:C11111"], "ec": [], "ko": []},
+    }
+
+    plain = graph.weighted_adjacency(Counter())
+    supported = graph.weighted_adjacency(Counter({"ec:4.5.1.-": 2}))
+
+    assert plain["cpd:C07491"]["cpd:C11111"] == (1.0, "rn:R1")
+    assert supported["cpd:C07491"]["cpd:C11111"] == (0.3, "rn:R1")
+    assert graph.reaction_weight("rn:R2", Counter()) == kegg_pathfinder.UNANNOTATED_REACTION_WEIGHT
+    assert graph.supporting_evidence("rn:R1", Counter({"ec:4.5.1.-": 2})) == ["ec:4.5.1.-"]
+
+
+def use_genes_table(monkeypatch, columns: str, rows):
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE TABLE genes_data ({columns})"))
+        for row in rows:
+            placeholders = ", ".join(f":{key}" for key in row)
+            connection.execute(text(f"INSERT INTO genes_data ({', '.join(row)}) VALUES ({placeholders})"), row)
+    monkeypatch.setattr(db_engine_registry, "get_engine", lambda *args, **kwargs: engine)
+    monkeypatch.setattr(Config, "QUERY_CACHE_ENABLED", False)
+    name_index = pollutant_name_utils.PollutantNameIndex()
+    name_index.load(row["pollutant_name"] for row in rows)
+    monkeypatch.setattr(pollutant_name_utils, "_name_index", name_index)
+    return engine
+
+
+def test_evidence_read_from_detected_columns(monkeypatch):
+    use_genes_table(monkeypatch, "id INTEGER PRIMARY KEY, pollutant_name TEXT, enzyme_type TEXT, EC TEXT, kegg_ko TEXT", [
+        {"pollutant_name": "lindane", "EC": "4.5.1.- ; 3.8.1.5", "kegg_ko": "K01563"},
+        {"pollutant_name": "lindane", "EC": "1.3.1.32", "kegg_ko": None},
+        {"pollutant_name": "ddt", "EC": "1.14.12.1", "kegg_ko": "K00001"},
+    ])
+    evidence, info = kegg_pathfinder.load_gene_evidence("Lindane")
+
+    assert info["columns"] == ["EC", "kegg_ko"]
+    assert info["resolved_name"] == "lindane" and info["rows"] == 2
+    assert info["warning"] is None
+    assert evidence == {"ec:4.5.1.-": 1, "ec:3.8.1.5": 1, "ec:1.3.1.32": 1, "ko:K01563": 1}
+
+
+def test_missing_evidence_columns_warns(monkeypatch):
+    use_genes_table(monkeypatch, "id INTEGER PRIMARY KEY, pollutant_name TEXT, enzyme_type TEXT, gene TEXT", [
+        {"pollutant_name": "lindane", "gene": "linA"},
+    ])
+    evidence, info = kegg_pathfinder.load_gene_evidence("lindane")
+
+    assert not evidence
+    assert info["columns"] == [] and "EC" in info["warning"]
+
+
+def test_unknown_pollutant_is_not_replaced_by_similar_name(monkeypatch):
+    use_genes_table(monkeypatch, "id INTEGER PRIMARY KEY, pollutant_name TEXT, enzyme_type TEXT, ec_number TEXT", [
+        {"pollutant_name": "2_4_6_trichlorophenol", "ec_number": "1.14.14.1"},
+    ])
+    evidence, info = kegg_pathfinder.load_gene_evidence("2,4,5-trichlorophenol")
+
+    assert not evidence
+    assert info["resolved_name"] == "2_4_5_trichlorophenol" and info["rows"] == 0
+    assert info["warning"]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+KEGG批量 /get/ 响应的记录拆分与条目匹配测试（化合物、酶、KO、基因、通路记录）
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_kegg_records.py
+"""
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("crewai")
+pytest.importorskip("requests")
+
+from tools.kegg_tool import match_records_to_ids, split_flat_records
+
+ENZYME_RECORDS = """ENTRY       EC 1.1.1.1                  Enzyme
+NAME        alcohol dehydrogenase;
+CLASS       Oxidoreductases;
+///
+ENTRY       EC 1.1.1.2                  Enzyme
+NAME        alcohol dehydrogenase (NADP+);
+///
+"""
+
+MIXED_RECORDS = """ENTRY       C07491                      Compound
+NAME        gamma-Hexachlorocyclohexane;
+///
+ENTRY       K01011                      KO
+SYMBOL      TST, MPST, sseA
+///
+ENTRY       10458             CDS       T01001
+SYMBOL      BAIAP2
+///
+ENTRY       10458             CDS       T01002
+SYMBOL      Baiap2
+///
+ENTRY       map00361                    Pathway
+NAME        Chlorocyclohexane and chlorobenzene degradation
+///
+"""
+
+
+def test_enzyme_records_match_ec_ids():
+    records = split_flat_records(ENZYME_RECORDS)
+    matched = match_records_to_ids(["ec:1.1.1.1", "ec:1.1.1.2"], records)
+    assert list(matched) == ["ec:1.1.1.1", "ec:1.1.1.2"]
+    assert "NADP+" in matched["ec:1.1.1.2"]
+
+
+def test_mixed_records_match_in_request_order():
+    entry_ids = ["cpd:C07491", "ko:K01011", "hsa:10458", "mmu:10458", "path:map00361"]
+    matched = match_records_to_ids(entry_ids, split_flat_records(MIXED_RECORDS))
+    assert list(matched) == entry_ids
+    # 不同物种中编号相同的基因按请求顺序区分
+    assert "BAIAP2" in matched["hsa:10458"]
+    assert "Baiap2" in matched["mmu:10458"]
+
+
+def test_missing_entries_are_skipped():
+    records = split_flat_records(ENZYME_RECORDS)
+    matched = match_records_to_ids(["ec:9.9.9.9", "ec:1.1.1.2"], records[1:])
+    assert list(matched) == ["ec:1.1.1.2"]
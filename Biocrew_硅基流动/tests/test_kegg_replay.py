@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+KeggTool离线测试：通过本地回放服务（tests/replay_server.py）使用已提交的cassette，
+不访问KEGG，覆盖基准中的全部操作、酶条目批量获取、磁盘缓存和流式列表分页的缓存
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_kegg_replay.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# 添加项目根目录到Python路径（replay_server与本测试同目录，直接导入）
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("crewai")
+pytest.importorskip("requests")
+
+from config.config import Config
+from replay_server import ReplayServer
+from benchmark_external_tools import CASSETTE_DIR, OPERATIONS
+
+KEGG_CASSETTE = os.path.join(CASSETTE_DIR, "kegg.json")
+
+
+@pytest.fixture
+def kegg_config(monkeypatch, tmp_path):
+    # 使用临时缓存文件，关闭关联镜像，所有请求都经过回放服务
+    monkeypatch.setattr(Config, "KEGG_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "KEGG_CACHE_PATH", str(tmp_path / "kegg_cache.sqlite"))
+    monkeypatch.setattr(Config, "KEGG_LINK_MIRROR_ENABLED", False)
+    monkeypatch.setattr(Config, "KEGG_OFFLINE", False)
+    monkeypatch.setattr(Config, "KEGG_RATE_LIMIT", 1000.0)
+
+
+@pytest.fixture
+def server():
+    with ReplayServer(KEGG_CASSETTE, "replay", latency_ms=0, jitter_ms=0) as replay:
+        yield replay
+
+
+def make_tool(base_url: str):
+    from tools.kegg_tool import KeggTool
+    return KeggTool(base_url=base_url)
+
+
+@pytest.mark.parametrize("operation,kwargs", OPERATIONS["kegg"], ids=[name for name, _ in OPERATIONS["kegg"]])
+def test_benchmark_operations_replay_offline(kegg_config, server, operation, kwargs):
+    result = make_tool(server.base_url)._run(**kwargs)
+
+    assert result["status"] == "success", result
+    assert server.stats()["misses"] == 0
+
+
+def test_get_entries_matches_compound_and_ko_records(kegg_config, server):
+    result = make_tool(server.base_url).get_entries(["C07491", "C00042", "K01011"])
+
+    assert result["status"] == "success"
+    assert set(result["data"]) == {"C07491", "C00042", "K01011"}
+    assert result["data"]["C07491"]["name"][0] == "Lindane"
+    assert result["data"]["K01011"]["entry_type"] == "KO"
+
+
+def test_get_entries_matches_enzyme_records(kegg_config, server):
+    result = make_tool(server.base_url).get_entries(["ec:1.1.1.1", "ec:1.1.1.2"])
+
+    assert result["status"] == "success"
+    assert set(result["data"]) == {"ec:1.1.1.1", "ec:1.1.1.2"}
+    assert result["data"]["ec:1.1.1.1"]["entry"] == "1.1.1.1"
+    assert "[RN:R00623]" in result["data"]["ec:1.1.1.1"]["reaction"]
+
+
+def test_disk_cache_serves_repeated_requests(kegg_config, server, monkeypatch):
+    monkeypatch.setattr(Config, "KEGG_CACHE_ENABLED", True)
+    tool = make_tool(server.base_url)
+
+    first = tool._run(operation="get_entries", entry_ids=["C07491", "C00042", "K01011"])
+    requests_after_first = server.stats()["requests"]
+    # 批量获取的条目按单条缓存，之后的单条查询和新的工具实例都不再访问服务
+    second = make_tool(server.base_url)._run(operation="get", entry_id="C00042")
+
+    assert first["status"] == second["status"] == "success"
+    assert second["data"]["name"][0] == "Succinate"
+    assert server.stats()["requests"] == requests_after_first
+    assert tool.cache.stats()["hits"] >= 1
+
+
+def test_stopped_stream_is_cached_for_later_pages(kegg_config, server, monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "KEGG_CACHE_ENABLED", True)
+    # 数万行的物种基因列表，取一页后提前停止读取
+    lines = [f"eco:b{index:04d}\tCDS\t1..100\tgene{index}; hypothetical protein" for index in range(20000)]
+    cassette = tmp_path / "kegg_list.json"
+    cassette.write_text(json.dumps({
+        "upstream": "https://rest.kegg.jp",
+        "interactions": {"GET /list/eco": {
+            "status": 200,
+            "headers": {"Content-Type": "text/plain; charset=utf-8"},
+            "body": "\n".join(lines) + "\n",
+            "encoding": "text"
+        }}
+    }), encoding="utf-8")
+
+    with ReplayServer(str(cassette), "replay", latency_ms=0, jitter_ms=0) as list_server:
+        tool = make_tool(list_server.base_url)
+        first = tool.list_entries("eco", limit=10)
+        # 剩余内容由后台线程读完后写入缓存
+        deadline = time.monotonic() + 10
+        while any(thread.name == "kegg-stream-cache" for thread in threading.enumerate()):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        later = tool.list_entries("eco", limit=10, offset=15000)
+        assert list_server.stats()["requests"] == 1
+
+    assert first["has_more"] and [entry["id"] for entry in first["data"]][:2] == ["eco:b0000", "eco:b0001"]
+    assert later["data"][0]["id"] == "eco:b15000"
+
+
+def test_stream_over_cache_limit_is_not_cached(kegg_config, server, monkeypatch):
+    monkeypatch.setattr(Config, "KEGG_CACHE_ENABLED", True)
+    monkeypatch.setattr(Config, "KEGG_STREAM_CACHE_MAX_MB", 0)
+    tool = make_tool(server.base_url)
+
+    assert tool.list_entries("pathway", limit=2)["has_more"]
+    assert tool.list_entries("pathway", limit=2, offset=2)["status"] == "success"
+    assert server.stats()["requests"] == 2
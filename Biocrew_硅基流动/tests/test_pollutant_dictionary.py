@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+污染物中英文词典回归测试：包含污染物术语的微生物、中间体和其他化合物不能被误识别
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_pollutant_dictionary.py
+"""
+import os
+import sys
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from tools.pollutant_dictionary import BLOCKING_TERMS, BUILTIN_TERMS, PollutantDictionary
+
+DICTIONARY = PollutantDictionary(BUILTIN_TERMS, BLOCKING_TERMS)
+
+
+def english_names(text):
+    return [item["english_name"] for item in DICTIONARY.extract(text)]
+
+
+def test_no_single_character_chinese_terms():
+    assert not [term for term, _ in BUILTIN_TERMS if len(term) == 1 and not term.isascii()]
+
+
+def test_false_positives_are_blocked():
+    cases = {
+        "利用铜绿假单胞菌降解石油烃": ["Petroleum hydrocarbons"],
+        "苯胺废水的处理": ["Aniline"],
+        "苯甲酸是常见的降解中间体": [],
+        "五氯苯酚污染土壤": ["Pentachlorophenol"],
+        "对氯苯胺的生物降解": ["4-Chloroaniline"],
+        "亚硝酸盐积累": ["Nitrite"],
+        "聚氯乙烯塑料": [],
+        "二氯乙烯的还原脱氯": ["Dichloroethylene"],
+    }
+    for text, expected in cases.items():
+        assert english_names(text) == expected, text
+
+
+def test_pollutants_are_still_recognized():
+    assert english_names("处理含多氯联苯和重金属镉的废水") == ["Polychlorinated biphenyls", "Cadmium"]
+    assert english_names("氯苯和氯乙烯复合污染，硝酸盐超标") == ["Chlorobenzene", "Vinyl chloride", "Nitrate"]
+    assert english_names("铜污染农田") == ["Copper"]
+    # 英文缩写按整词匹配
+    assert english_names("best practice for TCE") == ["Trichloroethylene"]
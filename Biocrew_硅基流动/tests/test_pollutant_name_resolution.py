@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+污染物名称解析回归测试：相似但不同的化合物不能被模糊匹配替换
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_pollutant_name_resolution.py
+"""
+import os
+import sys
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from config.config import Config
+from tools import pollutant_name_utils
+from tools.pollutant_name_utils import PollutantNameIndex, resolve_pollutant_name
+
+STORED_NAMES = [
+    "2_4_6_trichlorophenol",
+    "2_4_dichlorophenol",
+    "1_4_dichlorobenzene",
+    "trichloroethylene",
+    "chlorobenzene",
+    "beta_hexachlorocyclohexane",
+]
+
+
+def test_similar_compounds_are_not_resolved():
+    index = PollutantNameIndex(STORED_NAMES)
+    for query in ["2,4,5-trichlorophenol", "2,6-dichlorophenol", "1,3-dichlorobenzene",
+                  "trichloroethane", "dichlorobenzene", "hexachlorocyclohexane"]:
+        assert index.resolve(query) is None, query
+
+
+def test_similar_compounds_are_suggested():
+    index = PollutantNameIndex(STORED_NAMES)
+    assert "2_4_6_trichlorophenol" in index.suggest("2,4,5-trichlorophenol")
+    assert "1_4_dichlorobenzene" in index.suggest("1,3-dichlorobenzene")
+
+
+def test_exact_names_resolve_without_suggestions():
+    index = PollutantNameIndex(STORED_NAMES)
+    assert index.resolve("2,4,6-Trichlorophenol") == "2_4_6_trichlorophenol"
+    assert index.resolve("β-Hexachlorocyclohexane") == "beta_hexachlorocyclohexane"
+    assert index.suggest("2,4,6-trichlorophenol") == []
+
+
+def use_name_index(monkeypatch, names):
+    index = PollutantNameIndex()
+    index.load(names)
+    monkeypatch.setattr(pollutant_name_utils, "_name_index", index)
+    monkeypatch.setattr(Config, "POLLUTANT_ALIAS_ENABLED", True)
+
+
+def test_stored_names_take_precedence_over_aliases(monkeypatch):
+    use_name_index(monkeypatch, ["lindane", "bhc", "ddt"])
+    assert resolve_pollutant_name("Lindane") == "lindane"
+    assert resolve_pollutant_name("BHC") == "bhc"
+
+
+def test_aliases_resolve_only_to_stored_canonical_names(monkeypatch):
+    use_name_index(monkeypatch, ["gamma_hexachlorocyclohexane"])
+    assert resolve_pollutant_name("林丹") == "gamma_hexachlorocyclohexane"
+    assert resolve_pollutant_name("Lindane") == "gamma_hexachlorocyclohexane"
+    # 规范名称不在库中时保留用户输入，不改写成同样查不到的名称
+    assert resolve_pollutant_name("BHC") == "bhc"
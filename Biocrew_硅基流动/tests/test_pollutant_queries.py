@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+污染物数据分页查询测试：主键检测、keyset分页，以及没有可用主键时的不分页查询（SQLite内存库）
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_pollutant_queries.py
+"""
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, text
+
+from config.config import Config
+from tools import pollutant_queries
+
+
+@pytest.fixture(autouse=True)
+def disable_query_cache(monkeypatch):
+    # 各测试使用独立的内存库，URL相同，关闭共享缓存避免互相命中
+    monkeypatch.setattr(Config, "QUERY_CACHE_ENABLED", False)
+
+
+def make_engine(columns: str, rows: int = 5):
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE TABLE genes_data ({columns})"))
+        for i in range(rows):
+            connection.execute(text(
+                "INSERT INTO genes_data (pollutant_name, enzyme_type, value) VALUES ('lindane', 'LinA', :i)"
+            ), {"i": i})
+    return engine
+
+
+def test_default_primary_key_pages_through_all_rows():
+    engine = make_engine("id INTEGER PRIMARY KEY, pollutant_name TEXT, enzyme_type TEXT, value INTEGER")
+    assert pollutant_queries.resolve_primary_key(engine, "genes_data") == "id"
+
+    values, after = [], None
+    while True:
+        page = pollutant_queries.fetch_pollutant_page(engine, "genes_data", "lindane", page_size=2, after=after)
+        values.extend(row["value"] for row in page["rows"])
+        if not page["has_more"]:
+            break
+        after = page["next_cursor"]
+    assert values == [0, 1, 2, 3, 4]
+
+
+def test_detects_table_primary_key_when_configured_column_missing():
+    engine = make_engine("gene_id INTEGER PRIMARY KEY, pollutant_name TEXT, enzyme_type TEXT, value INTEGER")
+    assert pollutant_queries.resolve_primary_key(engine, "genes_data") == "gene_id"
+
+    page = pollutant_queries.fetch_pollutant_page(engine, "genes_data", "lindane", page_size=2)
+    assert page["primary_key"] == "gene_id"
+    assert page["next_cursor"] == 2
+
+    grouped = pollutant_queries.fetch_pollutant_rows_batch(engine, "genes_data", ["lindane"], limit_per_pollutant=3)
+    assert [row["gene_id"] for row in grouped["lindane"]] == [1, 2, 3]
+
+
+def test_table_without_primary_key_falls_back_to_unpaged_query():
+    engine = make_engine("pollutant_name TEXT, enzyme_type TEXT, value INTEGER")
+    assert pollutant_queries.resolve_primary_key(engine, "genes_data") is None
+
+    page = pollutant_queries.fetch_pollutant_page(engine, "genes_data", "lindane", page_size=2)
+    assert len(page["rows"]) == 2
+    assert page["has_more"] is True
+    assert page["next_cursor"] is None
+
+    grouped = pollutant_queries.fetch_pollutant_rows_batch(engine, "genes_data", ["lindane", "ddt"], limit_per_pollutant=2)
+    assert len(grouped["lindane"]) == 2 and grouped["ddt"] == []
+    assert len(list(pollutant_queries.iter_pollutant_rows(engine, "genes_data", "lindane"))) == 5
+
+    with pytest.raises(ValueError):
+        pollutant_queries.fetch_pollutant_page(engine, "genes_data", "lindane", page_size=2, after=1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+污染物统计表测试：按内容指纹增量刷新、旧统计表补列，以及实时汇总缓存按两张表的版本失效（SQLite文件库）
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_pollutant_stats.py
+"""
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, text
+
+from config.config import Config
+from tools import pollutant_stats
+from tools.query_cache import QueryResultCache
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "ORGANISM_NAME_COLUMN", "organism_name")
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.sqlite'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE genes_data (id INTEGER PRIMARY KEY AUTOINCREMENT, pollutant_name TEXT, enzyme_type TEXT)"))
+        connection.execute(text("CREATE TABLE organism_data (id INTEGER PRIMARY KEY, pollutant_name TEXT, organism_type TEXT, organism_name TEXT)"))
+        connection.execute(text("""
+            INSERT INTO genes_data (pollutant_name, enzyme_type)
+            VALUES ('lindane', 'LinA'), ('lindane', 'LinB'), ('ddt', 'DehA')
+        """))
+        connection.execute(text("""
+            INSERT INTO organism_data (pollutant_name, organism_type, organism_name)
+            VALUES ('lindane', 'bacteria', 'Sphingobium japonicum')
+        """))
+    pollutant_stats.refresh_pollutant_stats(engine)
+    return engine
+
+
+def stored_stats(engine, name):
+    return pollutant_stats.fetch_pollutant_stats(engine, [name])[name]
+
+
+def test_unchanged_data_is_not_refreshed(engine):
+    assert pollutant_stats.find_stale_pollutants(engine) == {"refresh": [], "delete": []}
+
+
+def test_reload_and_type_changes_with_same_counts_are_refreshed(engine):
+    with engine.begin() as connection:
+        # 记录数不变的重新导入：主键由序列分配，与原记录不同
+        connection.execute(text("DELETE FROM genes_data WHERE pollutant_name = 'ddt'"))
+        connection.execute(text("INSERT INTO genes_data (pollutant_name, enzyme_type) VALUES ('ddt', 'DehA')"))
+        # 原地修正类型：记录数不变，不同类型数减少
+        connection.execute(text("UPDATE genes_data SET enzyme_type = 'LinA' WHERE pollutant_name = 'lindane'"))
+    assert pollutant_stats.find_stale_pollutants(engine)["refresh"] == ["ddt", "lindane"]
+
+    pollutant_stats.refresh_pollutant_stats(engine)
+    assert stored_stats(engine, "lindane")["enzyme_types"] == 1
+    assert pollutant_stats.find_stale_pollutants(engine)["refresh"] == []
+
+
+def test_legacy_stats_table_gains_fingerprint_column(engine):
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE {pollutant_stats.STATS_TABLE}"))
+        connection.execute(text(pollutant_stats.CREATE_STATS_TABLE_SQL.replace("content_fingerprint VARCHAR(64),", "")))
+        connection.execute(text(f"""
+            INSERT INTO {pollutant_stats.STATS_TABLE} (pollutant_name, gene_records, organism_records)
+            VALUES ('lindane', 2, 1), ('ddt', 1, 0)
+        """))
+
+    assert any("ADD COLUMN" in statement for statement in pollutant_stats.ensure_pollutant_stats_table(engine))
+    assert pollutant_stats.find_stale_pollutants(engine)["refresh"] == ["ddt", "lindane"]
+    assert pollutant_stats.refresh_pollutant_stats(engine)["refreshed"] == 2
+    assert stored_stats(engine, "lindane")["top_organisms"] == ["Sphingobium japonicum"]
+
+
+def test_cache_depending_on_both_tables_sees_organism_changes(engine):
+    cache = QueryResultCache(version_check_interval=0)
+    load = lambda: pollutant_stats.compute_pollutant_stats(engine, ["lindane"])[0]["organism_records"]
+
+    assert cache.get_or_load(engine, "genes_data", "lindane", None, load, depends_on=("organism_data",)) == 1
+    with engine.begin() as connection:
+        connection.execute(text("""
+            INSERT INTO organism_data (pollutant_name, organism_type, organism_name)
+            VALUES ('lindane', 'fungi', 'Phanerochaete chrysosporium')
+        """))
+    assert cache.get_or_load(engine, "genes_data", "lindane", None, load, depends_on=("organism_data",)) == 2
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+数据库工具输出列选择测试：配置列与实际表结构不一致时退回全部列
+
+用法（在项目根目录执行）:
+    python -m pytest tests/test_result_encoding.py
+"""
+import os
+import sys
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from tools.result_encoding import encode_rows, select_columns
+
+
+def test_profile_columns_follow_configured_order():
+    columns = ["id", "enzyme_type", "pollutant_name", "gene_name", "notes"]
+    assert select_columns("genes_data", columns, "minimal") == ["pollutant_name", "gene_name", "enzyme_type"]
+    assert select_columns("genes_data", columns, "full") == columns
+
+
+def test_profile_matching_only_key_column_falls_back_to_all_columns():
+    columns = ["id", "pollutant_name", "Gene", "KO", "EC", "Reference"]
+    assert select_columns("genes_data", columns, "evidence") == columns
+    assert select_columns("organism_data", ["pollutant_name", "Species", "Source"], "minimal") == [
+        "pollutant_name", "Species", "Source"
+    ]
+
+    encoded = encode_rows("genes_data", [{"pollutant_name": "lindane", "Gene": "linA", "EC": "4.5.1.-"}])
+    assert encoded["columns"] == ["pollutant_name", "Gene", "EC"]
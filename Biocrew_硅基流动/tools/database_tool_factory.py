@@ -9,25 +9,87 @@ from tools.gene_data_query_tool import GeneDataQueryTool
 from tools.organism_data_query_tool import OrganismDataQueryTool
 from tools.pollutant_summary_tool import PollutantSummaryTool
 from tools.pollutant_search_tool import PollutantSearchTool
+from tools.kegg_pathfinder import KeggPathfinderTool
+from tools.db_engine_registry import get_engine, get_pool_status, dispose_all_engines
+from tools.query_cache import get_query_cache
+from tools.pollutant_name_utils import ensure_pollutant_name_index
+from tools.pollutant_aliases import ensure_pollutant_alias_map
+from tools.db_schema import run_startup_plan_check
 
 
 class DatabaseToolFactory:
     """数据库工具工厂类"""
     
+    @staticmethod
+    def get_engine():
+        """
+        获取所有数据库工具共享的数据库引擎
+        
+        Returns:
+            Engine: SQLAlchemy引擎
+        """
+        return get_engine()
+    
+    @staticmethod
+    def get_pool_status():
+        """
+        获取共享连接池状态
+        
+        Returns:
+            dict: 连接池状态
+        """
+        return get_pool_status()
+    
+    @staticmethod
+    def dispose_engines():
+        """
+        释放所有共享连接池
+        """
+        dispose_all_engines()
+    
+    @staticmethod
+    def get_cache_stats():
+        """
+        获取查询结果缓存的命中统计
+        
+        Returns:
+            dict: 缓存统计信息
+        """
+        return get_query_cache().stats()
+    
+    @staticmethod
+    def invalidate_cache(table: str = None):
+        """
+        手动失效查询结果缓存（数据导入后调用）
+        
+        Args:
+            table (str, optional): 表名，为空时清空全部缓存
+        """
+        get_query_cache().invalidate(table)
+    
     @staticmethod
     def create_all_tools():
         """
         创建所有数据库工具实例
+        所有工具共享同一个连接池，多次调用不会增加数据库连接数
         
         Returns:
             list: 所有数据库工具实例的列表
         """
+        # 首次创建工具时在后台线程中加载污染物名称索引和别名表（不阻塞创建工具），之后由后台线程定期刷新
+        ensure_pollutant_name_index(get_engine(), wait=False)
+        ensure_pollutant_alias_map(get_engine(), wait=False)
+        # 在后台线程中检查各工具查询的执行计划，出现全表扫描时打印警告（每个进程只检查一次）
+        run_startup_plan_check(get_engine(), wait=False)
+        
+        # KEGG降解路线搜索以本地genes_data作为基因证据，与数据库工具一起提供
         tools = [
             PollutantDataQueryTool(),
             GeneDataQueryTool(),
             OrganismDataQueryTool(),
             PollutantSummaryTool(),
-            PollutantSearchTool()
+            PollutantSearchTool(),
+            KeggPathfinderTool()
         ]
         return tools
     
@@ -47,7 +109,8 @@ class DatabaseToolFactory:
             "GeneDataQueryTool": GeneDataQueryTool,
             "OrganismDataQueryTool": OrganismDataQueryTool,
             "PollutantSummaryTool": PollutantSummaryTool,
-            "PollutantSearchTool": PollutantSearchTool
+            "PollutantSearchTool": PollutantSearchTool,
+            "KeggPathfinderTool": KeggPathfinderTool
         }
         
         tool_class = tool_map.get(tool_name)
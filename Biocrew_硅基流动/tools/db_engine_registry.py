@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+数据库引擎注册表
+按DSN在进程内共享SQLAlchemy引擎（连接池），所有数据库工具统一从这里获取连接，
+保证无论创建多少个智能体或并发运行多少次工作流，数据库连接数都有上限
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from config.config import Config
+
+
+# 项目根目录，用于解析离线快照的相对路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 嵌入式（本地文件）数据库类型
+EMBEDDED_DB_TYPES = ("sqlite", "duckdb")
+
+# 进程内共享的引擎表：DSN -> Engine
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def build_database_url() -> str:
+    """
+    根据Config中的数据库配置构建DSN
+
+    Returns:
+        str: 数据库连接URL
+    """
+    db_type = Config.DB_TYPE
+    db_host = Config.DB_HOST
+    db_port = Config.DB_PORT
+    db_name = Config.DB_NAME
+    db_user = Config.DB_USER
+    db_password = Config.DB_PASSWORD
+
+    if db_type == 'postgresql':
+        return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    elif db_type == 'mysql':
+        return f"mysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    elif db_type in EMBEDDED_DB_TYPES:
+        # duckdb需要安装duckdb和duckdb-engine
+        return f"{db_type}:///{resolve_snapshot_path()}"
+    else:
+        raise ValueError(f"不支持的数据库类型: {db_type}")
+
+
+def resolve_snapshot_path(path: Optional[str] = None) -> str:
+    """
+    解析离线快照文件的绝对路径
+
+    Args:
+        path (str, optional): 快照路径，默认取Config.DB_SNAPSHOT_PATH
+
+    Returns:
+        str: 绝对路径
+    """
+    path = path or Config.DB_SNAPSHOT_PATH
+    if not os.path.isabs(path):
+        path = os.path.join(PROJECT_ROOT, path)
+    return path
+
+
+def _build_engine_options(database_url: str) -> Dict:
+    """
+    根据数据库类型生成连接池和语句超时参数
+
+    Args:
+        database_url (str): 数据库连接URL
+
+    Returns:
+        dict: create_engine的关键字参数
+    """
+    if database_url.startswith("sqlite"):
+        # 本地文件无需连接池调优；工具会在线程池中并发查询
+        return {"connect_args": {"check_same_thread": False}}
+    if database_url.startswith("duckdb"):
+        return {}
+
+    options = {
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_pre_ping": Config.DB_POOL_PRE_PING,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+    }
+
+    connect_args = {"connect_timeout": Config.DB_CONNECT_TIMEOUT}
+    timeout_ms = Config.DB_STATEMENT_TIMEOUT_MS
+    if database_url.startswith("postgresql"):
+        if timeout_ms > 0:
+            connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+    elif database_url.startswith("mysql"):
+        if timeout_ms > 0:
+            # MySQL仅对SELECT语句生效
+            connect_args["init_command"] = f"SET SESSION max_execution_time={timeout_ms}"
+    options["connect_args"] = connect_args
+
+    return options
+
+
+def get_engine(database_url: Optional[str] = None) -> Engine:
+    """
+    获取共享的数据库引擎，同一DSN在进程内只创建一次
+
+    Args:
+        database_url (str, optional): 数据库连接URL，默认根据Config构建
+
+    Returns:
+        Engine: SQLAlchemy引擎
+    """
+    if database_url is None:
+        database_url = build_database_url()
+
+    engine = _engines.get(database_url)
+    if engine is not None:
+        return engine
+
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            engine = create_engine(database_url, **_build_engine_options(database_url))
+            _engines[database_url] = engine
+        return engine
+
+
+def like_operator(engine) -> str:
+    """
+    返回不区分大小写的模糊匹配运算符：PostgreSQL/DuckDB使用ILIKE，
+    MySQL和SQLite的LIKE默认不区分大小写（ASCII）
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        str: ILIKE 或 LIKE
+    """
+    return "ILIKE" if engine.dialect.name in ("postgresql", "duckdb") else "LIKE"
+
+
+def get_pool_status() -> Dict[str, str]:
+    """
+    获取所有共享连接池的状态，便于排查连接数问题
+
+    Returns:
+        dict: 脱敏DSN -> 连接池状态描述
+    """
+    with _engines_lock:
+        return {
+            engine.url.render_as_string(hide_password=True): engine.pool.status()
+            for engine in _engines.values()
+        }
+
+
+def dispose_all_engines():
+    """
+    关闭并清空所有共享引擎（用于进程退出或切换数据库配置）
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+数据库结构初始化工具
+为数据库工具的热点查询创建所需的扩展、索引、统计表和别名表，
+并通过EXPLAIN检查各工具的查询模板是否走索引
+
+用法（在项目根目录执行）:
+    python -m tools.db_schema            # 创建索引、统计表和别名表，然后检查执行计划
+    python -m tools.db_schema --check    # 只检查执行计划，不执行DDL
+"""
+
+import argparse
+import re
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, text
+
+from config.config import Config
+from tools.db_engine_registry import get_engine, like_operator
+from tools.pollutant_aliases import ensure_alias_table, seed_default_aliases
+from tools.pollutant_queries import (
+    TABLE_FILTER_COLUMNS,
+    _build_conditions,
+    build_batch_conditions,
+    build_batch_sql,
+    build_page_sql,
+    build_ranked_search_params,
+    build_ranked_search_sql,
+    build_variant_search_sql,
+    resolve_primary_key,
+)
+from tools.pollutant_stats import STATS_TABLE, ensure_pollutant_stats_table
+
+
+# 需要支持模糊搜索的污染物名称列
+POLLUTANT_NAME_TABLES = ("genes_data", "organism_data")
+
+# 热点查询需要的复合索引：表名 -> 列（索引名为 idx_{表名}_{列名...}）
+COMPOSITE_INDEXES = {
+    "genes_data": ("pollutant_name", "enzyme_type"),
+    "organism_data": ("pollutant_name", "organism_type"),
+}
+
+# 执行计划检查时关注的基础表（子查询、派生表的扫描不算全表扫描）
+PLAN_CHECK_TABLES = POLLUTANT_NAME_TABLES + (STATS_TABLE,)
+
+# 执行计划检查使用的示例参数（只生成计划，不读取数据）
+_SAMPLE_NAMES = ["__plan_check_a__", "__plan_check_b__"]
+
+# 启动检查只在进程内执行一次
+_plan_check_done = False
+_plan_check_lock = threading.Lock()
+
+
+def is_postgresql(engine) -> bool:
+    """
+    判断引擎是否为PostgreSQL
+    """
+    return engine.dialect.name == "postgresql"
+
+
+def composite_index_name(table: str, columns: Tuple[str, ...]) -> str:
+    """
+    生成复合索引名
+    """
+    return f"idx_{table}_{'_'.join(columns)}"
+
+
+def ensure_composite_indexes(engine) -> List[str]:
+    """
+    创建热点查询所需的复合索引；已存在同名索引或前导列相同的索引时跳过
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        list: 已执行的DDL语句
+    """
+    inspector = inspect(engine)
+    statements = []
+    for table, columns in COMPOSITE_INDEXES.items():
+        index_name = composite_index_name(table, columns)
+        existing = inspector.get_indexes(table)
+        if any(
+            index["name"] == index_name or tuple(index["column_names"][:len(columns)]) == columns
+            for index in existing
+        ):
+            continue
+        # 不使用IF NOT EXISTS，MySQL不支持该语法
+        statements.append(f"CREATE INDEX {index_name} ON {table} ({', '.join(columns)})")
+
+    if statements:
+        with engine.begin() as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+    return statements
+
+
+def ensure_trigram_indexes(engine) -> List[str]:
+    """
+    创建pg_trgm扩展及pollutant_name列上的GIN三元组索引（仅PostgreSQL）
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        list: 已执行的DDL语句，非PostgreSQL时为空列表
+    """
+    if not is_postgresql(engine):
+        return []
+
+    statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+    for table in POLLUTANT_NAME_TABLES:
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_pollutant_name_trgm "
+            f"ON {table} USING gin (pollutant_name gin_trgm_ops)"
+        )
+
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+    return statements
+
+
+def query_templates(engine) -> List[Dict]:
+    """
+    生成各数据库工具的查询模板，与工具实际执行的SQL使用相同的构建函数
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        list: 模板字典列表，包含 name、sql、params、expanding（需要展开的列表参数）
+    """
+    sample_name = _SAMPLE_NAMES[0]
+    templates = []
+    for table, filter_columns in TABLE_FILTER_COLUMNS.items():
+        primary_key = resolve_primary_key(engine, table)
+        _, conditions, params = _build_conditions(table, sample_name, None)
+        templates.append({
+            "name": f"{table} 分页查询",
+            "sql": build_page_sql(table, conditions, Config.DB_MAX_PAGE_SIZE, primary_key),
+            "params": params,
+            "expanding": ()
+        })
+
+        filters = {column: sample_name for column in filter_columns}
+        _, conditions, params = _build_conditions(table, sample_name, filters)
+        templates.append({
+            "name": f"{table} 分页查询（按{'/'.join(filter_columns)}过滤）",
+            "sql": build_page_sql(table, conditions, Config.DB_MAX_PAGE_SIZE, primary_key),
+            "params": params,
+            "expanding": ()
+        })
+
+        _, conditions, params, use_any = build_batch_conditions(engine, table, _SAMPLE_NAMES, None)
+        params["limit_per_pollutant"] = Config.DB_MAX_PAGE_SIZE
+        templates.append({
+            "name": f"{table} 批量查询",
+            "sql": build_batch_sql(table, conditions, primary_key),
+            "params": params,
+            "expanding": () if use_any else ("names",)
+        })
+
+        # 前导通配符的LIKE在MySQL/SQLite中无法使用B-tree索引，只有PostgreSQL的三元组索引能覆盖变体搜索
+        if is_postgresql(engine):
+            templates.append({
+                "name": f"{table} 变体模糊搜索",
+                "sql": build_variant_search_sql(table, like_operator(engine)),
+                "params": {"keyword": f"%{sample_name}%"},
+                "expanding": ()
+            })
+
+    if is_postgresql(engine):
+        templates.append({
+            "name": "污染物相似度排序搜索",
+            "sql": build_ranked_search_sql(),
+            "params": build_ranked_search_params(sample_name, 20),
+            "expanding": ()
+        })
+
+    templates.append({
+        "name": f"{STATS_TABLE} 主键点查",
+        "sql": f"SELECT * FROM {STATS_TABLE} WHERE pollutant_name IN :names",
+        "params": {"names": _SAMPLE_NAMES},
+        "expanding": ("names",)
+    })
+    return templates
+
+
+def _explain(connection, dialect: str, template: Dict) -> Tuple[List[str], List[str]]:
+    """
+    获取查询模板的执行计划，并找出其中做全表扫描的基础表
+
+    Args:
+        connection: 数据库连接
+        dialect (str): 数据库方言名称
+        template (dict): 查询模板
+
+    Returns:
+        tuple: (执行计划文本行, 全表扫描的表名列表)
+    """
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    statement = text(prefix + template["sql"])
+    if template["expanding"]:
+        statement = statement.bindparams(*(bindparam(name, expanding=True) for name in template["expanding"]))
+    result = connection.execute(statement, template["params"])
+
+    lines, scanned = [], []
+    if dialect == "postgresql":
+        for row in result:
+            lines.append(row[0])
+            scanned.extend(re.findall(r"Seq Scan on (\w+)", row[0]))
+    elif dialect == "mysql":
+        for row in result.mappings():
+            lines.append(f"table={row['table']} type={row['type']} key={row['key']} rows={row['rows']}")
+            if row["type"] == "ALL":
+                scanned.append(row["table"])
+    else:
+        for row in result:
+            detail = row[-1]
+            lines.append(detail)
+            match = re.match(r"SCAN (\w+)", detail)
+            if match and "USING" not in detail:
+                scanned.append(match.group(1))
+
+    return lines, [table for table in scanned if table in PLAN_CHECK_TABLES]
+
+
+def check_query_plans(engine=None) -> List[Dict]:
+    """
+    对各工具的查询模板执行EXPLAIN，检查是否出现全表扫描
+    支持PostgreSQL（Seq Scan）、MySQL（type=ALL）和SQLite（不使用索引的SCAN）
+
+    Args:
+        engine: SQLAlchemy引擎，默认使用共享引擎
+
+    Returns:
+        list: 每个模板的检查结果，包含 name、plan、full_scans、error
+    """
+    engine = engine or get_engine()
+    dialect = engine.dialect.name
+    if dialect not in ("postgresql", "mysql", "sqlite"):
+        return []
+
+    findings = []
+    # 所有模板共用一个连接：数据库不可达时只等待一次连接超时并直接抛出异常，不再逐个模板重试
+    with engine.connect() as connection:
+        for template in query_templates(engine):
+            finding = {"name": template["name"], "plan": [], "full_scans": [], "error": None}
+            try:
+                finding["plan"], finding["full_scans"] = _explain(connection, dialect, template)
+            except Exception as e:
+                finding["error"] = str(e)
+                # 回滚失败的语句，PostgreSQL中一条语句失败不会影响后续检查
+                connection.rollback()
+            findings.append(finding)
+    return findings
+
+
+def report_query_plans(findings: List[Dict]) -> int:
+    """
+    打印执行计划检查结果，全表扫描以醒目的警告输出
+
+    Args:
+        findings (list): check_query_plans的返回值
+
+    Returns:
+        int: 出现全表扫描的模板数
+    """
+    problems = [finding for finding in findings if finding["full_scans"]]
+    for finding in findings:
+        if finding["error"]:
+            print(f"[警告] 无法检查执行计划 {finding['name']}: {finding['error']}")
+
+    if not problems:
+        return 0
+
+    print("=" * 60)
+    print(f"[警告] {len(problems)} 个数据库查询模板的执行计划包含全表扫描")
+    for finding in problems:
+        print(f"  - {finding['name']}: 全表扫描 {', '.join(sorted(set(finding['full_scans'])))}")
+        for line in finding["plan"]:
+            print(f"      {line}")
+    print("  请运行 python -m tools.db_schema 创建索引；表中数据很少或缺少统计信息时，")
+    print("  数据库也可能选择全表扫描，可先执行ANALYZE后再检查")
+    print("=" * 60)
+    return len(problems)
+
+
+def run_startup_plan_check(engine, wait: bool = True) -> Optional[List[Dict]]:
+    """
+    启动时检查执行计划（由Config.DB_PLAN_CHECK_ON_STARTUP控制，每个进程只执行一次），
+    检查失败不影响工具创建
+
+    Args:
+        engine: SQLAlchemy引擎
+        wait (bool): 是否等待检查完成；为False时在后台线程中检查并立即返回None
+
+    Returns:
+        list: 检查结果，未执行检查或在后台检查时返回None
+    """
+    global _plan_check_done
+    if not Config.DB_PLAN_CHECK_ON_STARTUP or _plan_check_done:
+        return None
+    if not wait:
+        threading.Thread(
+            target=run_startup_plan_check, args=(engine,), name="db-plan-check", daemon=True
+        ).start()
+        return None
+
+    with _plan_check_lock:
+        if _plan_check_done:
+            return None
+        _plan_check_done = True
+        try:
+            findings = check_query_plans(engine)
+        except Exception as e:
+            print(f"[警告] 执行计划检查失败: {e}")
+            return None
+    report_query_plans(findings)
+    return findings
+
+
+def bootstrap(engine=None) -> List[str]:
+    """
+    执行全部结构初始化步骤
+
+    Args:
+        engine: SQLAlchemy引擎，默认使用共享引擎
+
+    Returns:
+        list: 已执行的DDL语句
+    """
+    engine = engine or get_engine()
+    statements = ensure_composite_indexes(engine)
+    statements.extend(ensure_trigram_indexes(engine))
+    statements.extend(ensure_pollutant_stats_table(engine))
+    statements.extend(ensure_alias_table(engine))
+    seed_default_aliases(engine)
+    return statements
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    """
+    parser = argparse.ArgumentParser(description="初始化数据库索引和统计表，并检查查询执行计划")
+    parser.add_argument("--check", action="store_true", help="只检查执行计划，不执行DDL")
+    args = parser.parse_args(argv)
+
+    engine = get_engine()
+    if not args.check:
+        try:
+            statements = bootstrap(engine)
+        except Exception as e:
+            print(f"数据库结构初始化失败: {e}")
+            return 1
+
+        for statement in statements:
+            print(f"✓ {statement}")
+
+    try:
+        findings = check_query_plans(engine)
+    except Exception as e:
+        print(f"执行计划检查失败: {e}")
+        return 1
+
+    if report_query_plans(findings):
+        return 2
+    print(f"✓ 已检查 {len(findings)} 个查询模板，均使用索引")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
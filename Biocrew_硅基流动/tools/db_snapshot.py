@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+离线数据库快照导出工具
+将远程数据库中的genes_data和organism_data复制到带索引的本地SQLite/DuckDB文件，
+设置 DB_TYPE=sqlite（或duckdb）后所有数据库工具直接读取本地快照，无需网络
+
+用法（在项目根目录执行）:
+    python -m tools.db_snapshot
+    python -m tools.db_snapshot --backend duckdb --output data/bio_data_snapshot.duckdb
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, Index, MetaData, Table, Text, create_engine, inspect, text
+
+from config.config import Config
+from tools.db_engine_registry import EMBEDDED_DB_TYPES, build_database_url, resolve_snapshot_path
+from tools.db_schema import COMPOSITE_INDEXES, composite_index_name
+from tools.pollutant_aliases import ALIAS_FIELDS, ALIAS_TABLE, ensure_alias_table, import_aliases, seed_default_aliases
+from tools.pollutant_queries import TABLE_FILTER_COLUMNS, iter_pollutant_rows, resolve_primary_key
+from tools.pollutant_stats import refresh_pollutant_stats
+
+
+def _snapshot_columns(source_engine, table: str) -> List[Column]:
+    """
+    读取源表结构并转换为通用列类型，保留源表检测到的排序主键（快照中同样按主键做keyset分页）
+
+    Args:
+        source_engine: 源数据库引擎
+        table (str): 表名
+
+    Returns:
+        list: 快照表的列定义
+    """
+    primary_key = resolve_primary_key(source_engine, table)
+    columns = []
+    for column in inspect(source_engine).get_columns(table):
+        try:
+            column_type = column["type"].as_generic()
+        except NotImplementedError:
+            column_type = Text()
+        columns.append(Column(
+            column["name"],
+            column_type,
+            primary_key=column["name"] == primary_key
+        ))
+    return columns
+
+
+def _remove_temp_files(temp_path: str):
+    """
+    删除导出用的临时快照文件及数据库生成的日志文件
+    """
+    for path in (temp_path, f"{temp_path}-journal", f"{temp_path}-wal", f"{temp_path}-shm", f"{temp_path}.wal"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def export_snapshot(source_engine, output_path: str, backend: str = "sqlite",
+                    batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    导出离线快照：先写入临时文件，完成后原子替换
+
+    Args:
+        source_engine: 源数据库引擎
+        output_path (str): 快照文件路径
+        backend (str): 快照类型 (sqlite, duckdb)
+        batch_size (int, optional): 每批写入的记录数
+
+    Returns:
+        dict: 表名 -> 导出的记录数
+    """
+    if backend not in EMBEDDED_DB_TYPES:
+        raise ValueError(f"不支持的快照类型: {backend}，可选值: {', '.join(EMBEDDED_DB_TYPES)}")
+    batch_size = batch_size or Config.DB_STREAM_BATCH_SIZE
+
+    output_path = resolve_snapshot_path(output_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temp_path = f"{output_path}.tmp"
+    _remove_temp_files(temp_path)
+
+    target_engine = create_engine(f"{backend}:///{temp_path}")
+    counts = {}
+    try:
+        metadata = MetaData()
+        tables = {}
+        for table_name in TABLE_FILTER_COLUMNS:
+            tables[table_name] = Table(table_name, metadata, *_snapshot_columns(source_engine, table_name))
+            # 快照使用与在线数据库相同的复合索引
+            columns = COMPOSITE_INDEXES[table_name]
+            Index(composite_index_name(table_name, columns), *(tables[table_name].c[name] for name in columns))
+        metadata.create_all(target_engine)
+
+        for table_name, table in tables.items():
+            counts[table_name] = 0
+            batch = []
+            with target_engine.begin() as connection:
+                for row in iter_pollutant_rows(source_engine, table_name, batch_size=batch_size):
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        connection.execute(table.insert(), batch)
+                        counts[table_name] += len(batch)
+                        batch = []
+                if batch:
+                    connection.execute(table.insert(), batch)
+                    counts[table_name] += len(batch)
+
+        # 快照中同时生成污染物统计表，摘要工具离线时也能点查
+        refresh_pollutant_stats(target_engine)
+
+        # 复制别名表，源数据库没有别名表时写入内置别名
+        ensure_alias_table(target_engine)
+        try:
+            with source_engine.connect() as connection:
+                result = connection.execute(text(f"SELECT {', '.join(ALIAS_FIELDS)} FROM {ALIAS_TABLE}"))
+                aliases = [dict(zip(ALIAS_FIELDS, row)) for row in result.fetchall()]
+        except Exception:
+            aliases = []
+        counts[ALIAS_TABLE] = (
+            import_aliases(target_engine, aliases, reload=False)
+            + seed_default_aliases(target_engine, reload=False)
+        )
+
+        target_engine.dispose()
+        os.replace(temp_path, output_path)
+    except BaseException:
+        # 导出失败（包括中断）时删除临时文件，不留下不完整的快照
+        target_engine.dispose()
+        _remove_temp_files(temp_path)
+        raise
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    """
+    parser = argparse.ArgumentParser(description="导出genes_data/organism_data离线快照")
+    parser.add_argument("--backend", choices=EMBEDDED_DB_TYPES, default="sqlite", help="快照类型")
+    parser.add_argument("--output", default=Config.DB_SNAPSHOT_PATH, help="快照文件路径")
+    parser.add_argument("--source-url", default=None, help="源数据库URL，默认根据Config构建")
+    args = parser.parse_args(argv)
+
+    if args.source_url is None and Config.DB_TYPE in EMBEDDED_DB_TYPES:
+        print("错误：当前DB_TYPE为本地快照，请通过 --source-url 指定远程源数据库")
+        return 1
+
+    source_engine = create_engine(args.source_url or build_database_url())
+    try:
+        counts = export_snapshot(source_engine, args.output, args.backend)
+    except Exception as e:
+        print(f"导出离线快照失败: {e}")
+        return 1
+    finally:
+        source_engine.dispose()
+
+    for table_name, count in counts.items():
+        print(f"✓ {table_name}: {count} 条记录")
+    print(f"快照已写入: {resolve_snapshot_path(args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
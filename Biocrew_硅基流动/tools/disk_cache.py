@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+基于SQLite的持久化响应缓存
+按键（通常为请求URL）保存文本响应及其ETag/Last-Modified，支持按条目TTL过期、
+按总字节数做LRU淘汰、命中统计，以及过期条目的条件请求重新验证和离线兜底
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+# 项目根目录，用于解析缓存文件的相对路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目"""
+    key: str
+    value: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        """条目是否仍在有效期内"""
+        return time.time() < self.expires_at
+
+
+class DiskCache:
+    """
+    SQLite响应缓存（进程内线程安全，多个进程可共享同一文件）
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        打开（必要时创建）缓存文件
+
+        Args:
+            path (str): 缓存文件路径，相对路径以项目根目录为基准
+            max_bytes (int): 缓存值的总字节数上限，超出后按最近访问时间淘汰，0表示不限制
+        """
+        if not os.path.isabs(path):
+            path = os.path.join(PROJECT_ROOT, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at ON cache_entries (accessed_at)"
+        )
+        self._total_bytes = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()[0]
+        self._stats = {"hits": 0, "misses": 0, "stale_hits": 0, "revalidated": 0, "evictions": 0}
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """
+        读取缓存条目
+
+        Args:
+            key (str): 缓存键
+            allow_stale (bool): 是否返回已过期的条目（用于条件请求重新验证或离线兜底）
+
+        Returns:
+            CacheEntry: 缓存条目，不存在（或已过期且不允许过期条目）时返回None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT key, value, etag, last_modified, stored_at, expires_at FROM cache_entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            entry = CacheEntry(*row)
+            if not entry.fresh and not allow_stale:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits" if entry.fresh else "stale_hits"] += 1
+            self._connection.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+            return entry
+
+    def set(self, key: str, value: str, ttl: float, namespace: str = "default",
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        写入缓存条目，必要时淘汰最久未访问的条目
+
+        Args:
+            key (str): 缓存键
+            value (str): 缓存值
+            ttl (float): 有效期（秒）
+            namespace (str): 命名空间（用于分组统计和清理，如KEGG操作名）
+            etag (str, optional): 响应的ETag
+            last_modified (str, optional): 响应的Last-Modified
+        """
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute("""
+                INSERT OR REPLACE INTO cache_entries
+                    (key, namespace, value, etag, last_modified, size, stored_at, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, namespace, value, etag, last_modified, size, now, now + ttl, now))
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+
+    def refresh(self, key: str, ttl: float):
+        """
+        条件请求确认内容未变化（HTTP 304）后延长条目有效期
+
+        Args:
+            key (str): 缓存键
+            ttl (float): 新的有效期（秒）
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE cache_entries SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + ttl, now, key)
+            )
+            self._stats["revalidated"] += 1
+
+    def _evict(self):
+        """
+        总字节数超过上限时，按最近访问时间淘汰到上限的90%（调用方需持有锁）
+        """
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = self._connection.execute(
+            "SELECT key, size FROM cache_entries ORDER BY accessed_at"
+        )
+        victims = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        rows.close()
+        self._connection.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+        self._stats["evictions"] += len(victims)
+
+    def delete(self, key: str):
+        """
+        删除缓存条目
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT size FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._total_bytes -= row[0]
+
+    def clear(self, namespace: Optional[str] = None):
+        """
+        清空缓存
+
+        Args:
+            namespace (str, optional): 命名空间，为空时清空全部条目
+        """
+        with self._lock:
+            if namespace is None:
+                self._connection.execute("DELETE FROM cache_entries")
+            else:
+                self._connection.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+            self._total_bytes = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()[0]
+
+    def stats(self) -> Dict:
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 命中/未命中/过期命中/重新验证/淘汰次数，以及各命名空间的条目数和字节数
+        """
+        with self._lock:
+            namespaces = {
+                namespace: {"entries": entries, "bytes": size}
+                for namespace, entries, size in self._connection.execute(
+                    "SELECT namespace, COUNT(*), SUM(size) FROM cache_entries GROUP BY namespace"
+                )
+            }
+            lookups = self._stats["hits"] + self._stats["misses"] + self._stats["stale_hits"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "namespaces": namespaces,
+                "path": self.path
+            }
+
+    def close(self):
+        """
+        关闭缓存文件
+        """
+        with self._lock:
+            self._connection.close()
+
+
+# 进程内共享的缓存：文件路径 -> DiskCache
+_caches: Dict[str, DiskCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_disk_cache(path: str, max_bytes: int = 256 * 1024 * 1024) -> DiskCache:
+    """
+    获取共享的磁盘缓存，同一文件在进程内只打开一次
+
+    Args:
+        path (str): 缓存文件路径
+        max_bytes (int): 总字节数上限
+
+    Returns:
+        DiskCache: 磁盘缓存
+    """
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = DiskCache(path, max_bytes)
+            _caches[path] = cache
+        return cache
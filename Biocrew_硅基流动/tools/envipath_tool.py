@@ -6,11 +6,40 @@ EnviPath数据库访问工具
 """
 
 from crewai.tools import BaseTool
-from enviPath_python import enviPath
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import json
+import threading
+import time
 from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
+from config.config import Config
+from tools.disk_cache import get_disk_cache
+
+
+# 进程内共享的客户端初始化线程池（按需创建）
+_envipath_executor: Optional[ThreadPoolExecutor] = None
+_envipath_executor_lock = threading.Lock()
+
+
+def _get_envipath_executor() -> ThreadPoolExecutor:
+    """
+    获取共享的EnviPath客户端初始化线程池
+    """
+    global _envipath_executor
+    if _envipath_executor is None:
+        with _envipath_executor_lock:
+            if _envipath_executor is None:
+                _envipath_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="envipath-init")
+    return _envipath_executor
+
+
+def _jsonable(value):
+    """
+    将搜索结果中的enviPath对象转换为其ID（URL），使结果可以写入缓存
+    """
+    return getattr(value, "id", None) or str(value)
+
 
 class SearchCompoundRequest(BaseModel):
     compound_name: str = Field(..., description="化合物名称")
@@ -32,21 +61,140 @@ class EnviPathTool(BaseTool):
     name: str = "EnviPathTool"
     description: str = "用于查询环境pathway数据和化合物代谢信息，基于enviPath-python库实现"
     
-    def __init__(self, base_url: str = "https://envipath.org"):
+    def __init__(self, base_url: str = "https://envipath.org", warm_up: Optional[bool] = None,
+                 package_id: Optional[str] = None):
         """
         初始化EnviPath工具
         
         Args:
             base_url (str): EnviPath API的基础URL
+            warm_up (bool, optional): 是否立即在后台线程中创建客户端，默认使用Config.ENVIPATH_WARMUP；
+                为False时在首次调用时创建
+            package_id (str, optional): 搜索使用的enviPath包ID或完整URL，默认使用Config.ENVIPATH_PACKAGE_ID
         """
         super().__init__()  # 调用父类构造函数
         # 使用object.__setattr__来设置实例属性，避免Pydantic验证错误
         object.__setattr__(self, 'base_url', base_url)
+        package_id = package_id or Config.ENVIPATH_PACKAGE_ID
+        package_url = (
+            package_id if package_id.startswith(("http://", "https://"))
+            else f"{base_url.rstrip('/')}/package/{package_id}"
+        )
+        object.__setattr__(self, 'package_url', package_url)
+        # 包对象按客户端缓存：(客户端, 包)，客户端重新创建后重新获取
+        object.__setattr__(self, '_package', None)
+        object.__setattr__(self, '_package_lock', threading.Lock())
+        # 搜索结果缓存在进程内按文件共享，跨工作流迭代和进程复用
+        cache = (
+            get_disk_cache(Config.ENVIPATH_CACHE_PATH, Config.ENVIPATH_CACHE_MAX_MB * 1024 * 1024)
+            if Config.ENVIPATH_CACHE_ENABLED else None
+        )
+        object.__setattr__(self, 'cache', cache)
+        # 创建客户端需要访问网络，放到初始化线程池中执行，构造工具和创建智能体时不会阻塞
+        object.__setattr__(self, '_client_lock', threading.Lock())
+        object.__setattr__(self, '_client_future', None)
+        object.__setattr__(self, '_client_retry_at', 0.0)
+        if Config.ENVIPATH_WARMUP if warm_up is None else warm_up:
+            self.warm_up()
+    
+    def _create_client(self):
+        """
+        创建enviPath客户端（在初始化线程池中执行）
+        """
+        try:
+            from enviPath_python import enviPath
+            return enviPath(self.base_url)
+        except Exception:
+            # 记录重试时间，重试窗口内的调用直接返回缓存的错误而不是再次访问网络
+            object.__setattr__(self, '_client_retry_at', time.monotonic() + Config.ENVIPATH_RETRY_AFTER)
+            raise
+    
+    def warm_up(self) -> Future:
+        """
+        在后台线程中创建客户端；客户端已创建、正在创建或初始化失败且仍在重试窗口内时返回现有的future
+        
+        Returns:
+            Future: 结果为enviPath客户端，创建失败时为对应的异常
+        """
+        with self._client_lock:
+            future = self._client_future
+            if future is None or (
+                future.done() and future.exception() is not None and time.monotonic() >= self._client_retry_at
+            ):
+                future = _get_envipath_executor().submit(self._create_client)
+                object.__setattr__(self, '_client_future', future)
+            return future
+    
+    def is_ready(self) -> bool:
+        """
+        客户端是否已创建成功
+        """
+        future = self._client_future
+        return future is not None and future.done() and future.exception() is None
+    
+    def _get_client(self, timeout: Optional[float] = None):
+        """
+        获取客户端，尚未创建时开始创建并等待
+        
+        Args:
+            timeout (float, optional): 等待初始化的最长时间（秒），默认使用Config.ENVIPATH_INIT_TIMEOUT
+            
+        Returns:
+            enviPath: 客户端
+            
+        Raises:
+            RuntimeError: 初始化失败（重试窗口内直接使用缓存的错误）或等待超时
+        """
+        future = self.warm_up()
+        wait = Config.ENVIPATH_INIT_TIMEOUT if timeout is None else timeout
         try:
-            object.__setattr__(self, 'client', enviPath(base_url))
+            return future.result(timeout=wait)
+        except FutureTimeoutError:
+            raise RuntimeError(f"EnviPath客户端初始化超过 {wait:g} 秒，仍在后台进行")
         except Exception as e:
-            object.__setattr__(self, 'client', None)
-            print(f"警告: 无法初始化EnviPath客户端: {e}")
+            retry_in = max(0.0, self._client_retry_at - time.monotonic())
+            raise RuntimeError(f"无法初始化EnviPath客户端: {e}（{retry_in:.0f} 秒后重试）") from e
+    
+    def _get_package(self):
+        """
+        获取配置的enviPath包，同一客户端只获取一次
+        """
+        client = self._get_client()
+        with self._package_lock:
+            if self._package is None or self._package[0] is not client:
+                object.__setattr__(self, '_package', (client, client.get_package(self.package_url)))
+            return self._package[1]
+    
+    def _search(self, term: str):
+        """
+        在配置的包中搜索，结果按包URL和检索词缓存到磁盘（命中时不需要客户端）
+        
+        Args:
+            term (str): 检索词
+            
+        Returns:
+            tuple: (搜索结果, 是否来自缓存)
+        """
+        key = f"{self.package_url}?search={term.strip()}"
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                return json.loads(entry.value), True
+        text = json.dumps(self._get_package().search(term), ensure_ascii=False, default=_jsonable)
+        if self.cache is not None:
+            self.cache.set(key, text, Config.ENVIPATH_SEARCH_TTL, namespace="search")
+        return json.loads(text), False
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        获取搜索结果缓存的统计信息
+        
+        Returns:
+            dict: 命中率、各命名空间条目数和字节数等，缓存未启用时返回 {"enabled": False}
+        """
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
     
     def _run(self, **kwargs) -> Dict:
         """
@@ -58,35 +206,22 @@ class EnviPathTool(BaseTool):
         Returns:
             dict: 操作结果
         """
-        try:
-            # 使用object.__getattribute__获取实例属性
-            client = object.__getattribute__(self, 'client')
-        
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"解析参数时出错: {str(e)}"
-            }
-        
-        if not client:
-            return {
-                "status": "error",
-                "message": "EnviPath客户端未初始化",
-                "suggestion": "请检查网络连接或使用KEGG工具或其他本地数据源"
-            }
-        
         try:
             # 简化参数处理，直接使用kwargs
+            # 缓存命中的搜索不需要客户端，因此不预先等待客户端初始化
             if "compound_name" in kwargs:
-                return self.search_compound(kwargs["compound_name"])
+                result = self.search_compound(kwargs["compound_name"])
             elif "pathway_id" in kwargs:
-                return self.get_pathway_info(kwargs["pathway_id"])
+                result = self.get_pathway_info(kwargs["pathway_id"])
             elif "compound_id" in kwargs:
-                return self.get_compound_pathways(kwargs["compound_id"])
+                result = self.get_compound_pathways(kwargs["compound_id"])
             elif "keyword" in kwargs:
-                return self.search_pathways_by_keyword(kwargs["keyword"])
+                result = self.search_pathways_by_keyword(kwargs["keyword"])
             else:
                 return {"status": "error", "message": "缺少必需参数"}
+            if result.get("status") == "error" and not self.is_ready():
+                result["suggestion"] = "请检查网络连接或使用KEGG工具或其他本地数据源"
+            return result
                 
         except Exception as e:
             return {
@@ -105,10 +240,8 @@ class EnviPathTool(BaseTool):
             dict: 化合物搜索结果
         """
         try:
-            client = object.__getattribute__(self, 'client')
-            package = client.get_package('https://envipath.org/package/32de3cf4-e3e6-4168-956e-32fa5ddb0ce1')
-            result = package.search(compound_name)
-            return {"status": "success", "data": result, "query": compound_name}
+            result, cached = self._search(compound_name)
+            return {"status": "success", "data": result, "query": compound_name, "cached": cached}
         except Exception as e:
             return {
                 "status": "error",
@@ -127,7 +260,7 @@ class EnviPathTool(BaseTool):
             dict: pathway信息
         """
         try:
-            client = object.__getattribute__(self, 'client')
+            client = self._get_client()
             pathway = client.get_pathway(pathway_id)
             return {"status": "success", "data": pathway, "pathway_id": pathway_id}
         except Exception as e:
@@ -148,7 +281,7 @@ class EnviPathTool(BaseTool):
             dict: 相关pathway信息
         """
         try:
-            client = object.__getattribute__(self, 'client')
+            client = self._get_client()
             compound = client.get_compound(compound_id)
             # 注意：这里可能需要根据实际API返回结构进行调整
             pathways = []
@@ -171,10 +304,8 @@ class EnviPathTool(BaseTool):
             dict: 搜索结果
         """
         try:
-            client = object.__getattribute__(self, 'client')
-            package = client.get_package('https://envipath.org/package/32de3cf4-e3e6-4168-956e-32fa5ddb0ce1')
-            result = package.search(keyword)
-            return {"status": "success", "data": result, "keyword": keyword}
+            result, cached = self._search(keyword)
+            return {"status": "success", "data": result, "keyword": keyword, "cached": cached}
         except Exception as e:
             return {
                 "status": "error",
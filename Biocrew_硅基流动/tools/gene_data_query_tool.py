@@ -5,19 +5,28 @@
 """
 
 from crewai.tools import BaseTool
-from config.config import Config
-from sqlalchemy import create_engine, text
 from typing import Dict, Any, List, Optional
 import requests
 import json
 from pydantic import BaseModel, Field
-from tools.pollutant_name_utils import standardize_pollutant_name
+from tools.db_engine_registry import get_engine
+from tools.pollutant_name_utils import (
+    resolve_pollutant_name, suggest_pollutant_names, suggest_pollutant_names_batch
+)
+from tools.pollutant_queries import fetch_pollutant_page, fetch_pollutant_rows_batch
+from tools.result_encoding import encode_grouped_rows, encode_rows
+from config.config import Config
 
 
 class GeneDataQueryInput(BaseModel):
     """基因数据查询输入参数"""
-    pollutant_name: str = Field(..., description="污染物名称")
+    pollutant_name: Optional[str] = Field(None, description="污染物名称")
+    pollutant_names: Optional[List[str]] = Field(None, description="批量查询的污染物名称列表（与pollutant_name至少提供一个）")
     enzyme_type: Optional[str] = Field(None, description="酶类型")
+    profile: Optional[str] = Field(None, description="输出列配置 (minimal, evidence, full)，默认evidence")
+    output_format: str = Field("columnar", description="输出格式 (columnar: 表头+值数组, records: 字典列表)")
+    page_size: int = Field(50, description="每页记录数")
+    after: Optional[int] = Field(None, description="分页游标，传入上一页返回的next_cursor获取下一页")
 
 
 class GeneDataQueryTool(BaseTool):
@@ -37,77 +46,114 @@ class GeneDataQueryTool(BaseTool):
     
     def _get_database_connection(self):
         """
-        创建数据库连接
+        获取共享的数据库引擎（进程内按DSN复用连接池）
         """
-        db_type = Config.DB_TYPE
-        db_host = Config.DB_HOST
-        db_port = Config.DB_PORT
-        db_name = Config.DB_NAME
-        db_user = Config.DB_USER
-        db_password = Config.DB_PASSWORD
-        
-        if db_type == 'postgresql':
-            database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        elif db_type == 'mysql':
-            database_url = f"mysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        else:
-            raise ValueError(f"不支持的数据库类型: {db_type}")
-        
-        engine = create_engine(database_url)
-        return engine
+        return get_engine()
     
-    def _run(self, pollutant_name: str, enzyme_type: Optional[str] = None) -> Dict[Any, Any]:
+    def _run(self, pollutant_name: Optional[str] = None, enzyme_type: Optional[str] = None,
+             profile: Optional[str] = None, output_format: str = "columnar", page_size: int = 50,
+             after: Optional[int] = None, pollutant_names: Optional[List[str]] = None) -> Dict[Any, Any]:
         """
         查询基因数据
         
         Args:
-            pollutant_name (str): 污染物名称
+            pollutant_name (str, optional): 污染物名称
             enzyme_type (str, optional): 酶类型
+            profile (str, optional): 输出列配置 ("minimal", "evidence", "full")
+            output_format (str): 输出格式 ("columnar", "records")
+            page_size (int): 每页记录数
+            after (int, optional): 分页游标（上一页最后一条记录的主键）
+            pollutant_names (list, optional): 批量查询的污染物名称列表，此时page_size为每个污染物的记录上限
             
         Returns:
-            dict: 基因数据
+            dict: 基因数据（批量查询时按污染物分组）
         """
+        if pollutant_names:
+            return self._run_batch(pollutant_names, enzyme_type, profile, output_format, page_size)
+        if not pollutant_name:
+            return {"status": "error", "message": "缺少必需参数: pollutant_name 或 pollutant_names"}
+        
         try:
-            # 标准化污染物名称
-            standardized_name = standardize_pollutant_name(pollutant_name)
+            # 标准化污染物名称，并通过别名表和名称索引精确解析为数据库中存储的规范名称
+            standardized_name = resolve_pollutant_name(pollutant_name)
             
-            with self.db_engine.connect() as connection:
-                if enzyme_type:
-                    result = connection.execute(text("""
-                        SELECT *
-                        FROM genes_data
-                        WHERE pollutant_name = :pollutant_name
-                        AND enzyme_type = :enzyme_type
-                        LIMIT 50
-                    """), {
-                        "pollutant_name": standardized_name,
-                        "enzyme_type": enzyme_type
-                    })
-                else:
-                    result = connection.execute(text("""
-                        SELECT *
-                        FROM genes_data
-                        WHERE pollutant_name = :pollutant_name
-                        LIMIT 50
-                    """), {"pollutant_name": standardized_name})
-                
-                # 转换为字典列表
-                columns = result.keys()
-                rows = result.fetchall()
-                
-                gene_data = []
-                for row in rows:
-                    gene_data.append(dict(zip(columns, row)))
-                
-                return {
-                    "status": "success",
-                    "data": gene_data,
-                    "count": len(gene_data)
-                }
+            page = fetch_pollutant_page(
+                self.db_engine,
+                "genes_data",
+                standardized_name,
+                {"enzyme_type": enzyme_type},
+                page_size=page_size,
+                after=after
+            )
+            gene_data = page["rows"]
+            encoded = encode_rows("genes_data", gene_data, profile, output_format)
+            
+            # 超出输出预算被截掉的记录留到下一页，游标指向最后一条已返回的记录；
+            # 一条都没有返回时游标保持不变，避免跳过未返回的记录
+            next_cursor, has_more = page["next_cursor"], page["has_more"]
+            if encoded["truncated"] and page["primary_key"]:
+                returned_rows = encoded["returned_rows"]
+                next_cursor = gene_data[returned_rows - 1].get(page["primary_key"]) if returned_rows else after
+                has_more = True
+            
+            result = {
+                "status": "success",
+                "resolved_name": standardized_name,
+                "data": encoded,
+                "count": len(gene_data),
+                "next_cursor": next_cursor,
+                "has_more": has_more
+            }
+            # 名称不在数据库中时只给出相似名称作为建议，不替换查询的污染物
+            suggestions = suggest_pollutant_names(standardized_name)
+            if suggestions:
+                result["suggestions"] = suggestions
+            return result
                 
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"查询基因数据时出错: {str(e)}",
                 "pollutant_name": pollutant_name
+            }
+    
+    def _run_batch(self, pollutant_names: List[str], enzyme_type: Optional[str], profile: Optional[str],
+                   output_format: str, limit_per_pollutant: int) -> Dict[Any, Any]:
+        """
+        一次查询多个污染物的基因数据
+        
+        Args:
+            pollutant_names (list): 污染物名称列表
+            enzyme_type (str, optional): 酶类型
+            profile (str, optional): 输出列配置
+            output_format (str): 输出格式
+            limit_per_pollutant (int): 每个污染物最多返回的记录数
+            
+        Returns:
+            dict: 按污染物分组的基因数据
+        """
+        try:
+            resolved = {name: resolve_pollutant_name(name) for name in pollutant_names}
+            grouped = fetch_pollutant_rows_batch(
+                self.db_engine,
+                "genes_data",
+                list(resolved.values()),
+                {"enzyme_type": enzyme_type},
+                limit_per_pollutant=limit_per_pollutant
+            )
+            rows_by_name = {name: grouped.get(standardized, []) for name, standardized in resolved.items()}
+            
+            return {
+                "status": "success",
+                "resolved_names": resolved,
+                "data": encode_grouped_rows("genes_data", rows_by_name, profile, output_format),
+                "count": {name: len(rows) for name, rows in rows_by_name.items()},
+                "suggestions": suggest_pollutant_names_batch(resolved)
+            }
+                
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"批量查询基因数据时出错: {str(e)}",
+                "pollutant_names": pollutant_names
             }
\ No newline at end of file
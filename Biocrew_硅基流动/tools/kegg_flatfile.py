@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+KEGG flat file流式解析器
+逐行读取 /get/ 接口或批量下载的flat file，按 /// 切分记录，只解析选中的字段，
+将ENTRY、NAME、DEFINITION、ORTHOLOGY、PATHWAY、DBLINKS等段落转换为紧凑的结构化记录
+
+用法（在项目根目录执行）:
+    python -m tools.kegg_flatfile ko.txt --fields entry,name,pathway
+    python -m tools.kegg_flatfile ko.txt --fields all --max-items 0
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+
+# 字段名占据每行的前12列
+FIELD_WIDTH = 12
+
+# 未指定字段时返回的紧凑字段（GENES、REFERENCE等体积大的段落需要显式选择）
+DEFAULT_FIELDS = (
+    "entry", "name", "symbol", "definition", "formula", "orthology", "pathway",
+    "module", "enzyme", "reaction", "compound", "dblinks"
+)
+
+# 列表/字典类型字段默认保留的最大条目数
+DEFAULT_MAX_ITEMS = 50
+
+# 条目ID样式（C00001、K00001、R00001、RC00001、1.1.1.1、map00010）
+_ID_TOKEN = re.compile(r"^(?:[A-Z]{1,2}\d{5}|\d+\.[\d-]+\.[\d-]+\.[\d-]+|[a-z]{2,4}\d{5})$")
+
+# DBLINKS/GENES行的数据库前缀（冒号后需有空白，避免把 "ko:K00001" 这样的ID当作前缀）
+_DB_PREFIX = re.compile(r"^\s*([^:]+?):\s+(.*)$")
+
+
+def _join(lines: List[str]) -> str:
+    return " ".join(line.strip() for line in lines if line.strip())
+
+
+def _parse_text(lines: List[str]) -> str:
+    return _join(lines)
+
+
+def _parse_names(lines: List[str]) -> List[str]:
+    """
+    NAME/SYMBOL：化合物每行一个名称并以分号结尾，KO和基因记录以逗号分隔
+    """
+    text = _join(lines)
+    separator = ";" if any(line.rstrip().endswith(";") for line in lines) else ", "
+    return [name.strip() for name in text.split(separator) if name.strip()]
+
+
+def _parse_float(lines: List[str]):
+    text = _join(lines)
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _parse_id_map(lines: List[str]) -> Dict[str, str]:
+    """
+    "ID  描述" 形式的段落（ORTHOLOGY、PATHWAY、MODULE、COMPOUND等）
+    """
+    items = {}
+    for line in lines:
+        parts = line.strip().split(None, 1)
+        if parts:
+            items[parts[0]] = parts[1].strip() if len(parts) > 1 else ""
+    return items
+
+
+def _parse_ids(lines: List[str]):
+    """
+    ENZYME、REACTION：化合物/反应记录中为空格分隔的ID列表，KO等记录中为 "ID  描述"，
+    酶记录的REACTION为反应方程式（如 "alcohol + NAD+ = aldehyde + NADH + H+ [RN:R00623]"），按文本保留
+    """
+    tokens = [token for line in lines for token in line.split()]
+    if tokens and all(_ID_TOKEN.match(token) for token in tokens):
+        return tokens
+    if all(_ID_TOKEN.match(line.split()[0]) for line in lines if line.strip()):
+        return _parse_id_map(lines)
+    return _parse_text(lines)
+
+
+def _parse_db_map(lines: List[str]) -> Dict[str, List[str]]:
+    """
+    "数据库: ID ID ..." 形式的段落（DBLINKS，以及KO记录中的GENES），数据库名可以包含空格
+    （如酶记录中的 "ExplorEnz - The Enzyme Database: 1.1.1.1"），未带前缀的续行归入上一个数据库
+    """
+    items: Dict[str, List[str]] = {}
+    current = None
+    for line in lines:
+        match = _DB_PREFIX.match(line)
+        if match:
+            current = match.group(1).strip()
+            items.setdefault(current, []).extend(match.group(2).split())
+        elif current is not None:
+            items[current].extend(line.split())
+    return items
+
+
+def _parse_genes(lines: List[str]):
+    """
+    GENES：KO记录中为 "HSA: 124(ADH1A) ..."，通路记录中为 "ID  描述"
+    """
+    first = lines[0].split() if lines else []
+    if first and first[0].endswith(":"):
+        return _parse_db_map(lines)
+    return _parse_id_map(lines)
+
+
+# 字段名 -> 解析函数，未列出的字段按文本合并
+FIELD_PARSERS: Dict[str, Callable[[List[str]], object]] = {
+    "NAME": _parse_names,
+    "SYMBOL": _parse_names,
+    "EXACT_MASS": _parse_float,
+    "MOL_WEIGHT": _parse_float,
+    "ORTHOLOGY": _parse_id_map,
+    "PATHWAY": _parse_id_map,
+    "MODULE": _parse_id_map,
+    "COMPOUND": _parse_id_map,
+    "RCLASS": _parse_id_map,
+    "REL_PATHWAY": _parse_id_map,
+    "KO_PATHWAY": _parse_id_map,
+    "NETWORK": _parse_id_map,
+    "DISEASE": _parse_id_map,
+    "ENZYME": _parse_ids,
+    "REACTION": _parse_ids,
+    "DBLINKS": _parse_db_map,
+    "GENES": _parse_genes,
+}
+
+
+def _normalize_fields(fields: Optional[Sequence[str]]) -> Optional[Set[str]]:
+    """
+    将字段选择转换为大写字段名集合，None表示全部字段
+    """
+    if fields is None:
+        fields = DEFAULT_FIELDS
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    selected = {field.strip().upper() for field in fields if field and field.strip()}
+    if selected & {"ALL", "*"}:
+        return None
+    selected.add("ENTRY")
+    return selected
+
+
+def _truncate(value, max_items: int):
+    """
+    截断列表/字典，返回 (截断后的值, 原始条目数或None)
+    """
+    if not max_items or not isinstance(value, (list, dict)) or len(value) <= max_items:
+        return value, None
+    if isinstance(value, list):
+        return value[:max_items], len(value)
+    return dict(list(value.items())[:max_items]), len(value)
+
+
+def _build_record(sections: Dict[str, List[List[str]]], max_items: int) -> Dict:
+    """
+    将收集到的段落解析为记录
+    """
+    record: Dict = {}
+    truncated = {}
+    for field, groups in sections.items():
+        if field == "ENTRY":
+            tokens = _join(groups[0]).split()
+            # 酶记录为 "EC 1.1.1.1  Enzyme"，条目号取EC编号
+            if len(tokens) > 1 and tokens[0].upper() == "EC":
+                tokens = tokens[1:]
+            record["entry"] = tokens[0] if tokens else ""
+            record["entry_type"] = " ".join(tokens[1:])
+            continue
+        if len(groups) > 1:
+            # REFERENCE等重复出现的字段，每次出现作为一项
+            value = [_join(group) for group in groups]
+        else:
+            value = FIELD_PARSERS.get(field, _parse_text)(groups[0])
+        value, total = _truncate(value, max_items)
+        if total is not None:
+            truncated[field.lower()] = total
+        record[field.lower()] = value
+    if truncated:
+        record["truncated"] = truncated
+    return record
+
+
+def iter_flat_records(
+    lines: Iterable[str],
+    fields: Optional[Sequence[str]] = None,
+    max_items: int = DEFAULT_MAX_ITEMS
+) -> Iterator[Dict]:
+    """
+    流式解析flat file，逐条产出记录；未选中的字段不保存也不解析
+
+    Args:
+        lines (Iterable[str]): 文本行（可以是文件对象或响应的行迭代器）
+        fields (Sequence[str], optional): 需要的字段（不区分大小写，entry总是包含），
+            为空时使用DEFAULT_FIELDS，["all"] 表示全部字段
+        max_items (int): 列表/字典字段保留的最大条目数，超出部分截断并在truncated中记录原始数量，0表示不截断
+
+    Yields:
+        dict: 结构化记录，键为小写字段名
+    """
+    selected = _normalize_fields(fields)
+    sections: Dict[str, List[List[str]]] = {}
+    current: Optional[List[str]] = None
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith("///"):
+            if sections:
+                yield _build_record(sections, max_items)
+            sections, current = {}, None
+            continue
+        if not line.strip():
+            continue
+        if not line[0].isspace():
+            field = line[:FIELD_WIDTH].strip()
+            if selected is None or field in selected:
+                current = [line[FIELD_WIDTH:]]
+                sections.setdefault(field, []).append(current)
+            else:
+                current = None
+        elif current is not None:
+            # 续行；REFERENCE下的AUTHORS、TITLE等子字段保留子字段名
+            label = line[:FIELD_WIDTH].strip()
+            current.append(f"{label} {line[FIELD_WIDTH:].strip()}" if label else line[FIELD_WIDTH:])
+
+    if sections:
+        yield _build_record(sections, max_items)
+
+
+def parse_flat_record(
+    text: str,
+    fields: Optional[Sequence[str]] = None,
+    max_items: int = DEFAULT_MAX_ITEMS
+) -> Dict:
+    """
+    解析单条flat file记录
+
+    Args:
+        text (str): 记录文本
+        fields (Sequence[str], optional): 需要的字段，见iter_flat_records
+        max_items (int): 列表/字典字段保留的最大条目数
+
+    Returns:
+        dict: 结构化记录，文本中没有记录时返回空字典
+    """
+    return next(iter_flat_records(text.splitlines(), fields, max_items), {})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口：将flat file转换为每行一条记录的JSON
+    """
+    parser = argparse.ArgumentParser(description="将KEGG flat file转换为结构化记录（JSON Lines）")
+    parser.add_argument("file", help="flat file路径，- 表示标准输入")
+    parser.add_argument("--fields", default=None, help="逗号分隔的字段，all表示全部字段")
+    parser.add_argument("--max-items", type=int, default=DEFAULT_MAX_ITEMS, help="列表/字典字段保留的最大条目数，0表示不截断")
+    args = parser.parse_args(argv)
+
+    try:
+        source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+        with source:
+            for record in iter_flat_records(source, args.fields, args.max_items):
+                print(json.dumps(record, ensure_ascii=False))
+    except Exception as e:
+        print(f"解析失败: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+KEGG关联关系本地镜像
+将KEGG批量导出的link/conv文件（每行 "源条目<TAB>目标条目"）导入SQLite，
+每种关联（如 cpd -> path）按CSR邻接表保存：条目名排序后的位置即整数ID，
+偏移数组和邻居数组以整数数组BLOB存储，查询时按需载入内存，二分查找后直接切片
+
+用法（在项目根目录执行）:
+    curl -o compound_pathway.tsv https://rest.kegg.jp/link/pathway/compound
+    python -m tools.kegg_link_mirror import compound_pathway.tsv ko_pathway.tsv
+    python -m tools.kegg_link_mirror import --conv compound_pubchem.tsv
+    python -m tools.kegg_link_mirror lookup pathway C00001
+    python -m tools.kegg_link_mirror stats
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config.config import Config
+from tools.disk_cache import PROJECT_ROOT
+
+
+# 数据库名称 -> 条目前缀（未列出的名称如 ncbi-geneid、pubchem、物种代码，前缀与名称相同）
+DATABASE_PREFIXES = {
+    "pathway": "path",
+    "compound": "cpd",
+    "ko": "ko",
+    "orthology": "ko",
+    "enzyme": "ec",
+    "reaction": "rn",
+    "rclass": "rc",
+    "glycan": "gl",
+    "drug": "dr",
+    "module": "md",
+    "network": "ne",
+    "disease": "ds",
+    "uniprot": "up",
+}
+
+# 非基因条目的前缀；不在其中的前缀视为物种代码（target_db为genes时匹配全部物种）
+NON_GENE_PREFIXES = frozenset(DATABASE_PREFIXES.values()) | {"ncbi-geneid", "ncbi-proteinid", "pubchem", "chebi"}
+
+# 不带前缀的条目ID -> 前缀
+_ID_PREFIX_PATTERNS = [
+    (re.compile(r"^C\d{5}$"), "cpd"),
+    (re.compile(r"^K\d{5}$"), "ko"),
+    (re.compile(r"^R\d{5}$"), "rn"),
+    (re.compile(r"^RC\d{5}$"), "rc"),
+    (re.compile(r"^G\d{5}$"), "gl"),
+    (re.compile(r"^D\d{5}$"), "dr"),
+    (re.compile(r"^M\d{5}$"), "md"),
+    (re.compile(r"^[a-z]{2,4}\d{5}$"), "path"),
+    (re.compile(r"^\d+\.[\d-]+\.[\d-]+\.[\d-]+$"), "ec"),
+]
+
+
+def entry_prefix(entry: str) -> str:
+    """
+    获取条目前缀（cpd:C00001 -> cpd）
+    """
+    return entry.split(":", 1)[0].lower() if ":" in entry else ""
+
+
+def qualify_entry(entry: str) -> str:
+    """
+    为不带前缀的条目ID补全前缀（C00001 -> cpd:C00001，map00010 -> path:map00010），无法识别时原样返回
+    """
+    entry = entry.strip()
+    if ":" in entry:
+        prefix, local = entry.split(":", 1)
+        return f"{prefix.lower()}:{local}"
+    for pattern, prefix in _ID_PREFIX_PATTERNS:
+        if pattern.match(entry):
+            return f"{prefix}:{entry}"
+    return entry
+
+
+def _int_array(data: bytes) -> array:
+    """
+    从小端序BLOB还原int32数组
+    """
+    values = array("i")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _int_blob(values: array) -> bytes:
+    """
+    将int32数组编码为小端序BLOB
+    """
+    if sys.byteorder == "big":
+        values = array("i", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class LinkRelation:
+    """
+    一种关联关系（如 cpd -> path）的CSR邻接表
+    sources为排序后的源条目，第i个源条目的邻居为 targets[neighbors[offsets[i]:offsets[i+1]]]
+    """
+
+    def __init__(self, sources: List[str], targets: List[str], offsets: array, neighbors: array):
+        self.sources = sources
+        self.targets = targets
+        self.offsets = offsets
+        self.neighbors = neighbors
+
+    @classmethod
+    def build(cls, pairs: Iterable[Tuple[str, str]]) -> "LinkRelation":
+        """
+        由 (源条目, 目标条目) 对构建邻接表
+        """
+        adjacency: Dict[str, Set[str]] = defaultdict(set)
+        for source, target in pairs:
+            adjacency[source].add(target)
+        sources = sorted(adjacency)
+        targets = sorted({target for linked in adjacency.values() for target in linked})
+        target_ids = {target: index for index, target in enumerate(targets)}
+        offsets = array("i", [0])
+        neighbors = array("i")
+        for source in sources:
+            neighbors.extend(sorted(target_ids[target] for target in adjacency[source]))
+            offsets.append(len(neighbors))
+        return cls(sources, targets, offsets, neighbors)
+
+    def get(self, source: str) -> Optional[List[str]]:
+        """
+        查询源条目的全部目标条目，源条目不在镜像中时返回None
+        """
+        index = bisect_left(self.sources, source)
+        if index == len(self.sources) or self.sources[index] != source:
+            return None
+        targets = self.targets
+        return [targets[target] for target in self.neighbors[self.offsets[index]:self.offsets[index + 1]]]
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        """
+        返回全部 (源条目, 目标条目) 对
+        """
+        return [
+            (source, self.targets[target])
+            for index, source in enumerate(self.sources)
+            for target in self.neighbors[self.offsets[index]:self.offsets[index + 1]]
+        ]
+
+    @property
+    def edges(self) -> int:
+        return len(self.neighbors)
+
+
+class KeggLinkMirror:
+    """
+    KEGG link/conv 关系的SQLite镜像（进程内线程安全）
+    """
+
+    def __init__(self, path: str):
+        """
+        打开（必要时创建）镜像文件
+
+        Args:
+            path (str): 镜像文件路径，相对路径以项目根目录为基准
+        """
+        if not os.path.isabs(path):
+            path = os.path.join(PROJECT_ROOT, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS kegg_link_relations (
+                kind TEXT NOT NULL,
+                source_prefix TEXT NOT NULL,
+                target_prefix TEXT NOT NULL,
+                sources BLOB NOT NULL,
+                targets BLOB NOT NULL,
+                offsets BLOB NOT NULL,
+                neighbors BLOB NOT NULL,
+                edges INTEGER NOT NULL,
+                imported_at REAL NOT NULL,
+                PRIMARY KEY (kind, source_prefix, target_prefix)
+            )
+        """)
+        self._connection.commit()
+        self._relations: Dict[Tuple[str, str, str], LinkRelation] = {}
+        self._load_catalog()
+
+    def _load_catalog(self):
+        """
+        读取镜像中已有的关联种类
+        """
+        self._available = {
+            (kind, source_prefix, target_prefix)
+            for kind, source_prefix, target_prefix in self._connection.execute(
+                "SELECT kind, source_prefix, target_prefix FROM kegg_link_relations"
+            )
+        }
+
+    def _relation(self, key: Tuple[str, str, str]) -> Optional[LinkRelation]:
+        """
+        获取关联关系，首次访问时从SQLite载入内存
+        """
+        relation = self._relations.get(key)
+        if relation is not None or key not in self._available:
+            return relation
+        with self._lock:
+            relation = self._relations.get(key)
+            if relation is None:
+                row = self._connection.execute(
+                    "SELECT sources, targets, offsets, neighbors FROM kegg_link_relations "
+                    "WHERE kind = ? AND source_prefix = ? AND target_prefix = ?",
+                    key
+                ).fetchone()
+                if row is None:
+                    return None
+                sources, targets, offsets, neighbors = row
+                relation = LinkRelation(
+                    sources.decode("utf-8").split("\n") if sources else [],
+                    targets.decode("utf-8").split("\n") if targets else [],
+                    _int_array(offsets),
+                    _int_array(neighbors)
+                )
+                self._relations[key] = relation
+        return relation
+
+    def import_pairs(self, pairs: Iterable[Tuple[str, str]], kind: str = "link") -> Dict[str, int]:
+        """
+        导入关联对，按前缀分组后正反两个方向各建一个邻接表，替换镜像中的同种关联
+
+        Args:
+            pairs (Iterable): (源条目, 目标条目) 对
+            kind (str): link 或 conv
+
+        Returns:
+            dict: "源前缀->目标前缀" -> 边数
+        """
+        grouped: Dict[Tuple[str, str], Set[Tuple[str, str]]] = defaultdict(set)
+        for source, target in pairs:
+            source, target = qualify_entry(source), qualify_entry(target)
+            source_prefix, target_prefix = entry_prefix(source), entry_prefix(target)
+            grouped[(source_prefix, target_prefix)].add((source, target))
+            grouped[(target_prefix, source_prefix)].add((target, source))
+
+        imported = {}
+        now = time.time()
+        with self._lock:
+            for (source_prefix, target_prefix), relation_pairs in grouped.items():
+                relation = LinkRelation.build(relation_pairs)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO kegg_link_relations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        kind, source_prefix, target_prefix,
+                        "\n".join(relation.sources).encode("utf-8"),
+                        "\n".join(relation.targets).encode("utf-8"),
+                        _int_blob(relation.offsets),
+                        _int_blob(relation.neighbors),
+                        relation.edges,
+                        now
+                    )
+                )
+                self._relations[(kind, source_prefix, target_prefix)] = relation
+                imported[f"{source_prefix}->{target_prefix}"] = relation.edges
+            self._connection.commit()
+            self._load_catalog()
+        return imported
+
+    def import_files(self, paths: List[str], kind: str = "link") -> Dict[str, int]:
+        """
+        导入KEGG批量导出的link/conv文件（制表符分隔的两列）
+
+        Args:
+            paths (list): 文件路径列表
+            kind (str): link 或 conv
+
+        Returns:
+            dict: "源前缀->目标前缀" -> 边数
+        """
+        def read_pairs():
+            for path in paths:
+                with open(path, encoding="utf-8") as link_file:
+                    for line in link_file:
+                        parts = line.rstrip("\n").split("\t")
+                        if len(parts) == 2 and parts[0] and parts[1]:
+                            yield parts[0].strip(), parts[1].strip()
+
+        return self.import_pairs(read_pairs(), kind)
+
+    def _target_prefixes(self, kind: str, source_prefix: str, target_db: str) -> List[str]:
+        """
+        将目标数据库名称转换为镜像中的目标前缀，genes对应全部物种代码
+        """
+        if target_db == "genes":
+            return sorted(
+                target_prefix for relation_kind, relation_source, target_prefix in self._available
+                if relation_kind == kind and relation_source == source_prefix and target_prefix not in NON_GENE_PREFIXES
+            )
+        return [DATABASE_PREFIXES.get(target_db, target_db)]
+
+    def lookup(self, kind: str, target_db: str, source_entries: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        按KEGG REST的参数格式查询关联关系
+
+        Args:
+            kind (str): link 或 conv
+            target_db (str): 目标数据库 (如 pathway、genes、ncbi-geneid)
+            source_entries (str): 源条目，多个条目用 + 连接；也可以是整个数据库名称 (如 compound、hsa)
+
+        Returns:
+            list: (源条目, 目标条目) 对；镜像中没有对应关联或任一条目时返回None，由调用方回退到REST
+        """
+        entries = [entry for entry in source_entries.split("+") if entry.strip()]
+        if not entries:
+            return None
+
+        # 无法识别为条目ID的单个名称视为整个数据库（如 link/pathway/compound、conv/ncbi-geneid/eco）
+        token = entries[0].strip()
+        if len(entries) == 1 and ":" not in token and qualify_entry(token) == token:
+            source_prefix = DATABASE_PREFIXES.get(token, token)
+            results = []
+            for target_prefix in self._target_prefixes(kind, source_prefix, target_db):
+                relation = self._relation((kind, source_prefix, target_prefix))
+                if relation is None:
+                    return None
+                results.extend(relation.pairs())
+            return results or None
+
+        results = []
+        for entry in entries:
+            entry = qualify_entry(entry)
+            source_prefix = entry_prefix(entry)
+            found = False
+            for target_prefix in self._target_prefixes(kind, source_prefix, target_db):
+                relation = self._relation((kind, source_prefix, target_prefix))
+                targets = relation.get(entry) if relation else None
+                if targets is not None:
+                    found = True
+                    results.extend((entry, target) for target in targets)
+            if not found:
+                return None
+        return results
+
+    def stats(self) -> List[Dict]:
+        """
+        获取镜像中各关联种类的边数和导入时间
+        """
+        with self._lock:
+            return [
+                {
+                    "kind": kind,
+                    "relation": f"{source_prefix}->{target_prefix}",
+                    "edges": edges,
+                    "imported_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(imported_at))
+                }
+                for kind, source_prefix, target_prefix, edges, imported_at in self._connection.execute(
+                    "SELECT kind, source_prefix, target_prefix, edges, imported_at FROM kegg_link_relations "
+                    "ORDER BY kind, source_prefix, target_prefix"
+                )
+            ]
+
+    def close(self):
+        """
+        关闭镜像文件
+        """
+        with self._lock:
+            self._connection.close()
+
+
+_mirror: Optional[KeggLinkMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_kegg_link_mirror() -> Optional[KeggLinkMirror]:
+    """
+    获取进程内共享的关联镜像；未启用或镜像文件不存在时返回None
+
+    Returns:
+        KeggLinkMirror: 关联镜像
+    """
+    global _mirror
+    if not Config.KEGG_LINK_MIRROR_ENABLED:
+        return None
+    if _mirror is None:
+        path = Config.KEGG_LINK_MIRROR_PATH
+        if not os.path.isabs(path):
+            path = os.path.join(PROJECT_ROOT, path)
+        if not os.path.exists(path):
+            return None
+        with _mirror_lock:
+            if _mirror is None:
+                try:
+                    _mirror = KeggLinkMirror(path)
+                except Exception as e:
+                    print(f"打开KEGG关联镜像失败，使用REST接口: {e}")
+                    return None
+    return _mirror
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    """
+    parser = argparse.ArgumentParser(description="KEGG关联关系本地镜像")
+    parser.add_argument("--mirror", default=Config.KEGG_LINK_MIRROR_PATH, help="镜像文件路径")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="导入KEGG link/conv文件")
+    import_parser.add_argument("files", nargs="+", help="制表符分隔的两列文件")
+    import_parser.add_argument("--conv", action="store_true", help="文件为conv（ID转换）关系")
+
+    lookup_parser = subparsers.add_parser("lookup", help="查询关联关系")
+    lookup_parser.add_argument("target_db", help="目标数据库 (如 pathway、genes)")
+    lookup_parser.add_argument("source", help="源条目，多个条目用 + 连接")
+    lookup_parser.add_argument("--conv", action="store_true", help="查询conv关系")
+
+    subparsers.add_parser("stats", help="显示镜像中的关联种类")
+    args = parser.parse_args(argv)
+
+    mirror = KeggLinkMirror(args.mirror)
+    kind = "conv" if getattr(args, "conv", False) else "link"
+    try:
+        if args.command == "import":
+            started = time.perf_counter()
+            imported = mirror.import_files(args.files, kind)
+            for relation, edges in sorted(imported.items()):
+                print(f"✓ {kind} {relation}: {edges} 条")
+            print(f"导入完成，用时 {time.perf_counter() - started:.2f} 秒")
+        elif args.command == "lookup":
+            started = time.perf_counter()
+            pairs = mirror.lookup(kind, args.target_db, args.source)
+            elapsed = (time.perf_counter() - started) * 1e6
+            if pairs is None:
+                print("镜像中没有该关联，需要使用REST接口查询")
+                return 1
+            for source, target in pairs:
+                print(f"{source}\t{target}")
+            print(f"共 {len(pairs)} 条，用时 {elapsed:.0f} 微秒")
+        else:
+            for relation in mirror.stats():
+                print(f"{relation['kind']:<5} {relation['relation']:<24} {relation['edges']:>10} 条  {relation['imported_at']}")
+    except Exception as e:
+        print(f"操作失败: {e}")
+        return 1
+    finally:
+        mirror.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+KEGG降解路线搜索
+以KeggTool获取的化合物-反应关系构建反应图（边为一步反应，附带EC/KO注释），
+从污染物对应的KEGG化合物出发，用Yen算法搜索到达中心代谢入口的k条最短路线；
+反应的EC/KO出现在本地genes_data中时降低边权，使有基因证据的路线排在前面
+
+用法（在项目根目录执行）:
+    python -m tools.kegg_pathfinder C07491
+    python -m tools.kegg_pathfinder Lindane --k 3 --max-depth 8
+"""
+
+import argparse
+import heapq
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from config.config import Config
+from tools.kegg_tool import KEGG_GET_BATCH_SIZE, KeggTool
+
+
+# 中心代谢入口（TCA循环、糖酵解及β-酮己二酸途径的末端产物），到达任一即视为路线完成
+CENTRAL_METABOLITES = {
+    "cpd:C00022": "Pyruvate",
+    "cpd:C00024": "Acetyl-CoA",
+    "cpd:C00033": "Acetate",
+    "cpd:C00036": "Oxaloacetate",
+    "cpd:C00042": "Succinate",
+    "cpd:C00091": "Succinyl-CoA",
+    "cpd:C00122": "Fumarate",
+    "cpd:C00149": "(S)-Malate",
+    "cpd:C00158": "Citrate",
+    "cpd:C00026": "2-Oxoglutarate",
+    "cpd:C00074": "Phosphoenolpyruvate",
+    "cpd:C00118": "D-Glyceraldehyde 3-phosphate",
+    "cpd:C00111": "Glycerone phosphate",
+    "cpd:C00084": "Acetaldehyde",
+    "cpd:C00083": "Malonyl-CoA",
+}
+
+# 枢纽化合物（辅因子、能量载体、小分子无机物），参与大量反应，不作为路线中的节点
+HUB_COMPOUNDS = frozenset({
+    "cpd:C00001",  # H2O
+    "cpd:C00002",  # ATP
+    "cpd:C00003",  # NAD+
+    "cpd:C00004",  # NADH
+    "cpd:C00005",  # NADPH
+    "cpd:C00006",  # NADP+
+    "cpd:C00007",  # O2
+    "cpd:C00008",  # ADP
+    "cpd:C00009",  # Orthophosphate
+    "cpd:C00010",  # CoA
+    "cpd:C00011",  # CO2
+    "cpd:C00013",  # Diphosphate
+    "cpd:C00014",  # NH3
+    "cpd:C00016",  # FAD
+    "cpd:C00019",  # S-Adenosyl-L-methionine
+    "cpd:C00020",  # AMP
+    "cpd:C00021",  # S-Adenosyl-L-homocysteine
+    "cpd:C00027",  # H2O2
+    "cpd:C00028",  # Acceptor
+    "cpd:C00030",  # Reduced acceptor
+    "cpd:C00059",  # Sulfate
+    "cpd:C00080",  # H+
+    "cpd:C00138",  # Reduced ferredoxin
+    "cpd:C00139",  # Oxidized ferredoxin
+    "cpd:C00282",  # Hydrogen
+    "cpd:C00283",  # Hydrogen sulfide
+    "cpd:C00288",  # HCO3-
+    "cpd:C00698",  # Cl-
+    "cpd:C01327",  # Hydrochloric acid
+    "cpd:C01352",  # FADH2
+    "cpd:C00125",  # Ferricytochrome c
+    "cpd:C00126",  # Ferrocytochrome c
+    "cpd:C00399",  # Ubiquinone
+    "cpd:C00390",  # Ubiquinol
+    "cpd:C00244",  # Nitrate
+    "cpd:C00088",  # Nitrite
+})
+
+# 没有EC/KO注释的反应（自发反应或注释缺失）的边权，略高于有注释的反应
+UNANNOTATED_REACTION_WEIGHT = 1.2
+
+_COMPOUND_ID = re.compile(r"^(?:cpd:)?(C\d{5})$", re.IGNORECASE)
+_EQUATION_COMPOUND = re.compile(r"\b([CG]\d{5})\b")
+_EC_NUMBER = re.compile(r"\d+\.[\d-]+\.[\d-]+\.[\d-]+")
+_KO_ID = re.compile(r"K\d{5}")
+
+# genes_data中存放EC号/KO号的列按列名识别（如 ec_number、EC、ko_id、kegg_ko、orthology）
+_EC_COLUMN = re.compile(r"(?:^|_)ec(?:_|$)|enzyme_commission", re.IGNORECASE)
+_KO_COLUMN = re.compile(r"(?:^|_)(?:ko|orthology)(?:_|$)", re.IGNORECASE)
+
+# 虚拟终点：所有中心代谢入口以0权连接到该节点，多终点搜索转换为单终点
+_SINK = "__central_metabolism__"
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def parse_equation(equation: str) -> Tuple[List[str], List[str]]:
+    """
+    解析反应方程式两侧的化合物（"C06000 + 2 C00007 <=> C00011 + ..."）
+
+    Args:
+        equation (str): KEGG反应记录的EQUATION字段
+
+    Returns:
+        tuple: (左侧化合物, 右侧化合物)，均带cpd前缀；无法解析时为空列表
+    """
+    for arrow in ("<=>", "=>", "<="):
+        if arrow in equation:
+            left, right = equation.split(arrow, 1)
+            return (
+                [f"cpd:{compound}" for compound in _EQUATION_COMPOUND.findall(left)],
+                [f"cpd:{compound}" for compound in _EQUATION_COMPOUND.findall(right)]
+            )
+    return [], []
+
+
+def detect_evidence_columns(engine) -> Tuple[List[str], List[str]]:
+    """
+    通过inspect检测genes_data中存放EC号和KO号的列
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        tuple: (EC列, KO列)
+    """
+    from sqlalchemy import inspect
+
+    columns = [column["name"] for column in inspect(engine).get_columns("genes_data")]
+    return (
+        [column for column in columns if _EC_COLUMN.search(column)],
+        [column for column in columns if _KO_COLUMN.search(column)]
+    )
+
+
+def load_gene_evidence(pollutant_name: str) -> Tuple[Counter, Dict]:
+    """
+    读取本地genes_data中该污染物相关基因的EC号和KO号，作为路线的证据；
+    污染物名称只做精确解析，不在数据库中或表中没有EC/KO列时不加权并给出警告
+
+    Args:
+        pollutant_name (str): 污染物名称
+
+    Returns:
+        tuple: (Counter: "ec:1.14.12.1" / "ko:K00001" -> 出现次数,
+                dict: resolved_name、columns、rows、suggestions、warning)
+    """
+    evidence = Counter()
+    info = {"resolved_name": None, "columns": [], "rows": 0, "suggestions": [], "warning": None}
+    try:
+        from tools.db_engine_registry import get_engine
+        from tools.pollutant_name_utils import resolve_pollutant_name, suggest_pollutant_names
+        from tools.pollutant_queries import fetch_pollutant_rows
+
+        engine = get_engine()
+        ec_columns, ko_columns = detect_evidence_columns(engine)
+        info["columns"] = ec_columns + ko_columns
+        if not info["columns"]:
+            info["warning"] = "genes_data中没有EC号或KO号列，路线不按基因证据加权"
+            print(f"[警告] {info['warning']}")
+            return evidence, info
+
+        resolved_name = resolve_pollutant_name(pollutant_name)
+        info["resolved_name"] = resolved_name
+        rows = fetch_pollutant_rows(
+            engine, "genes_data", resolved_name,
+            limit=Config.KEGG_PATHFINDER_EVIDENCE_ROWS
+        )
+    except Exception as e:
+        info["warning"] = f"读取基因证据失败，路线不按证据加权: {e}"
+        print(f"[警告] {info['warning']}")
+        return evidence, info
+
+    info["rows"] = len(rows)
+    if not rows:
+        # 不用相似名称代替，避免以其他污染物的基因作为证据
+        info["suggestions"] = suggest_pollutant_names(resolved_name)
+        info["warning"] = f"genes_data中没有 {resolved_name} 的基因记录，路线不按基因证据加权"
+        return evidence, info
+
+    for row in rows:
+        for column in ec_columns:
+            for ec in _EC_NUMBER.findall(str(row.get(column) or "")):
+                evidence[f"ec:{ec}"] += 1
+        for column in ko_columns:
+            for ko in _KO_ID.findall(str(row.get(column) or "")):
+                evidence[f"ko:{ko}"] += 1
+    return evidence, info
+
+
+class ReactionGraph:
+    """
+    按需扩展的化合物-反应图，反应详情在实例内缓存，多次搜索复用
+    """
+
+    def __init__(self, kegg_tool: KeggTool):
+        self.kegg_tool = kegg_tool
+        self._lock = threading.Lock()
+        # 化合物 -> 参与的反应；反应 -> {"left", "right", "ec", "ko"}
+        self.compound_reactions: Dict[str, List[str]] = {}
+        self.reactions: Dict[str, Dict] = {}
+
+    def _load_compound_reactions(self, compounds: List[str]):
+        """
+        批量获取化合物参与的反应（link/reaction，每批10个化合物）
+        """
+        missing = [compound for compound in compounds if compound not in self.compound_reactions]
+        for chunk in _chunks(missing, KEGG_GET_BATCH_SIZE):
+            result = self.kegg_tool.link_entries("reaction", "+".join(chunk))
+            if result.get("status") != "success":
+                raise RuntimeError(f"获取化合物反应失败: {result.get('message')}")
+            linked = {compound: [] for compound in chunk}
+            for link in result["data"]:
+                source = link["source"] if link["source"].startswith("cpd:") else f"cpd:{link['source']}"
+                linked.setdefault(source, []).append(link["target"])
+            self.compound_reactions.update(linked)
+
+    def _load_reactions(self, reaction_ids: List[str]):
+        """
+        批量获取反应的方程式和EC/KO注释
+        """
+        missing = list(dict.fromkeys(reaction for reaction in reaction_ids if reaction not in self.reactions))
+        if not missing:
+            return
+        result = self.kegg_tool.get_entries(missing, fields=["equation", "enzyme", "orthology"])
+        if result.get("status") != "success":
+            raise RuntimeError(f"获取反应详情失败: {result.get('errors') or result.get('message')}")
+        for reaction in missing:
+            record = result["data"].get(reaction, {})
+            left, right = parse_equation(record.get("equation", ""))
+            enzyme = record.get("enzyme") or []
+            self.reactions[reaction] = {
+                "left": left,
+                "right": right,
+                "ec": sorted(enzyme if isinstance(enzyme, list) else enzyme.keys()),
+                "ko": sorted(record.get("orthology") or {}),
+            }
+
+    def expand(self, source: str, max_depth: int, max_compounds: int, targets: Set[str]):
+        """
+        从源化合物按层扩展反应图；中心代谢入口和枢纽化合物不再向外扩展
+
+        Args:
+            source (str): 源化合物 (cpd:Cxxxxx)
+            max_depth (int): 最大反应步数
+            max_compounds (int): 扩展的化合物数上限
+            targets (set): 中心代谢入口
+        """
+        with self._lock:
+            visited = {source}
+            frontier = [source]
+            for _ in range(max_depth):
+                if not frontier or len(visited) >= max_compounds:
+                    break
+                self._load_compound_reactions(frontier)
+                self._load_reactions([
+                    reaction for compound in frontier for reaction in self.compound_reactions.get(compound, [])
+                ])
+                next_frontier = []
+                for compound in frontier:
+                    for neighbor, _ in self._neighbors(compound):
+                        if neighbor in visited or neighbor in HUB_COMPOUNDS:
+                            continue
+                        visited.add(neighbor)
+                        if neighbor not in targets and len(visited) < max_compounds:
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+
+    def _neighbors(self, compound: str) -> Iterable[Tuple[str, str]]:
+        """
+        化合物经一步反应可到达的化合物（方程式另一侧，不含枢纽化合物）
+        KEGG参考反应大多可逆，两个方向都视为可行
+        """
+        for reaction in self.compound_reactions.get(compound, []):
+            info = self.reactions.get(reaction)
+            if not info:
+                continue
+            if compound in info["left"]:
+                products = info["right"]
+            elif compound in info["right"]:
+                products = info["left"]
+            else:
+                continue
+            for product in products:
+                if product != compound and product not in HUB_COMPOUNDS:
+                    yield product, reaction
+
+    def weighted_adjacency(self, evidence: Counter) -> Dict[str, Dict[str, Tuple[float, str]]]:
+        """
+        生成带权邻接表，每对化合物之间保留权重最小的反应
+
+        Args:
+            evidence (Counter): load_gene_evidence的结果
+
+        Returns:
+            dict: 化合物 -> {相邻化合物: (边权, 反应)}
+        """
+        adjacency: Dict[str, Dict[str, Tuple[float, str]]] = {}
+        with self._lock:
+            for compound in self.compound_reactions:
+                edges = adjacency.setdefault(compound, {})
+                for neighbor, reaction in self._neighbors(compound):
+                    weight = self.reaction_weight(reaction, evidence)
+                    if neighbor not in edges or weight < edges[neighbor][0]:
+                        edges[neighbor] = (weight, reaction)
+        return adjacency
+
+    def reaction_weight(self, reaction: str, evidence: Counter) -> float:
+        """
+        反应的边权：有基因证据的反应乘以Config.KEGG_PATHFINDER_EVIDENCE_WEIGHT，无注释的反应略高
+        """
+        info = self.reactions[reaction]
+        if not info["ec"] and not info["ko"]:
+            return UNANNOTATED_REACTION_WEIGHT
+        if self.supporting_evidence(reaction, evidence):
+            return Config.KEGG_PATHFINDER_EVIDENCE_WEIGHT
+        return 1.0
+
+    def supporting_evidence(self, reaction: str, evidence: Counter) -> List[str]:
+        """
+        反应的EC/KO中出现在基因证据里的部分
+        """
+        info = self.reactions[reaction]
+        keys = [f"ec:{ec}" for ec in info["ec"]] + [f"ko:{ko}" for ko in info["ko"]]
+        return [key for key in keys if evidence.get(key)]
+
+
+def _dijkstra(
+    adjacency: Dict[str, Dict[str, Tuple[float, str]]],
+    source: str,
+    targets: Set[str],
+    banned_nodes: Set[str],
+    banned_edges: Set[Tuple[str, str]]
+) -> Optional[Tuple[float, List[str]]]:
+    """
+    到虚拟终点的最短路径（中心代谢入口以0权连接虚拟终点，且不再向外扩展）
+    """
+    distances = {source: 0.0}
+    previous: Dict[str, str] = {}
+    heap = [(0.0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if node == _SINK:
+            path = [node]
+            while path[-1] != source:
+                path.append(previous[path[-1]])
+            return distance, path[::-1]
+        if distance > distances.get(node, float("inf")):
+            continue
+        if node in targets:
+            edges = {_SINK: (0.0, "")}
+        else:
+            edges = adjacency.get(node, {})
+        for neighbor, (weight, _) in edges.items():
+            if neighbor in banned_nodes or (node, neighbor) in banned_edges:
+                continue
+            candidate = distance + weight
+            if candidate < distances.get(neighbor, float("inf")):
+                distances[neighbor] = candidate
+                previous[neighbor] = node
+                heapq.heappush(heap, (candidate, neighbor))
+    return None
+
+
+def k_shortest_routes(
+    adjacency: Dict[str, Dict[str, Tuple[float, str]]],
+    source: str,
+    targets: Set[str],
+    k: int
+) -> List[Tuple[float, List[str]]]:
+    """
+    Yen算法：从源化合物到任一中心代谢入口的k条无环最短路线
+
+    Args:
+        adjacency (dict): ReactionGraph.weighted_adjacency的结果
+        source (str): 源化合物
+        targets (set): 中心代谢入口
+        k (int): 路线数
+
+    Returns:
+        list: (总权重, 化合物序列) 列表，按总权重升序，化合物序列不含虚拟终点
+    """
+    def edge_weight(node: str, neighbor: str) -> float:
+        return 0.0 if neighbor == _SINK else adjacency[node][neighbor][0]
+
+    first = _dijkstra(adjacency, source, targets, set(), set())
+    if first is None:
+        return []
+    routes = [first]
+    candidates: List[Tuple[float, int, List[str]]] = []
+    seen = {tuple(first[1])}
+    counter = 0
+
+    while len(routes) < k:
+        last_path = routes[-1][1]
+        for index in range(len(last_path) - 1):
+            spur_node = last_path[index]
+            root = last_path[:index + 1]
+            banned_edges = {
+                (path[index], path[index + 1])
+                for _, path in routes
+                if len(path) > index + 1 and path[:index + 1] == root
+            }
+            spur = _dijkstra(adjacency, spur_node, targets, set(root[:-1]), banned_edges)
+            if spur is None:
+                continue
+            path = root[:-1] + spur[1]
+            if tuple(path) in seen:
+                continue
+            seen.add(tuple(path))
+            root_cost = sum(edge_weight(root[i], root[i + 1]) for i in range(len(root) - 1))
+            counter += 1
+            heapq.heappush(candidates, (root_cost + spur[0], counter, path))
+        if not candidates:
+            break
+        cost, _, path = heapq.heappop(candidates)
+        routes.append((cost, path))
+
+    return [(cost, path[:-1]) for cost, path in routes]
+
+
+class KeggPathfinder:
+    """
+    降解路线搜索引擎
+    """
+
+    def __init__(self, kegg_tool: Optional[KeggTool] = None):
+        self.kegg_tool = kegg_tool or KeggTool()
+        self.graph = ReactionGraph(self.kegg_tool)
+
+    def resolve_compound(self, pollutant: str) -> Optional[str]:
+        """
+        将KEGG化合物ID或污染物名称解析为 cpd:Cxxxxx；按名称搜索时优先选择名称完全一致的条目
+        """
+        match = _COMPOUND_ID.match(pollutant.strip())
+        if match:
+            return f"cpd:{match.group(1).upper()}"
+        result = self.kegg_tool.find_entries("compound", pollutant)
+        if result.get("status") != "success" or not result["data"]:
+            return None
+        wanted = pollutant.strip().lower()
+        for entry in result["data"]:
+            names = [name.strip().lower() for name in entry["description"].split(";")]
+            if wanted in names:
+                return entry["id"]
+        return result["data"][0]["id"]
+
+    def _compound_names(self, compounds: List[str]) -> Dict[str, str]:
+        """
+        批量获取化合物的首选名称
+        """
+        result = self.kegg_tool.get_entries(compounds, fields=["name"])
+        names = {compound: CENTRAL_METABOLITES.get(compound, "") for compound in compounds}
+        for compound, record in result.get("data", {}).items():
+            if record.get("name"):
+                names[compound] = record["name"][0]
+        return names
+
+    def find_routes(
+        self,
+        pollutant: str,
+        k: int = 5,
+        max_depth: Optional[int] = None,
+        use_gene_evidence: bool = True
+    ) -> Dict:
+        """
+        搜索从污染物到中心代谢的候选降解路线
+
+        Args:
+            pollutant (str): 污染物名称或KEGG化合物ID (如 Lindane、C07491)
+            k (int): 返回的路线数
+            max_depth (int, optional): 最大反应步数，默认Config.KEGG_PATHFINDER_MAX_DEPTH
+            use_gene_evidence (bool): 是否按本地genes_data中的EC/KO证据加权
+
+        Returns:
+            dict: source、routes（按总权重排序，含每步反应及EC/KO）、evidence（基因证据来源）、
+                  graph规模和各阶段耗时
+        """
+        timings = {}
+        started = time.perf_counter()
+        source = self.resolve_compound(pollutant)
+        if source is None:
+            raise ValueError(f"KEGG中未找到化合物: {pollutant}")
+        targets = set(CENTRAL_METABOLITES)
+
+        self.graph.expand(
+            source,
+            max_depth or Config.KEGG_PATHFINDER_MAX_DEPTH,
+            Config.KEGG_PATHFINDER_MAX_COMPOUNDS,
+            targets
+        )
+        timings["graph_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        evidence, evidence_info = Counter(), None
+        if use_gene_evidence:
+            # 按化合物ID查询时，用KEGG中的首选名称查找基因证据
+            name = self._compound_names([source]).get(source) if _COMPOUND_ID.match(pollutant.strip()) else pollutant
+            if name:
+                evidence, evidence_info = load_gene_evidence(name)
+
+        search_started = time.perf_counter()
+        adjacency = self.graph.weighted_adjacency(evidence)
+        ranked = k_shortest_routes(adjacency, source, targets, k)
+        timings["search_ms"] = round((time.perf_counter() - search_started) * 1000, 2)
+
+        compounds = list(dict.fromkeys(compound for _, path in ranked for compound in path))
+        names = self._compound_names(compounds) if compounds else {}
+
+        routes = []
+        for rank, (cost, path) in enumerate(ranked, 1):
+            steps = []
+            for substrate, product in zip(path, path[1:]):
+                reaction = adjacency[substrate][product][1]
+                info = self.graph.reactions[reaction]
+                steps.append({
+                    "substrate": substrate,
+                    "product": product,
+                    "reaction": reaction,
+                    "ec": info["ec"],
+                    "ko": info["ko"],
+                    "evidence": self.graph.supporting_evidence(reaction, evidence)
+                })
+            routes.append({
+                "rank": rank,
+                "cost": round(cost, 3),
+                "end_point": names.get(path[-1]) or CENTRAL_METABOLITES.get(path[-1], path[-1]),
+                "compounds": [{"id": compound, "name": names.get(compound, "")} for compound in path],
+                "steps": steps,
+                "ec_set": sorted({ec for step in steps for ec in step["ec"]}),
+                "ko_set": sorted({ko for step in steps for ko in step["ko"]}),
+                "supported_steps": sum(1 for step in steps if step["evidence"])
+            })
+
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return {
+            "source": {"id": source, "query": pollutant},
+            "routes": routes,
+            "evidence": evidence_info,
+            "graph": {
+                "compounds": len(self.graph.compound_reactions),
+                "reactions": len(self.graph.reactions),
+                "evidence_terms": len(evidence)
+            },
+            "timings_ms": timings
+        }
+
+
+class KeggPathfinderRequest(BaseModel):
+    pollutant: str = Field(..., description="污染物英文名称或KEGG化合物ID (如 Lindane、C07491)")
+    k: int = Field(5, description="返回的候选路线数")
+    max_depth: Optional[int] = Field(None, description="最大反应步数，默认6")
+    use_gene_evidence: bool = Field(True, description="是否按本地基因数据中的EC/KO证据为路线加权")
+
+
+class KeggPathfinderTool(BaseTool):
+    """KEGG降解路线搜索工具"""
+
+    name: str = "KeggPathfinderTool"
+    description: str = "从污染物的KEGG化合物出发，搜索到达中心代谢（TCA循环/糖酵解）的候选降解路线，返回每步反应及所需EC/KO"
+    args_schema: type[BaseModel] = KeggPathfinderRequest
+
+    def __init__(self, kegg_tool: Optional[KeggTool] = None):
+        """
+        初始化路线搜索工具
+
+        Args:
+            kegg_tool (KeggTool, optional): 用于获取KEGG数据的工具实例
+        """
+        super().__init__()
+        # 使用object.__setattr__来设置实例属性，避免Pydantic验证错误
+        object.__setattr__(self, 'pathfinder', KeggPathfinder(kegg_tool))
+
+    def _run(self, pollutant: str, k: int = 5, max_depth: Optional[int] = None,
+             use_gene_evidence: bool = True) -> Dict:
+        """
+        搜索候选降解路线
+
+        Args:
+            pollutant (str): 污染物英文名称或KEGG化合物ID
+            k (int): 返回的候选路线数
+            max_depth (int, optional): 最大反应步数
+            use_gene_evidence (bool): 是否按基因证据加权
+
+        Returns:
+            dict: 候选路线
+        """
+        try:
+            return {
+                "status": "success",
+                "data": self.pathfinder.find_routes(pollutant, k, max_depth, use_gene_evidence)
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"搜索降解路线失败: {str(e)}",
+                "pollutant": pollutant
+            }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    """
+    parser = argparse.ArgumentParser(description="搜索污染物到中心代谢的KEGG降解路线")
+    parser.add_argument("pollutant", help="污染物英文名称或KEGG化合物ID")
+    parser.add_argument("--k", type=int, default=5, help="候选路线数")
+    parser.add_argument("--max-depth", type=int, default=None, help="最大反应步数")
+    parser.add_argument("--no-evidence", action="store_true", help="不使用本地基因证据加权")
+    parser.add_argument("--json", action="store_true", help="输出完整JSON")
+    args = parser.parse_args(argv)
+
+    result = KeggPathfinderTool()._run(args.pollutant, args.k, args.max_depth, not args.no_evidence)
+    if result["status"] != "success":
+        print(result["message"])
+        return 1
+    data = result["data"]
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+        return 0
+
+    if data["evidence"] and data["evidence"]["warning"]:
+        print(f"[警告] {data['evidence']['warning']}")
+    print(f"{data['source']['query']} ({data['source']['id']})，反应图 {data['graph']['compounds']} 个化合物 / "
+          f"{data['graph']['reactions']} 个反应，用时 {data['timings_ms']['total_ms']} 毫秒")
+    for route in data["routes"]:
+        print(f"#{route['rank']} 权重 {route['cost']} -> {route['end_point']}（{route['supported_steps']} 步有基因证据）")
+        print("   " + " -> ".join(compound["name"] or compound["id"] for compound in route["compounds"]))
+        print(f"   EC: {', '.join(route['ec_set']) or '-'}  KO: {', '.join(route['ko_set']) or '-'}")
+    if not data["routes"]:
+        print("未找到到达中心代谢的路线，可增大 --max-depth")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
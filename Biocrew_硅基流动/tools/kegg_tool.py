@@ -6,9 +6,191 @@ KEGG数据库访问工具
 
 from crewai.tools import BaseTool
 import requests
+import io
 import json
-from typing import Dict, List, Optional, Any
+import re
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pydantic import BaseModel, Field
+from config.config import Config
+from tools.disk_cache import get_disk_cache
+from tools.kegg_flatfile import parse_flat_record
+from tools.kegg_link_mirror import get_kegg_link_mirror
+from tools.kegg_transport import get_kegg_transport
+
+
+# 各操作的缓存有效期（秒）：条目和关联关系很少变化，搜索结果和数据库信息更新较快
+KEGG_CACHE_TTLS = {
+    "info": 24 * 3600,
+    "list": 7 * 24 * 3600,
+    "find": 24 * 3600,
+    "get": 30 * 24 * 3600,
+    "link": 30 * 24 * 3600,
+    "conv": 30 * 24 * 3600,
+}
+
+# /get/ 接口单次请求最多接受的条目数
+KEGG_GET_BATCH_SIZE = 10
+
+# 批量获取条目共享的线程池，并发数受Config.KEGG_MAX_WORKERS限制，避免触发KEGG的访问频率限制
+_kegg_executor: Optional[ThreadPoolExecutor] = None
+_kegg_executor_lock = threading.Lock()
+
+
+# 正在后台读完剩余内容的流式响应URL，避免同一响应被重复下载
+_draining_urls = set()
+_draining_lock = threading.Lock()
+
+
+def _claim_stream_drain(url: str) -> bool:
+    """
+    登记后台读取任务，同一URL已有任务在进行时返回False
+    """
+    with _draining_lock:
+        if url in _draining_urls:
+            return False
+        _draining_urls.add(url)
+        return True
+
+
+def _get_kegg_executor() -> ThreadPoolExecutor:
+    """
+    获取共享的KEGG请求线程池
+    """
+    global _kegg_executor
+    if _kegg_executor is None:
+        with _kegg_executor_lock:
+            if _kegg_executor is None:
+                _kegg_executor = ThreadPoolExecutor(
+                    max_workers=Config.KEGG_MAX_WORKERS,
+                    thread_name_prefix="kegg-request"
+                )
+    return _kegg_executor
+
+
+def split_flat_records(text: str) -> List[str]:
+    """
+    将KEGG flat file按 /// 拆分为单条记录
+
+    Args:
+        text (str): /get/ 接口返回的文本，可包含多条记录
+
+    Returns:
+        list: 记录文本列表（保留结尾的 ///）
+    """
+    records = []
+    current = []
+    for line in text.splitlines():
+        current.append(line)
+        if line.startswith("///"):
+            records.append("\n".join(current))
+            current = []
+    if any(line.strip() for line in current):
+        records.append("\n".join(current))
+    return records
+
+
+def _local_id(entry_id: str) -> str:
+    """
+    取条目ID中冒号后的部分（如 hsa:10458 -> 10458，cpd:C00001 -> C00001），用于与ENTRY行比较
+    """
+    return entry_id.split(":", 1)[-1].strip().lower()
+
+
+def _record_entry_id(record: str) -> str:
+    """
+    读取记录ENTRY行中的条目号；酶记录的ENTRY行为 "EC 1.1.1.1  Enzyme"，跳过EC前缀
+    """
+    for line in record.splitlines():
+        if line.startswith("ENTRY"):
+            parts = line.split()[1:]
+            if len(parts) > 1 and parts[0].upper() == "EC":
+                parts = parts[1:]
+            return parts[0].lower() if parts else ""
+    return ""
+
+
+def match_records_to_ids(entry_ids: List[str], records: List[str]) -> Dict[str, str]:
+    """
+    将批量返回的记录对应回请求的条目ID
+    KEGG按请求顺序返回记录并跳过不存在的条目，因此按顺序匹配ENTRY行，
+    不同物种中编号相同的基因（如 hsa:1 与 mmu:1）也能区分
+
+    Args:
+        entry_ids (list): 一次请求中的条目ID（按请求顺序）
+        records (list): split_flat_records的结果
+
+    Returns:
+        dict: 条目ID -> 记录文本
+    """
+    matched = {}
+    position = 0
+    for record in records:
+        record_id = _record_entry_id(record)
+        for index in range(position, len(entry_ids)):
+            if _local_id(entry_ids[index]) == record_id:
+                matched[entry_ids[index]] = record
+                position = index + 1
+                break
+    return matched
+
+
+def filter_rows(rows: Iterator[Dict], key: str, prefix: Optional[str] = None,
+                pattern: Optional[str] = None, organisms: Optional[List[str]] = None) -> Iterator[Dict]:
+    """
+    按ID前缀、正则表达式和物种白名单惰性过滤记录
+
+    Args:
+        rows (Iterator[dict]): 记录迭代器
+        key (str): 用于前缀和物种过滤的字段
+        prefix (str, optional): ID前缀（不区分大小写）
+        pattern (str, optional): 正则表达式，在记录的所有字段中搜索（不区分大小写）
+        organisms (list, optional): 物种代码白名单，匹配ID中冒号前的部分
+
+    Yields:
+        dict: 通过过滤的记录
+    """
+    prefix = prefix.lower() if prefix else None
+    regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+    allowed = {organism.strip().lower() for organism in organisms} if organisms else None
+    for row in rows:
+        value = row[key].lower()
+        if prefix and not value.startswith(prefix):
+            continue
+        if allowed is not None and value.split(":", 1)[0] not in allowed:
+            continue
+        if regex and not regex.search("\t".join(row.values())):
+            continue
+        yield row
+
+
+def take_page(rows: Iterator[Dict], limit: Optional[int], offset: int = 0) -> Tuple[List[Dict], bool]:
+    """
+    从迭代器中取出一页记录，取完后关闭迭代器（流式响应随之释放连接）
+
+    Args:
+        rows (Iterator[dict]): 记录迭代器
+        limit (int, optional): 页大小，为空时取出全部
+        offset (int): 跳过的记录数
+
+    Returns:
+        tuple: (记录列表, 之后是否还有记录)
+    """
+    try:
+        remaining = islice(rows, offset, None)
+        if limit is None:
+            return list(remaining), False
+        page = list(islice(remaining, limit))
+        return page, next(remaining, None) is not None
+    finally:
+        close = getattr(rows, "close", None)
+        if close:
+            close()
 
 
 class GetDatabaseInfoRequest(BaseModel):
@@ -18,6 +200,11 @@ class GetDatabaseInfoRequest(BaseModel):
 class ListEntriesRequest(BaseModel):
     database: str = Field(..., description="数据库名称")
     organism: Optional[str] = Field(None, description="物种代码 (如 hsa 表示人类)")
+    prefix: Optional[str] = Field(None, description="条目ID前缀过滤")
+    pattern: Optional[str] = Field(None, description="正则表达式过滤（匹配ID和描述）")
+    organisms: Optional[List[str]] = Field(None, description="物种代码白名单")
+    limit: Optional[int] = Field(None, description="最多返回的条目数，默认100")
+    offset: int = Field(0, description="跳过的条目数，用于分页")
 
 
 class FindEntriesRequest(BaseModel):
@@ -27,12 +214,23 @@ class FindEntriesRequest(BaseModel):
 
 class GetEntryRequest(BaseModel):
     entry_id: str = Field(..., description="条目ID (如 hsa:10458)")
-    format_type: str = Field("json", description="返回格式 (json, aaseq, ntseq等)")
+    format_type: Optional[str] = Field(None, description="返回格式 (为空时返回结构化记录，flat为原始文本，aaseq, ntseq等)")
+    fields: Optional[List[str]] = Field(None, description="结构化记录包含的字段 (如 [\"name\", \"pathway\"])，[\"all\"] 为全部字段")
+
+
+class GetEntriesRequest(BaseModel):
+    entry_ids: List[str] = Field(..., description="条目ID列表 (如 [\"ko:K00001\", \"hsa:10458\"])，自动按每批10个合并请求")
+    fields: Optional[List[str]] = Field(None, description="结构化记录包含的字段，[\"all\"] 为全部字段")
 
 
 class LinkEntriesRequest(BaseModel):
     target_db: str = Field(..., description="目标数据库")
     source_db_entries: str = Field(..., description="源数据库条目 (如 hsa)")
+    prefix: Optional[str] = Field(None, description="目标条目ID前缀过滤")
+    pattern: Optional[str] = Field(None, description="正则表达式过滤（匹配源条目和目标条目）")
+    organisms: Optional[List[str]] = Field(None, description="物种代码白名单（按目标条目过滤）")
+    limit: Optional[int] = Field(None, description="最多返回的关联数，默认100")
+    offset: int = Field(0, description="跳过的关联数，用于分页")
 
 
 class ConvertIdRequest(BaseModel):
@@ -66,7 +264,205 @@ class KeggTool(BaseTool):
         super().__init__()  # 调用父类构造函数
         # 使用object.__setattr__来设置实例属性，避免Pydantic验证错误
         object.__setattr__(self, 'base_url', base_url)
-        object.__setattr__(self, 'session', requests.Session())
+        # 限速、连接池、超时和重试由进程内共享的传输层负责
+        object.__setattr__(self, 'transport', get_kegg_transport())
+        # 响应缓存在进程内按文件共享，多个工具实例复用同一个缓存
+        cache = (
+            get_disk_cache(Config.KEGG_CACHE_PATH, Config.KEGG_CACHE_MAX_MB * 1024 * 1024)
+            if Config.KEGG_CACHE_ENABLED else None
+        )
+        object.__setattr__(self, 'cache', cache)
+        # 本地关联镜像（未导入时为None），link/conv查询优先使用
+        object.__setattr__(self, 'link_mirror', get_kegg_link_mirror())
+    
+    def _open(self, operation: str, url: str, stream: bool = False) -> Tuple[Optional[str], Optional[requests.Response]]:
+        """
+        按缓存策略打开KEGG请求：优先使用未过期的缓存，过期条目通过ETag/Last-Modified条件请求重新验证，
+        网络失败或服务端错误时使用过期缓存兜底；离线模式只读缓存
+        
+        Args:
+            operation (str): KEGG操作名 (info, list, find, get, link, conv)，决定缓存有效期
+            url (str): 请求URL
+            stream (bool): 是否以流式方式请求（响应体由调用方逐行读取）
+            
+        Returns:
+            tuple: (缓存文本, None) 或 (None, 需要读取响应体的响应)
+        """
+        entry = self.cache.get(url, allow_stale=True) if self.cache else None
+        if entry and entry.fresh:
+            return entry.value, None
+        
+        if Config.KEGG_OFFLINE:
+            if entry:
+                return entry.value, None
+            raise RuntimeError(f"离线模式下缓存中没有该请求: {url}")
+        
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        
+        try:
+            response = self.transport.get(url, headers=headers, stream=stream)
+        except requests.RequestException as e:
+            if entry:
+                print(f"KEGG请求失败，使用过期缓存: {e}")
+                return entry.value, None
+            raise
+        
+        if entry and response.status_code == 304:
+            response.close()
+            self.cache.refresh(url, KEGG_CACHE_TTLS.get(operation, 24 * 3600))
+            return entry.value, None
+        if entry and response.status_code >= 500:
+            response.close()
+            print(f"KEGG服务端错误 {response.status_code}，使用过期缓存")
+            return entry.value, None
+        if response.status_code >= 400:
+            response.close()
+        response.raise_for_status()
+        return None, response
+    
+    def _store(self, operation: str, url: str, text: str, response: requests.Response):
+        """
+        将响应文本写入缓存
+        """
+        self.cache.set(
+            url,
+            text,
+            KEGG_CACHE_TTLS.get(operation, 24 * 3600),
+            namespace=operation,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+    
+    def _fetch(self, operation: str, url: str, store: bool = True) -> str:
+        """
+        获取KEGG响应文本（缓存策略见_open）
+        
+        Args:
+            operation (str): KEGG操作名 (info, list, find, get, link, conv)，决定缓存有效期
+            url (str): 请求URL
+            store (bool): 是否将响应写入缓存
+            
+        Returns:
+            str: 响应文本
+        """
+        text, response = self._open(operation, url)
+        if response is None:
+            return text
+        if self.cache and store:
+            self._store(operation, url, response.text, response)
+        return response.text
+    
+    def _iter_lines(self, operation: str, url: str) -> Iterator[str]:
+        """
+        逐行读取KEGG响应（缓存策略见_open）；网络响应以流式方式读取，
+        不超过Config.KEGG_STREAM_CACHE_MAX_MB的响应写入缓存：调用方提前停止迭代（如取满一页）时，
+        剩余内容在后台线程中读完后再写入，之后的分页和offset直接命中缓存
+        
+        Args:
+            operation (str): KEGG操作名
+            url (str): 请求URL
+            
+        Yields:
+            str: 非空响应行
+        """
+        text, response = self._open(operation, url, stream=True)
+        if response is None:
+            for line in io.StringIO(text):
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line
+            return
+        
+        # 响应头未声明字符集时iter_lines不解码，KEGG的文本为UTF-8
+        response.encoding = response.encoding or "utf-8"
+        limit = Config.KEGG_STREAM_CACHE_MAX_MB * 1024 * 1024
+        declared = response.headers.get("Content-Length", "")
+        # 声明的长度已超过上限时不缓冲
+        buffer = [] if self.cache and not (declared.isdigit() and int(declared) > limit) else None
+        size = 0
+        lines = response.iter_lines(decode_unicode=True)
+        drain = False
+        try:
+            for line in lines:
+                if buffer is not None:
+                    size += len(line) + 1
+                    buffer = buffer if size <= limit else None
+                    if buffer is not None:
+                        buffer.append(line)
+                if line:
+                    yield line
+            if buffer is not None:
+                self._store(operation, url, "\n".join(buffer) + "\n", response)
+        except GeneratorExit:
+            drain = buffer is not None and _claim_stream_drain(url)
+            raise
+        finally:
+            if drain:
+                threading.Thread(
+                    target=self._drain_to_cache,
+                    args=(operation, url, response, lines, buffer, size, limit),
+                    name="kegg-stream-cache",
+                    daemon=True
+                ).start()
+            else:
+                response.close()
+    
+    def _drain_to_cache(self, operation: str, url: str, response: requests.Response,
+                        lines: Iterator[str], buffer: List[str], size: int, limit: int):
+        """
+        读完调用方提前停止迭代的流式响应，总大小不超过limit时写入缓存
+        
+        Args:
+            operation (str): KEGG操作名
+            url (str): 请求URL
+            response (requests.Response): 尚未读完的响应
+            lines (Iterator[str]): 响应的行迭代器（从中断处继续）
+            buffer (list): 已读取的行
+            size (int): 已读取的字节数
+            limit (int): 缓存的字节数上限
+        """
+        try:
+            with closing(response):
+                for line in lines:
+                    size += len(line) + 1
+                    if size > limit:
+                        return
+                    buffer.append(line)
+                self._store(operation, url, "\n".join(buffer) + "\n", response)
+        except Exception as e:
+            print(f"[警告] 读取剩余KEGG响应失败，不写入缓存: {e}")
+        finally:
+            with _draining_lock:
+                _draining_urls.discard(url)
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        获取KEGG响应缓存的统计信息
+        
+        Returns:
+            dict: 命中/未命中次数、各操作的条目数和字节数；缓存关闭时返回空字典
+        """
+        return self.cache.stats() if self.cache else {}
+    
+    def prewarm(self, calls: List[Dict]) -> Dict:
+        """
+        预热缓存：依次执行给定的查询，冷启动或离线运行前把常用响应写入缓存
+        
+        Args:
+            calls (list): 查询参数列表，每项与_run的参数相同，如 {"target_db": "pathway", "source_db_entries": "C00001"}
+            
+        Returns:
+            dict: 成功和失败的查询数
+        """
+        outcome = {"success": 0, "error": 0}
+        for call in calls:
+            result = self._run(**call)
+            outcome["success" if result.get("status") == "success" else "error"] += 1
+        return outcome
     
     def _run(self, **kwargs) -> Dict[Any, Any]:
         """
@@ -80,14 +476,24 @@ class KeggTool(BaseTool):
         """
         try:
             # 简化参数处理，直接使用kwargs
+            # 列表和关联结果可能有数万条，智能体调用时默认只返回一页
+            page = {
+                "prefix": kwargs.get("prefix"),
+                "pattern": kwargs.get("pattern"),
+                "organisms": kwargs.get("organisms"),
+                "limit": kwargs.get("limit") or Config.KEGG_STREAM_DEFAULT_LIMIT,
+                "offset": kwargs.get("offset") or 0
+            }
             if "database" in kwargs and "organism" in kwargs:
-                return self.list_entries(kwargs["database"], kwargs.get("organism"))
+                return self.list_entries(kwargs["database"], kwargs.get("organism"), **page)
             elif "database" in kwargs and "keywords" in kwargs:
                 return self.find_entries(kwargs["database"], kwargs["keywords"])
+            elif "entry_ids" in kwargs:
+                return self.get_entries(kwargs["entry_ids"], kwargs.get("fields"))
             elif "entry_id" in kwargs:
-                return self.get_entry(kwargs["entry_id"], kwargs.get("format_type", "json"))
+                return self.get_entry(kwargs["entry_id"], kwargs.get("format_type"), kwargs.get("fields"))
             elif "target_db" in kwargs and "source_db_entries" in kwargs:
-                return self.link_entries(kwargs["target_db"], kwargs["source_db_entries"])
+                return self.link_entries(kwargs["target_db"], kwargs["source_db_entries"], **page)
             elif "target_db" in kwargs and "source_ids" in kwargs:
                 return self.convert_id(kwargs["target_db"], kwargs["source_ids"])
             elif "compound_id" in kwargs and "pathway" in kwargs:
@@ -109,6 +515,30 @@ class KeggTool(BaseTool):
                 "message": f"执行操作时出错: {str(e)}"
             }
     
+    async def _arun(self, **kwargs) -> Dict:
+        """
+        异步执行KEGG操作，参数与_run相同
+        请求在线程中执行，仍受共享令牌桶限速，多个查询可以用asyncio.gather并发执行
+        
+        Returns:
+            dict: 操作结果
+        """
+        # 使用事件循环的默认线程池：get_entries会向KEGG线程池提交批次，在同一线程池中等待可能死锁
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self._run, **kwargs))
+    
+    async def arun_many(self, calls: List[Dict]) -> List[Dict]:
+        """
+        并发执行多个相互独立的KEGG查询
+        
+        Args:
+            calls (list): 查询参数列表，每项与_run的参数相同
+            
+        Returns:
+            list: 与calls顺序对应的操作结果
+        """
+        return list(await asyncio.gather(*(self._arun(**call) for call in calls)))
+    
     def get_database_info(self, database: str) -> Dict:
         """
         获取数据库信息
@@ -121,12 +551,11 @@ class KeggTool(BaseTool):
         """
         try:
             url = f"{self.base_url}/info/{database}"
-            response = self.session.get(url)
-            response.raise_for_status()
+            text = self._fetch("info", url)
             
             return {
                 "status": "success",
-                "data": response.text,
+                "data": text,
                 "database": database
             }
         except Exception as e:
@@ -136,47 +565,64 @@ class KeggTool(BaseTool):
                 "database": database
             }
     
-    def list_entries(self, database: str, organism: Optional[str] = None) -> Dict:
+    def iter_list_entries(self, database: str, organism: Optional[str] = None,
+                          prefix: Optional[str] = None, pattern: Optional[str] = None,
+                          organisms: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        流式列出数据库中的条目，逐行解析并过滤，不构建完整列表
+        
+        Args:
+            database (str): 数据库名称
+            organism (str, optional): 物种代码 (如 hsa 表示人类)
+            prefix (str, optional): 条目ID前缀 (如 hsa:10)
+            pattern (str, optional): 正则表达式，在整行（ID和描述）中搜索，不区分大小写
+            organisms (list, optional): 物种代码白名单，按条目ID的前缀过滤
+            
+        Yields:
+            dict: 条目 {"id", "description"}
+        """
+        if organism:
+            url = f"{self.base_url}/list/{organism}:{database}"
+        else:
+            url = f"{self.base_url}/list/{database}"
+        
+        rows = (
+            {"id": parts[0], "description": "\t".join(parts[1:])}
+            for parts in (line.split('\t') for line in self._iter_lines("list", url))
+        )
+        return filter_rows(rows, "id", prefix, pattern, organisms)
+    
+    def list_entries(self, database: str, organism: Optional[str] = None,
+                     prefix: Optional[str] = None, pattern: Optional[str] = None,
+                     organisms: Optional[List[str]] = None,
+                     limit: Optional[int] = None, offset: int = 0) -> Dict:
         """
         列出数据库中的条目
         
         Args:
             database (str): 数据库名称
             organism (str, optional): 物种代码 (如 hsa 表示人类)
+            prefix (str, optional): 条目ID前缀
+            pattern (str, optional): 正则表达式，在整行中搜索
+            organisms (list, optional): 物种代码白名单
+            limit (int, optional): 最多返回的条目数，为空时返回全部
+            offset (int): 跳过的条目数（在过滤之后计算）
             
         Returns:
-            dict: 条目列表
+            dict: 条目列表，has_more表示之后是否还有条目
         """
         try:
-            if organism:
-                url = f"{self.base_url}/list/{organism}:{database}"
-            else:
-                url = f"{self.base_url}/list/{database}"
-                
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            # 解析返回的文本数据
-            entries = []
-            for line in response.text.strip().split('\n'):
-                if line:
-                    parts = line.split('\t')
-                    if len(parts) >= 2:
-                        entries.append({
-                            "id": parts[0],
-                            "description": parts[1]
-                        })
-                    elif len(parts) == 1:
-                        entries.append({
-                            "id": parts[0],
-                            "description": ""
-                        })
+            entries, has_more = take_page(
+                self.iter_list_entries(database, organism, prefix, pattern, organisms), limit, offset
+            )
             
             return {
                 "status": "success",
                 "data": entries,
                 "database": database,
-                "count": len(entries)
+                "count": len(entries),
+                "offset": offset,
+                "has_more": has_more
             }
         except Exception as e:
             return {
@@ -201,12 +647,11 @@ class KeggTool(BaseTool):
             keywords = keywords.replace(' ', '+')
             url = f"{self.base_url}/find/{database}/{keywords}"
             
-            response = self.session.get(url)
-            response.raise_for_status()
+            text = self._fetch("find", url)
             
             # 解析返回的文本数据
             entries = []
-            for line in response.text.strip().split('\n'):
+            for line in text.strip().split('\n'):
                 if line:
                     parts = line.split('\t')
                     if len(parts) >= 2:
@@ -235,25 +680,33 @@ class KeggTool(BaseTool):
                 "keyword": keywords.replace('+', ' ') if 'keywords' in locals() else ""
             }
     
-    def get_entry(self, entry_id: str, format_type: str = "json") -> Dict:
+    def get_entry(self, entry_id: str, format_type: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict:
         """
         获取特定条目的详细信息
+        默认解析flat file并只返回选中的字段；KEGG的 /get/ 接口不支持json格式，传入json时同样返回结构化记录
         
         Args:
             entry_id (str): 条目ID (如 hsa:10458)
-            format_type (str): 返回格式 (json, aaseq, ntseq等)
+            format_type (str, optional): 返回格式；为空时返回结构化记录，flat返回原始文本，
+                aaseq、ntseq、mol、kgml等按KEGG格式返回原始文本
+            fields (list, optional): 结构化记录包含的字段 (如 ["name", "pathway"])，默认见kegg_flatfile.DEFAULT_FIELDS，["all"] 为全部字段
             
         Returns:
             dict: 条目详细信息
         """
         try:
-            url = f"{self.base_url}/get/{entry_id}/{format_type}"
-            response = self.session.get(url)
-            response.raise_for_status()
+            if format_type in (None, "", "json"):
+                text = self._fetch("get", self._entry_url(entry_id))
+                data = parse_flat_record(text, fields, Config.KEGG_ENTRY_MAX_ITEMS)
+                format_type = "record"
+            elif format_type == "flat":
+                data = self._fetch("get", self._entry_url(entry_id))
+            else:
+                data = self._fetch("get", f"{self.base_url}/get/{entry_id}/{format_type}")
             
             return {
                 "status": "success",
-                "data": response.text,
+                "data": data,
                 "entry_id": entry_id,
                 "format": format_type
             }
@@ -265,39 +718,155 @@ class KeggTool(BaseTool):
                 "format": format_type
             }
     
-    def link_entries(self, target_db: str, source_db_entries: str) -> Dict:
+    def get_entries(self, entry_ids: List[str], fields: Optional[List[str]] = None, raw: bool = False) -> Dict:
+        """
+        批量获取条目详情（flat file格式）
+        ID按每批10个用 + 合并为一次请求，各批并发获取，返回文本按 /// 拆分回单条记录；
+        拆分后的单条记录按单条目URL写入缓存，已缓存的条目不再请求
+        
+        Args:
+            entry_ids (list): 条目ID列表 (如 ["ko:K00001", "hsa:10458"])
+            fields (list, optional): 结构化记录包含的字段，见get_entry
+            raw (bool): 是否返回原始flat file文本而不是结构化记录
+            
+        Returns:
+            dict: data为 条目ID -> 结构化记录（raw时为记录文本），not_found为KEGG中不存在的条目，errors为请求失败的批次
+        """
+        try:
+            unique_ids = list(dict.fromkeys(entry_id.strip() for entry_id in entry_ids if entry_id and entry_id.strip()))
+            records = {}
+            pending = []
+            for entry_id in unique_ids:
+                entry = self.cache.get(self._entry_url(entry_id), allow_stale=Config.KEGG_OFFLINE) if self.cache else None
+                if entry:
+                    records[entry_id] = entry.value
+                else:
+                    pending.append(entry_id)
+            
+            chunks = [
+                pending[start:start + KEGG_GET_BATCH_SIZE]
+                for start in range(0, len(pending), KEGG_GET_BATCH_SIZE)
+            ]
+            executor = _get_kegg_executor()
+            futures = [executor.submit(self._fetch_entry_chunk, chunk) for chunk in chunks]
+            errors = []
+            for chunk, future in zip(chunks, futures):
+                try:
+                    records.update(future.result())
+                except Exception as e:
+                    errors.append({"entry_ids": chunk, "message": str(e)})
+            
+            if not raw:
+                records = {
+                    entry_id: parse_flat_record(record, fields, Config.KEGG_ENTRY_MAX_ITEMS)
+                    for entry_id, record in records.items()
+                }
+            failed = {entry_id for error in errors for entry_id in error["entry_ids"]}
+            return {
+                "status": "error" if errors and not records else "success",
+                "data": {entry_id: records[entry_id] for entry_id in unique_ids if entry_id in records},
+                "not_found": [entry_id for entry_id in unique_ids if entry_id not in records and entry_id not in failed],
+                "errors": errors,
+                "count": len(records),
+                "requests": len(chunks)
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": str(e),
+                "entry_ids": entry_ids
+            }
+    
+    def _entry_url(self, entry_id: str) -> str:
+        """
+        单个条目flat file的URL，也是该条目的缓存键
+        """
+        return f"{self.base_url}/get/{entry_id}"
+    
+    def _fetch_entry_chunk(self, chunk: List[str]) -> Dict[str, str]:
+        """
+        获取一批（最多10个）条目并拆分为单条记录，拆分后的记录按单条目URL写入缓存
+        
+        Args:
+            chunk (list): 条目ID列表
+            
+        Returns:
+            dict: 条目ID -> 记录文本（不含KEGG中不存在的条目）
+        """
+        url = f"{self.base_url}/get/{'+'.join(chunk)}"
+        try:
+            # 合并请求的URL组合多变，不单独缓存，只缓存拆分后的单条记录
+            text = self._fetch("get", url, store=False)
+        except requests.HTTPError as e:
+            # 整批条目都不存在时KEGG返回404
+            if getattr(e.response, "status_code", None) == 404:
+                return {}
+            raise
+        
+        matched = match_records_to_ids(chunk, split_flat_records(text))
+        if self.cache:
+            for entry_id, record in matched.items():
+                self.cache.set(self._entry_url(entry_id), record, KEGG_CACHE_TTLS["get"], namespace="get")
+        return matched
+    
+    def iter_link_entries(self, target_db: str, source_db_entries: str,
+                          prefix: Optional[str] = None, pattern: Optional[str] = None,
+                          organisms: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        流式查找相关条目，优先使用本地关联镜像，否则逐行读取REST响应
+        
+        Args:
+            target_db (str): 目标数据库
+            source_db_entries (str): 源数据库条目 (如 hsa)
+            prefix (str, optional): 目标条目ID前缀
+            pattern (str, optional): 正则表达式，在源条目和目标条目中搜索，不区分大小写
+            organisms (list, optional): 物种代码白名单，按目标条目ID的前缀过滤
+            
+        Yields:
+            dict: 关联 {"source", "target"}
+        """
+        links = self._mirror_pairs("link", target_db, source_db_entries)
+        if links is None:
+            url = f"{self.base_url}/link/{target_db}/{source_db_entries}"
+            links = (
+                {"source": parts[0], "target": parts[1]}
+                for parts in (line.split('\t') for line in self._iter_lines("link", url))
+                if len(parts) == 2
+            )
+        return filter_rows(iter(links), "target", prefix, pattern, organisms)
+    
+    def link_entries(self, target_db: str, source_db_entries: str,
+                     prefix: Optional[str] = None, pattern: Optional[str] = None,
+                     organisms: Optional[List[str]] = None,
+                     limit: Optional[int] = None, offset: int = 0) -> Dict:
         """
         查找相关条目
         
         Args:
             target_db (str): 目标数据库
             source_db_entries (str): 源数据库条目 (如 hsa)
+            prefix (str, optional): 目标条目ID前缀
+            pattern (str, optional): 正则表达式，在源条目和目标条目中搜索
+            organisms (list, optional): 物种代码白名单
+            limit (int, optional): 最多返回的关联数，为空时返回全部
+            offset (int): 跳过的关联数（在过滤之后计算）
             
         Returns:
-            dict: 关联信息
+            dict: 关联信息，has_more表示之后是否还有关联
         """
         try:
-            url = f"{self.base_url}/link/{target_db}/{source_db_entries}"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            # 解析返回的文本数据
-            links = []
-            for line in response.text.strip().split('\n'):
-                if line:
-                    parts = line.split('\t')
-                    if len(parts) == 2:
-                        links.append({
-                            "source": parts[0],
-                            "target": parts[1]
-                        })
+            links, has_more = take_page(
+                self.iter_link_entries(target_db, source_db_entries, prefix, pattern, organisms), limit, offset
+            )
             
             return {
                 "status": "success",
                 "data": links,
                 "target_db": target_db,
                 "source": source_db_entries,
-                "count": len(links)
+                "count": len(links),
+                "offset": offset,
+                "has_more": has_more
             }
         except Exception as e:
             return {
@@ -307,6 +876,40 @@ class KeggTool(BaseTool):
                 "source": source_db_entries
             }
     
+    def _mirror_pairs(self, kind: str, target_db: str, source: str) -> Optional[List[Dict]]:
+        """
+        从本地关联镜像查询link/conv关系
+        
+        Returns:
+            list: 关联列表；未导入镜像或镜像中没有该关联时返回None，由调用方回退到REST
+        """
+        if self.link_mirror is None:
+            return None
+        try:
+            pairs = self.link_mirror.lookup(kind, target_db, source)
+        except Exception as e:
+            print(f"查询KEGG关联镜像失败，使用REST接口: {e}")
+            return None
+        if pairs is None:
+            return None
+        return [{"source": source_entry, "target": target_entry} for source_entry, target_entry in pairs]
+    
+    @staticmethod
+    def _parse_pairs(text: str) -> List[Dict]:
+        """
+        解析link/conv接口返回的两列文本
+        """
+        pairs = []
+        for line in text.strip().split('\n'):
+            if line:
+                parts = line.split('\t')
+                if len(parts) == 2:
+                    pairs.append({
+                        "source": parts[0],
+                        "target": parts[1]
+                    })
+        return pairs
+    
     def convert_id(self, target_db: str, source_ids: str) -> Dict:
         """
         转换ID格式
@@ -319,20 +922,10 @@ class KeggTool(BaseTool):
             dict: 转换结果
         """
         try:
-            url = f"{self.base_url}/conv/{target_db}/{source_ids}"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            # 解析返回的文本数据
-            conversions = []
-            for line in response.text.strip().split('\n'):
-                if line:
-                    parts = line.split('\t')
-                    if len(parts) == 2:
-                        conversions.append({
-                            "source": parts[0],
-                            "target": parts[1]
-                        })
+            conversions = self._mirror_pairs("conv", target_db, source_ids)
+            if conversions is None:
+                url = f"{self.base_url}/conv/{target_db}/{source_ids}"
+                conversions = self._parse_pairs(self._fetch("conv", url))
             
             return {
                 "status": "success",
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+KEGG REST请求传输层
+进程内共享一个令牌桶限速器（KEGG限制约每秒3次请求）和有界连接池，
+每次请求带连接/读取超时和整体截止时间，403/429/5xx及网络错误按指数退避重试
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import Config
+
+
+# 需要退避重试的状态码：KEGG超出访问频率时返回403，429/5xx为临时错误
+RETRY_STATUS_CODES = frozenset({403, 429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    令牌桶限速器（线程安全）
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        初始化限速器
+
+        Args:
+            rate (float): 每秒补充的令牌数，即平均请求速率
+            capacity (float, optional): 桶容量，即允许的突发请求数，默认与rate相同（至少为1）
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        取得一个令牌，令牌不足时等待
+
+        Args:
+            timeout (float, optional): 最长等待时间（秒），为空时一直等待
+
+        Returns:
+            bool: 是否在超时前取得令牌
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class KeggTransport:
+    """
+    带限速、超时和重试的KEGG HTTP客户端，多个KeggTool实例和线程共享同一个实例
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        pool_size: int = 6,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        deadline: float = 60.0,
+        max_retries: int = 4,
+        backoff_base: float = 0.5
+    ):
+        """
+        初始化传输层
+
+        Args:
+            rate (float): 每秒请求数上限
+            pool_size (int): 连接池大小（并发连接数上限）
+            connect_timeout (float): 连接超时（秒）
+            read_timeout (float): 读取超时（秒）
+            deadline (float): 单次请求（含重试和限速等待）的默认截止时间（秒）
+            max_retries (int): 最大重试次数
+            backoff_base (float): 退避基数（秒），第n次重试前等待 backoff_base * 2^n 加随机抖动
+        """
+        self.limiter = TokenBucket(rate)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.session = requests.Session()
+        # 重试由本类处理，适配器本身不重试；pool_block使并发请求等待空闲连接而不是新建连接
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """
+        计算重试前的等待时间，优先使用服务器给出的Retry-After
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff_base * (2 ** attempt) + random.uniform(0, self.backoff_base)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, deadline: Optional[float] = None,
+            stream: bool = False) -> requests.Response:
+        """
+        发送GET请求
+
+        Args:
+            url (str): 请求URL
+            headers (dict, optional): 请求头
+            deadline (float, optional): 本次请求的截止时间（秒），默认使用实例配置；
+                限速等待、重试退避和每次尝试的超时都不会超过剩余时间
+            stream (bool): 是否流式读取响应体（读取超时作用于每次读取）
+
+        Returns:
+            requests.Response: 响应；重试用尽后仍为可重试状态码时返回最后一次响应，由调用方处理
+
+        Raises:
+            requests.RequestException: 网络错误重试用尽或超过截止时间
+        """
+        budget = self.deadline if deadline is None else deadline
+        deadline_at = time.monotonic() + budget
+        response, last_error = None, None
+
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0 or not self.limiter.acquire(remaining):
+                break
+            remaining = max(deadline_at - time.monotonic(), 0.001)
+            with self._stats_lock:
+                self._stats["requests"] += 1
+                if attempt:
+                    self._stats["retries"] += 1
+            try:
+                response = self.session.get(
+                    url,
+                    headers=headers,
+                    stream=stream,
+                    timeout=(min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+                )
+                last_error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, last_error = None, e
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+
+            delay = self._backoff(attempt, response)
+            if attempt == self.max_retries or time.monotonic() + delay >= deadline_at:
+                break
+            if response is not None:
+                # 释放流式响应占用的连接
+                response.close()
+            time.sleep(delay)
+
+        with self._stats_lock:
+            self._stats["failures"] += 1
+        if response is not None:
+            return response
+        raise last_error or requests.Timeout(f"KEGG请求超过截止时间 {budget} 秒: {url}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取请求、重试和失败次数
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+
+_transport: Optional[KeggTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_kegg_transport() -> KeggTransport:
+    """
+    获取进程内共享的KEGG传输层（限速按进程计算，所有工具实例共用一个令牌桶）
+
+    Returns:
+        KeggTransport: 传输层
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = KeggTransport(
+                    rate=Config.KEGG_RATE_LIMIT,
+                    pool_size=Config.KEGG_POOL_SIZE,
+                    connect_timeout=Config.KEGG_CONNECT_TIMEOUT,
+                    read_timeout=Config.KEGG_READ_TIMEOUT,
+                    deadline=Config.KEGG_REQUEST_DEADLINE,
+                    max_retries=Config.KEGG_MAX_RETRIES,
+                    backoff_base=Config.KEGG_BACKOFF_BASE
+                )
+    return _transport
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+污染物别名表
+pollutant_aliases表保存 别名 -> 规范名称 的映射及CAS号、KEGG/enviPath标识，
+进程内缓存为以标准化名称为键的哈希表，名称解析一次查表即可完成
+
+用法（在项目根目录执行）:
+    python -m tools.pollutant_aliases seed                 # 写入内置的常用别名
+    python -m tools.pollutant_aliases import aliases.csv   # 批量导入CSV（已存在的别名会被覆盖）
+    python -m tools.pollutant_aliases lookup 林丹          # 查询别名
+
+CSV需包含表头 alias,canonical_name，可选列 cas_number,kegg_id,envipath_id
+"""
+
+import csv
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+
+from tools.pollutant_name_utils import standardize_pollutant_name
+
+
+ALIAS_TABLE = "pollutant_aliases"
+
+ALIAS_FIELDS = ("alias", "canonical_name", "cas_number", "kegg_id", "envipath_id")
+
+CREATE_ALIAS_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {ALIAS_TABLE} (
+        alias VARCHAR(255) PRIMARY KEY,
+        canonical_name VARCHAR(255) NOT NULL,
+        cas_number VARCHAR(32),
+        kegg_id VARCHAR(32),
+        envipath_id VARCHAR(255),
+        updated_at TIMESTAMP
+    )
+"""
+
+# 内置别名（规范名称为数据库中存储的标准化名称）
+DEFAULT_ALIASES = [
+    {"alias": "hexachlorocyclohexane", "canonical_name": "hexachlorocyclohexane", "cas_number": "608-73-1"},
+    {"alias": "bhc", "canonical_name": "hexachlorocyclohexane"},
+    {"alias": "benzene hexachloride", "canonical_name": "hexachlorocyclohexane"},
+    {"alias": "六六六", "canonical_name": "hexachlorocyclohexane"},
+    {"alias": "lindane", "canonical_name": "gamma_hexachlorocyclohexane", "cas_number": "58-89-9", "kegg_id": "C07075"},
+    {"alias": "林丹", "canonical_name": "gamma_hexachlorocyclohexane"},
+    {"alias": "polychlorinated biphenyl", "canonical_name": "polychlorinated_biphenyl", "cas_number": "1336-36-3"},
+    {"alias": "polychlorinated biphenyls", "canonical_name": "polychlorinated_biphenyl"},
+    {"alias": "pcbs", "canonical_name": "polychlorinated_biphenyl"},
+    {"alias": "多氯联苯", "canonical_name": "polychlorinated_biphenyl"},
+    {"alias": "polycyclic aromatic hydrocarbons", "canonical_name": "polycyclic_aromatic_hydrocarbon"},
+    {"alias": "pahs", "canonical_name": "polycyclic_aromatic_hydrocarbon"},
+    {"alias": "多环芳烃", "canonical_name": "polycyclic_aromatic_hydrocarbon"},
+]
+
+
+def _normalize_record(record: Dict) -> Optional[Dict]:
+    """
+    规范化别名记录：别名和规范名称转换为标准化名称，空字段置为None
+
+    Args:
+        record (dict): 原始记录
+
+    Returns:
+        dict: 规范化后的记录，缺少别名或规范名称时返回None
+    """
+    alias = standardize_pollutant_name(record.get("alias") or "")
+    canonical_name = standardize_pollutant_name(record.get("canonical_name") or "")
+    if not alias or not canonical_name:
+        return None
+    normalized = {field: (record.get(field) or "").strip() or None for field in ALIAS_FIELDS}
+    normalized.update(alias=alias, canonical_name=canonical_name)
+    return normalized
+
+
+class PollutantAliasMap:
+    """
+    进程内的别名哈希表：标准化别名/CAS号 -> 别名记录
+    """
+
+    def __init__(self, records: Iterable[Dict] = ()):
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, Dict] = {}
+        self._aliases_by_canonical: Dict[str, List[str]] = {}
+        self.loaded_at: Optional[float] = None
+        self.load(records)
+
+    def load(self, records: Iterable[Dict]):
+        """
+        用新的记录替换哈希表内容（构建完成后原子替换）
+
+        Args:
+            records (Iterable[Dict]): 别名记录
+        """
+        by_key: Dict[str, Dict] = {}
+        aliases_by_canonical: Dict[str, List[str]] = {}
+        for record in records:
+            record = _normalize_record(record)
+            if record is None:
+                continue
+            by_key[record["alias"]] = record
+            aliases_by_canonical.setdefault(record["canonical_name"], []).append(record["alias"])
+
+        # CAS号也可以直接解析（别名优先，避免覆盖同名别名）
+        for record in list(by_key.values()):
+            if record["cas_number"]:
+                by_key.setdefault(standardize_pollutant_name(record["cas_number"]), record)
+
+        with self._lock:
+            self._by_key = by_key
+            self._aliases_by_canonical = aliases_by_canonical
+            self.loaded_at = time.time()
+
+    def load_from_engine(self, engine):
+        """
+        从别名表加载，内置别名作为默认值（数据库中的同名记录优先）
+
+        Args:
+            engine: SQLAlchemy引擎
+        """
+        with engine.connect() as connection:
+            result = connection.execute(text(f"SELECT {', '.join(ALIAS_FIELDS)} FROM {ALIAS_TABLE}"))
+            rows = [dict(zip(ALIAS_FIELDS, row)) for row in result.fetchall()]
+        self.load(DEFAULT_ALIASES + rows)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def get(self, pollutant_name: str) -> Optional[Dict]:
+        """
+        查询别名记录
+
+        Args:
+            pollutant_name (str): 污染物名称、别名或CAS号（原始或标准化形式均可）
+
+        Returns:
+            dict: 别名记录（包含canonical_name、cas_number、kegg_id、envipath_id），未找到时返回None
+        """
+        record = self._by_key.get(standardize_pollutant_name(pollutant_name))
+        return dict(record) if record else None
+
+    def canonical_name(self, pollutant_name: str) -> Optional[str]:
+        """
+        返回别名对应的规范名称，未找到时返回None
+        """
+        record = self._by_key.get(standardize_pollutant_name(pollutant_name))
+        return record["canonical_name"] if record else None
+
+    def aliases_for(self, canonical_name: str) -> List[str]:
+        """
+        返回规范名称的全部别名
+
+        Args:
+            canonical_name (str): 规范名称
+
+        Returns:
+            list: 标准化后的别名列表
+        """
+        return list(self._aliases_by_canonical.get(standardize_pollutant_name(canonical_name), []))
+
+
+_alias_map = PollutantAliasMap(DEFAULT_ALIASES)
+_alias_map_lock = threading.Lock()
+_alias_map_loaded_from_db = False
+_alias_map_failed_at: Optional[float] = None
+
+
+def get_pollutant_alias_map() -> PollutantAliasMap:
+    """
+    获取进程内共享的别名哈希表（未从数据库加载时只包含内置别名）
+
+    Returns:
+        PollutantAliasMap: 别名哈希表
+    """
+    return _alias_map
+
+
+def ensure_pollutant_alias_map(engine, wait: bool = True) -> PollutantAliasMap:
+    """
+    首次调用时从别名表加载哈希表，之后直接返回；
+    加载失败时继续使用内置别名，并在一个名称索引刷新周期内不再重试
+
+    Args:
+        engine: SQLAlchemy引擎
+        wait (bool): 是否等待加载完成；为False时在后台线程中加载并立即返回（加载前只使用内置别名）
+
+    Returns:
+        PollutantAliasMap: 别名哈希表
+    """
+    global _alias_map_loaded_from_db, _alias_map_failed_at
+    from config.config import Config
+
+    if not Config.POLLUTANT_ALIAS_ENABLED or _alias_map_loaded_from_db:
+        return _alias_map
+    if not wait:
+        threading.Thread(
+            target=ensure_pollutant_alias_map, args=(engine,), name="pollutant-alias-map-load", daemon=True
+        ).start()
+        return _alias_map
+
+    with _alias_map_lock:
+        recently_failed = (
+            _alias_map_failed_at is not None
+            and time.time() - _alias_map_failed_at < Config.NAME_INDEX_REFRESH_INTERVAL
+        )
+        if not _alias_map_loaded_from_db and not recently_failed:
+            try:
+                _alias_map.load_from_engine(engine)
+                _alias_map_loaded_from_db = True
+            except Exception as e:
+                _alias_map_failed_at = time.time()
+                print(f"加载污染物别名表失败，将只使用内置别名: {e}")
+    return _alias_map
+
+
+def ensure_alias_table(engine) -> List[str]:
+    """
+    创建别名表（已存在时不做任何修改）
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        list: 已执行的DDL语句
+    """
+    with engine.begin() as connection:
+        connection.execute(text(CREATE_ALIAS_TABLE_SQL))
+    return [f"CREATE TABLE IF NOT EXISTS {ALIAS_TABLE}"]
+
+
+def import_aliases(engine, records: Iterable[Dict], overwrite: bool = True, reload: bool = True) -> int:
+    """
+    批量导入别名，完成后重新加载进程内哈希表
+
+    Args:
+        engine: SQLAlchemy引擎
+        records (Iterable[Dict]): 别名记录，字段见ALIAS_FIELDS
+        overwrite (bool): 是否覆盖已存在的别名，为False时跳过
+        reload (bool): 是否从该引擎重新加载进程内哈希表（写入其他数据库时传False）
+
+    Returns:
+        int: 写入的记录数
+    """
+    normalized = {}
+    for record in records:
+        record = _normalize_record(record)
+        if record is not None:
+            normalized[record["alias"]] = record
+    if not normalized:
+        return 0
+
+    now = datetime.now()
+    with engine.begin() as connection:
+        existing_result = connection.execute(
+            text(f"SELECT alias FROM {ALIAS_TABLE} WHERE alias IN :aliases")
+            .bindparams(bindparam("aliases", expanding=True)),
+            {"aliases": list(normalized)}
+        )
+        existing = [row[0] for row in existing_result]
+        if overwrite and existing:
+            connection.execute(
+                text(f"DELETE FROM {ALIAS_TABLE} WHERE alias IN :aliases")
+                .bindparams(bindparam("aliases", expanding=True)),
+                {"aliases": existing}
+            )
+        elif existing:
+            for alias in existing:
+                normalized.pop(alias)
+
+        if normalized:
+            connection.execute(text(f"""
+                INSERT INTO {ALIAS_TABLE} ({', '.join(ALIAS_FIELDS)}, updated_at)
+                VALUES ({', '.join(':' + field for field in ALIAS_FIELDS)}, :updated_at)
+            """), [dict(record, updated_at=now) for record in normalized.values()])
+
+    if reload:
+        _reload_after_import(engine)
+    return len(normalized)
+
+
+def _reload_after_import(engine):
+    """
+    导入后重新加载进程内哈希表
+    """
+    global _alias_map_loaded_from_db
+    try:
+        _alias_map.load_from_engine(engine)
+        _alias_map_loaded_from_db = True
+    except Exception as e:
+        print(f"重新加载污染物别名表失败: {e}")
+
+
+def import_aliases_csv(engine, path: str, overwrite: bool = True) -> int:
+    """
+    从CSV文件批量导入别名
+
+    Args:
+        engine: SQLAlchemy引擎
+        path (str): CSV文件路径（UTF-8编码，需包含alias和canonical_name列）
+        overwrite (bool): 是否覆盖已存在的别名
+
+    Returns:
+        int: 写入的记录数
+    """
+    with open(path, newline="", encoding="utf-8-sig") as csv_file:
+        reader = csv.DictReader(csv_file)
+        missing = {"alias", "canonical_name"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV缺少必需列: {', '.join(sorted(missing))}")
+        return import_aliases(engine, list(reader), overwrite)
+
+
+def seed_default_aliases(engine, reload: bool = True) -> int:
+    """
+    写入内置别名（不覆盖已存在的别名）
+
+    Args:
+        engine: SQLAlchemy引擎
+        reload (bool): 是否重新加载进程内哈希表
+
+    Returns:
+        int: 写入的记录数
+    """
+    return import_aliases(engine, DEFAULT_ALIASES, overwrite=False, reload=reload)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    """
+    from tools.db_engine_registry import get_engine
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("seed", "import", "lookup"):
+        print(__doc__)
+        return 1
+
+    command, arguments = argv[0], argv[1:]
+    if command == "lookup":
+        alias_map = ensure_pollutant_alias_map(get_engine())
+        for name in arguments:
+            print(f"{name} -> {alias_map.get(name)}")
+        return 0
+
+    try:
+        engine = get_engine()
+        ensure_alias_table(engine)
+        if command == "seed":
+            count = seed_default_aliases(engine)
+        else:
+            if len(arguments) != 1:
+                print("用法: python -m tools.pollutant_aliases import aliases.csv")
+                return 1
+            count = import_aliases_csv(engine, arguments[0])
+    except Exception as e:
+        print(f"导入污染物别名失败: {e}")
+        return 1
+
+    print(f"✓ 已写入 {count} 条别名")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,19 +5,49 @@
 """
 
 from crewai.tools import BaseTool
-from config.config import Config
-from sqlalchemy import create_engine, text
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
+import threading
+import time
 import requests
 import json
 from pydantic import BaseModel, Field
-from tools.pollutant_name_utils import standardize_pollutant_name
+from tools.db_engine_registry import get_engine
+from tools.pollutant_name_utils import (
+    resolve_pollutant_name, suggest_pollutant_names, suggest_pollutant_names_batch
+)
+from tools.pollutant_queries import fetch_pollutant_rows, fetch_pollutant_rows_batch
+from tools.result_encoding import encode_grouped_rows, encode_rows
+from config.config import Config
 
 
 class PollutantDataQueryInput(BaseModel):
     """污染物数据查询输入参数"""
-    pollutant_name: str = Field(..., description="污染物名称")
+    pollutant_name: Optional[str] = Field(None, description="污染物名称")
+    pollutant_names: Optional[List[str]] = Field(None, description="批量查询的污染物名称列表（与pollutant_name至少提供一个）")
     data_type: str = Field("both", description="数据类型 (gene, organism, both)")
+    profile: Optional[str] = Field(None, description="输出列配置 (minimal, evidence, full)，默认evidence")
+    output_format: str = Field("columnar", description="输出格式 (columnar: 表头+值数组, records: 字典列表)")
+
+
+# 基因和微生物查询共享的线程池（进程内复用，连接来自共享连接池）
+_query_executor: Optional[ThreadPoolExecutor] = None
+_query_executor_lock = threading.Lock()
+
+
+def _get_query_executor() -> ThreadPoolExecutor:
+    """
+    获取共享的查询线程池
+    """
+    global _query_executor
+    if _query_executor is None:
+        with _query_executor_lock:
+            if _query_executor is None:
+                _query_executor = ThreadPoolExecutor(
+                    max_workers=Config.DB_QUERY_WORKERS,
+                    thread_name_prefix="pollutant-query"
+                )
+    return _query_executor
 
 
 class PollutantDataQueryTool(BaseTool):
@@ -37,37 +67,32 @@ class PollutantDataQueryTool(BaseTool):
     
     def _get_database_connection(self):
         """
-        创建数据库连接
+        获取共享的数据库引擎（进程内按DSN复用连接池）
         """
-        db_type = Config.DB_TYPE
-        db_host = Config.DB_HOST
-        db_port = Config.DB_PORT
-        db_name = Config.DB_NAME
-        db_user = Config.DB_USER
-        db_password = Config.DB_PASSWORD
-        
-        if db_type == 'postgresql':
-            database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        elif db_type == 'mysql':
-            database_url = f"mysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        else:
-            raise ValueError(f"不支持的数据库类型: {db_type}")
-        
-        engine = create_engine(database_url)
-        return engine
+        return get_engine()
     
-    def _run(self, pollutant_name: str, data_type: str = "both") -> Dict[Any, Any]:
+    def _run(self, pollutant_name: Optional[str] = None, data_type: str = "both", profile: Optional[str] = None,
+             output_format: str = "columnar", pollutant_names: Optional[List[str]] = None) -> Dict[Any, Any]:
         """
         查询指定污染物的所有相关数据
         
         Args:
-            pollutant_name (str): 污染物名称
+            pollutant_name (str, optional): 污染物名称
             data_type (str): 数据类型 ("gene", "organism", "both")
+            profile (str, optional): 输出列配置 ("minimal", "evidence", "full")
+            output_format (str): 输出格式 ("columnar", "records")
+            pollutant_names (list, optional): 批量查询的污染物名称列表
             
         Returns:
             dict: 查询结果
         """
+        if pollutant_names:
+            return self._run_batch(pollutant_names, data_type, profile, output_format)
+        if not pollutant_name:
+            return {"status": "error", "message": "缺少必需参数: pollutant_name 或 pollutant_names"}
+        
         try:
+            started = time.perf_counter()
             results = {
                 "status": "success",
                 "pollutant_name": pollutant_name,
@@ -75,18 +100,61 @@ class PollutantDataQueryTool(BaseTool):
                 "organism_data": None
             }
             
-            # 查询基因数据
-            if data_type in ["gene", "both"]:
-                gene_data = self._query_gene_data_from_db(pollutant_name)
-                if gene_data:
-                    results["gene_data"] = gene_data
+            # 只标准化一次污染物名称，并通过别名表和名称索引精确解析为数据库中存储的规范名称
+            standardized_name = resolve_pollutant_name(pollutant_name)
+            results["resolved_name"] = standardized_name
+            # 名称不在数据库中时只给出相似名称作为建议，不替换查询的污染物
+            suggestions = suggest_pollutant_names(standardized_name)
+            if suggestions:
+                results["suggestions"] = suggestions
             
-            # 查询微生物数据
+            # 基因查询和微生物查询并发执行，各自使用连接池中的连接
+            queries = {}
+            if data_type in ["gene", "both"]:
+                queries["gene_data"] = self._query_gene_data_from_db
             if data_type in ["organism", "both"]:
-                organism_data = self._query_organism_data_from_db(pollutant_name)
-                if organism_data:
-                    results["organism_data"] = organism_data
+                queries["organism_data"] = self._query_organism_data_from_db
+            
+            if len(queries) > 1:
+                futures = {
+                    key: _get_query_executor().submit(self._timed_query, query, standardized_name)
+                    for key, query in queries.items()
+                }
+                outcomes = {key: future.result() for key, future in futures.items()}
+            else:
+                outcomes = {
+                    key: self._timed_query(query, standardized_name)
+                    for key, query in queries.items()
+                }
+            
+            gene_data, _ = outcomes.get("gene_data", (None, None))
+            organism_data, _ = outcomes.get("organism_data", (None, None))
+            
+            # 基因数据和微生物数据共享同一个输出字节预算
+            remaining_bytes = Config.TOOL_OUTPUT_MAX_BYTES
+            
+            # 编码基因数据
+            if gene_data:
+                results["gene_data"] = encode_rows(
+                    "genes_data", gene_data, profile, output_format, max_bytes=remaining_bytes
+                )
+                if remaining_bytes:
+                    remaining_bytes = max(remaining_bytes - results["gene_data"]["bytes"], 1)
             
+            # 编码微生物数据
+            if organism_data:
+                results["organism_data"] = encode_rows(
+                    "organism_data", organism_data, profile, output_format, max_bytes=remaining_bytes
+                )
+            
+            results["metadata"] = {
+                "standardized_name": standardized_name,
+                "concurrent": len(queries) > 1,
+                "timings_ms": {
+                    **{key: elapsed for key, (_, elapsed) in outcomes.items()},
+                    "total": round((time.perf_counter() - started) * 1000, 2)
+                }
+            }
             return results
             
         except Exception as e:
@@ -96,75 +164,144 @@ class PollutantDataQueryTool(BaseTool):
                 "pollutant_name": pollutant_name
             }
     
-    def _query_gene_data_from_db(self, pollutant_name: str) -> Optional[List[Dict]]:
+    def _run_batch(self, pollutant_names: List[str], data_type: str, profile: Optional[str],
+                   output_format: str) -> Dict[Any, Any]:
+        """
+        批量查询多个污染物的数据：每张表只执行一次查询，两张表并发查询
+        
+        Args:
+            pollutant_names (list): 污染物名称列表
+            data_type (str): 数据类型 ("gene", "organism", "both")
+            profile (str, optional): 输出列配置
+            output_format (str): 输出格式
+            
+        Returns:
+            dict: 按污染物分组的查询结果
+        """
+        try:
+            started = time.perf_counter()
+            resolved = {name: resolve_pollutant_name(name) for name in pollutant_names}
+            standardized_names = list(resolved.values())
+            
+            tables = {}
+            if data_type in ["gene", "both"]:
+                tables["gene_data"] = "genes_data"
+            if data_type in ["organism", "both"]:
+                tables["organism_data"] = "organism_data"
+            
+            def query_table(table: str) -> Dict[str, List[Dict]]:
+                return fetch_pollutant_rows_batch(
+                    self.db_engine, table, standardized_names, limit_per_pollutant=100
+                )
+            
+            futures = {
+                key: _get_query_executor().submit(self._timed_query, query_table, table)
+                for key, table in tables.items()
+            }
+            outcomes = {key: future.result() for key, future in futures.items()}
+            
+            # 所有污染物和数据表平分输出字节预算
+            table_budget = Config.TOOL_OUTPUT_MAX_BYTES // len(tables) if tables else 0
+            if Config.TOOL_OUTPUT_MAX_BYTES:
+                table_budget = max(table_budget, 1)
+            encoded = {
+                key: encode_grouped_rows(
+                    tables[key],
+                    {name: grouped.get(standardized, []) for name, standardized in resolved.items()},
+                    profile,
+                    output_format,
+                    max_bytes=table_budget
+                )
+                for key, (grouped, _) in outcomes.items()
+            }
+            
+            return {
+                "status": "success",
+                "resolved_names": resolved,
+                "suggestions": suggest_pollutant_names_batch(resolved),
+                "results": {
+                    name: {
+                        "standardized_name": standardized,
+                        "gene_data": encoded.get("gene_data", {}).get(name),
+                        "organism_data": encoded.get("organism_data", {}).get(name)
+                    }
+                    for name, standardized in resolved.items()
+                },
+                "metadata": {
+                    "count": len(resolved),
+                    "timings_ms": {
+                        **{key: elapsed for key, (_, elapsed) in outcomes.items()},
+                        "total": round((time.perf_counter() - started) * 1000, 2)
+                    }
+                }
+            }
+            
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": f"批量查询污染物数据时出错: {str(e)}",
+                "pollutant_names": pollutant_names
+            }
+    
+    @staticmethod
+    def _timed_query(query, argument):
+        """
+        执行子查询并记录耗时
+        
+        Args:
+            query (callable): 子查询函数
+            argument: 子查询参数（标准化后的污染物名称或数据表名）
+            
+        Returns:
+            tuple: (查询结果, 耗时毫秒)
+        """
+        started = time.perf_counter()
+        data = query(argument)
+        return data, round((time.perf_counter() - started) * 1000, 2)
+    
+    def _query_gene_data_from_db(self, standardized_name: str) -> Optional[List[Dict]]:
         """
         从数据库查询基因数据
         
         Args:
-            pollutant_name (str): 污染物名称
+            standardized_name (str): 标准化后的污染物名称
             
         Returns:
             list: 基因数据列表
         """
         try:
-            # 标准化污染物名称
-            standardized_name = standardize_pollutant_name(pollutant_name)
-            
-            with self.db_engine.connect() as connection:
-                # 查询基因数据
-                result = connection.execute(text("""
-                    SELECT *
-                    FROM genes_data
-                    WHERE pollutant_name = :pollutant_name
-                    LIMIT 100
-                """), {"pollutant_name": standardized_name})
-                
-                # 转换为字典列表
-                columns = result.keys()
-                rows = result.fetchall()
-                
-                gene_data = []
-                for row in rows:
-                    gene_data.append(dict(zip(columns, row)))
-                
-                return gene_data if gene_data else None
+            gene_data = fetch_pollutant_rows(
+                self.db_engine,
+                "genes_data",
+                standardized_name,
+                limit=100
+            )
+            
+            return gene_data if gene_data else None
                 
         except Exception as e:
             print(f"查询基因数据时出错: {e}")
             return None
     
-    def _query_organism_data_from_db(self, pollutant_name: str) -> Optional[List[Dict]]:
+    def _query_organism_data_from_db(self, standardized_name: str) -> Optional[List[Dict]]:
         """
         从数据库查询微生物数据
         
         Args:
-            pollutant_name (str): 污染物名称
+            standardized_name (str): 标准化后的污染物名称
             
         Returns:
             list: 微生物数据列表
         """
         try:
-            # 标准化污染物名称
-            standardized_name = standardize_pollutant_name(pollutant_name)
-            
-            with self.db_engine.connect() as connection:
-                # 查询微生物数据
-                result = connection.execute(text("""
-                    SELECT *
-                    FROM organism_data
-                    WHERE pollutant_name = :pollutant_name
-                    LIMIT 100
-                """), {"pollutant_name": standardized_name})
-                
-                # 转换为字典列表
-                columns = result.keys()
-                rows = result.fetchall()
-                
-                organism_data = []
-                for row in rows:
-                    organism_data.append(dict(zip(columns, row)))
-                
-                return organism_data if organism_data else None
+            organism_data = fetch_pollutant_rows(
+                self.db_engine,
+                "organism_data",
+                standardized_name,
+                limit=100
+            )
+            
+            return organism_data if organism_data else None
                 
         except Exception as e:
             print(f"查询微生物数据时出错: {e}")
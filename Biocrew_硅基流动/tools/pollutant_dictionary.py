@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+污染物中英文词典
+使用Aho-Corasick自动机对用户需求做一次线性扫描，按最长匹配提取污染物并给出标准英文名称，
+在LLM运行前注入任务描述，省去模型翻译污染物名称的推理步骤
+
+用法（在项目根目录执行）:
+    python -m tools.pollutant_dictionary "处理含多氯联苯和重金属镉的废水"
+"""
+
+import csv
+import sys
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tools.pollutant_name_utils import standardize_pollutant_name
+
+
+# 中文单字金属名只以这些不会与其他词组合的形式收录（"铜"会匹配"铜绿假单胞菌"等）
+_METALS = [
+    ("镉", "Cadmium"), ("铅", "Lead"), ("汞", "Mercury"), ("砷", "Arsenic"),
+    ("铬", "Chromium"), ("镍", "Nickel"), ("铜", "Copper"), ("锌", "Zinc"),
+]
+
+# 内置词条：(中文/英文术语, 标准英文名称)；英文术语不区分大小写，按整词匹配。
+# 中文术语按子串匹配，因此不收录单字术语（苯、萘、菲等会出现在大量其他化合物名称中），
+# 易被包含的短术语（氯苯、硝酸盐、氯乙烯）需要配合更长的词条（见BLOCKING_TERMS）
+BUILTIN_TERMS = [
+    # 重金属
+    *[(f"重金属{char}", name) for char, name in _METALS],
+    *[(f"{char}污染", name) for char, name in _METALS],
+    *[(f"{char}离子", name) for char, name in _METALS],
+    ("cadmium", "Cadmium"), ("mercury", "Mercury"), ("arsenic", "Arsenic"),
+    ("六价铬", "Hexavalent chromium"),
+    # 苯系物及酚类
+    ("苯系化合物", "Benzene compounds"), ("苯系物", "Benzene compounds"), ("btex", "Benzene compounds"),
+    ("benzene", "Benzene"), ("甲苯", "Toluene"), ("toluene", "Toluene"),
+    ("二甲苯", "Xylene"), ("乙苯", "Ethylbenzene"), ("苯酚", "Phenol"), ("phenol", "Phenol"),
+    ("五氯酚", "Pentachlorophenol"), ("五氯苯酚", "Pentachlorophenol"),
+    ("2,4-二氯苯酚", "2,4-Dichlorophenol"), ("二氯苯酚", "Dichlorophenol"), ("氯苯酚", "Chlorophenol"),
+    ("硝基苯", "Nitrobenzene"), ("苯胺", "Aniline"), ("苯乙烯", "Styrene"),
+    ("氯苯", "Chlorobenzene"), ("二氯苯", "Dichlorobenzene"), ("三氯苯", "Trichlorobenzene"),
+    ("六氯苯", "Hexachlorobenzene"), ("氯苯胺", "Chloroaniline"), ("对氯苯胺", "4-Chloroaniline"),
+    # 多氯联苯、多环芳烃
+    ("多氯联苯", "Polychlorinated biphenyls"), ("pcbs", "Polychlorinated biphenyls"),
+    ("pcb", "Polychlorinated biphenyls"), ("polychlorinated biphenyls", "Polychlorinated biphenyls"),
+    ("多环芳烃", "Polycyclic aromatic hydrocarbons"), ("pahs", "Polycyclic aromatic hydrocarbons"),
+    ("pah", "Polycyclic aromatic hydrocarbons"),
+    ("polycyclic aromatic hydrocarbons", "Polycyclic aromatic hydrocarbons"),
+    ("naphthalene", "Naphthalene"), ("phenanthrene", "Phenanthrene"), ("pyrene", "Pyrene"),
+    ("苯并芘", "Benzo[a]pyrene"), ("苯并[a]芘", "Benzo[a]pyrene"), ("anthracene", "Anthracene"),
+    # 农药
+    ("有机氯农药", "Organochlorine pesticides"), ("有机磷农药", "Organophosphorus pesticides"),
+    ("六六六", "Hexachlorocyclohexane"), ("hch", "Hexachlorocyclohexane"),
+    ("林丹", "Lindane"), ("lindane", "Lindane"),
+    ("滴滴涕", "DDT"), ("ddt", "DDT"),
+    ("异狄氏剂", "Endrin"), ("endrin", "Endrin"), ("狄氏剂", "Dieldrin"), ("艾氏剂", "Aldrin"),
+    ("阿特拉津", "Atrazine"), ("莠去津", "Atrazine"), ("atrazine", "Atrazine"),
+    ("毒死蜱", "Chlorpyrifos"), ("chlorpyrifos", "Chlorpyrifos"),
+    # 氯代溶剂
+    ("三氯乙烯", "Trichloroethylene"), ("tce", "Trichloroethylene"),
+    ("四氯乙烯", "Tetrachloroethylene"), ("pce", "Tetrachloroethylene"),
+    ("二氯乙烯", "Dichloroethylene"), ("氯乙烯", "Vinyl chloride"),
+    # 增塑剂、内分泌干扰物
+    ("邻苯二甲酸酯", "Phthalates"),
+    ("邻苯二甲酸二(2-乙基己基)酯", "Di(2-ethylhexyl) phthalate"), ("dehp", "Di(2-ethylhexyl) phthalate"),
+    ("邻苯二甲酸二丁酯", "Dibutyl phthalate"), ("dbp", "Dibutyl phthalate"),
+    ("双酚a", "Bisphenol A"), ("bpa", "Bisphenol A"),
+    # 全氟化合物
+    ("全氟辛酸", "Perfluorooctanoic acid"), ("pfoa", "Perfluorooctanoic acid"),
+    ("全氟辛烷磺酸", "Perfluorooctanesulfonic acid"), ("pfos", "Perfluorooctanesulfonic acid"),
+    # 抗生素
+    ("四环素", "Tetracycline"), ("磺胺甲恶唑", "Sulfamethoxazole"),
+    # 其他
+    ("塑料垃圾微粒", "Microplastics"), ("微塑料", "Microplastics"), ("microplastics", "Microplastics"),
+    ("石油烃", "Petroleum hydrocarbons"), ("氨氮", "Ammonia nitrogen"), ("硝酸盐", "Nitrate"),
+    ("亚硝酸盐", "Nitrite"),
+]
+
+# 阻断词条：包含污染物术语但本身不是目标污染物的名称（微生物、降解中间体、聚合物等）。
+# 它们按最左最长匹配胜出，匹配后不产生任何污染物，避免"聚氯乙烯"被识别为氯乙烯
+BLOCKING_TERMS = [
+    "铜绿假单胞菌", "铜绿微囊藻", "苯甲酸", "苯甲酸钠", "苯乙酸", "苯丙氨酸",
+    "聚氯乙烯", "聚苯乙烯", "氯苯甲酸", "硝酸盐还原菌", "亚硝酸盐还原酶", "硝酸盐还原酶",
+]
+
+
+def _is_word_char(char: str) -> bool:
+    """
+    判断字符是否为英文单词字符（中文术语不需要整词边界）
+    """
+    return char.isascii() and char.isalnum()
+
+
+class PollutantDictionary:
+    """
+    基于Aho-Corasick自动机的污染物术语词典（最左最长匹配，不区分大小写）
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, str]] = (), blocking_terms: Iterable[str] = ()):
+        """
+        初始化词典
+
+        Args:
+            terms (Iterable[Tuple[str, str]]): (术语, 标准英文名称)，标准英文名称为空的词条作为阻断词条
+            blocking_terms (Iterable[str]): 阻断词条，参与最长匹配但不产生污染物
+        """
+        # 每个节点：子节点表、失败指针、在该节点结束的术语长度（含失败链上的后缀术语）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._names: Dict[str, str] = {}
+        for term, english_name in terms:
+            self.add(term, english_name)
+        for term in blocking_terms:
+            self.add(term, None)
+        self._build_failure_links()
+
+    def add(self, term: str, english_name: Optional[str]):
+        """
+        向字典树中添加术语（添加完成后需调用_build_failure_links），english_name为空时作为阻断词条
+        """
+        term = term.strip().lower()
+        if not term:
+            return
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        if term not in self._names:
+            self._outputs[node].append(len(term))
+        self._names[term] = (english_name or "").strip()
+
+    def _build_failure_links(self):
+        """
+        广度优先构建失败指针，并合并后缀节点的输出
+        """
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def scan(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        扫描文本，返回最左最长且互不重叠的术语匹配
+
+        Args:
+            text (str): 待扫描文本
+
+        Returns:
+            list: (起始位置, 结束位置, 术语) 列表，按出现顺序排列
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # 个别字符转小写后长度会变化，逐字符处理以保持位置对应
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        candidates = []
+        node = 0
+        for position, char in enumerate(lowered):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length in self._outputs[node]:
+                start, end = position - length + 1, position + 1
+                # 英文术语要求整词匹配，避免 tce 匹配 practice
+                if _is_word_char(lowered[start]) and start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if _is_word_char(lowered[end - 1]) and end < len(lowered) and _is_word_char(lowered[end]):
+                    continue
+                candidates.append((start, end))
+
+        matches = []
+        last_end = 0
+        for start, end in sorted(candidates, key=lambda match: (match[0], -match[1])):
+            if start >= last_end:
+                matches.append((start, end, lowered[start:end]))
+                last_end = end
+        return matches
+
+    def extract(self, text: str) -> List[Dict[str, str]]:
+        """
+        提取文本中的污染物，按标准英文名称去重
+
+        Args:
+            text (str): 用户需求原文（中文或英文）
+
+        Returns:
+            list: 包含 term（原文表达）、english_name（标准英文名称）、standardized_name（数据库标准化名称）
+        """
+        results = []
+        seen = set()
+        for start, end, term in self.scan(text or ""):
+            english_name = self._names[term]
+            if not english_name or english_name in seen:
+                # 阻断词条（如"铜绿假单胞菌"）覆盖的文本不产生污染物
+                continue
+            seen.add(english_name)
+            results.append({
+                "term": text[start:end],
+                "english_name": english_name,
+                "standardized_name": standardize_pollutant_name(english_name)
+            })
+        return results
+
+
+def load_dictionary_terms(path: str) -> List[Tuple[str, str]]:
+    """
+    从CSV文件读取扩展词条（表头 term,english_name，UTF-8编码；english_name为空的行作为阻断词条）
+
+    Args:
+        path (str): CSV文件路径
+
+    Returns:
+        list: (术语, 标准英文名称) 列表
+    """
+    with open(path, newline="", encoding="utf-8-sig") as csv_file:
+        return [
+            (row.get("term") or "", row.get("english_name") or "")
+            for row in csv.DictReader(csv_file)
+        ]
+
+
+_dictionary: Optional[PollutantDictionary] = None
+_dictionary_lock = threading.Lock()
+
+
+def get_pollutant_dictionary() -> PollutantDictionary:
+    """
+    获取进程内共享的污染物词典（首次调用时构建，包含内置词条和Config.POLLUTANT_DICTIONARY_PATH中的扩展词条）
+
+    Returns:
+        PollutantDictionary: 污染物词典
+    """
+    global _dictionary
+    if _dictionary is None:
+        with _dictionary_lock:
+            if _dictionary is None:
+                from config.config import Config
+
+                terms = list(BUILTIN_TERMS)
+                path = Config.POLLUTANT_DICTIONARY_PATH
+                if path:
+                    try:
+                        terms.extend(load_dictionary_terms(path))
+                    except Exception as e:
+                        print(f"加载污染物扩展词典失败，只使用内置词条: {e}")
+                _dictionary = PollutantDictionary(terms, BLOCKING_TERMS)
+    return _dictionary
+
+
+def extract_pollutants(text: str) -> List[Dict[str, str]]:
+    """
+    从用户需求中提取污染物及其标准英文名称
+
+    Args:
+        text (str): 用户需求原文
+
+    Returns:
+        list: 提取结果，见PollutantDictionary.extract
+    """
+    return get_pollutant_dictionary().extract(text)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(__doc__)
+        return 1
+    for match in extract_pollutants(" ".join(argv)):
+        print(f"{match['term']} -> {match['english_name']} ({match['standardized_name']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
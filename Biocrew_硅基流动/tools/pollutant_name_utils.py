@@ -5,18 +5,80 @@
 """
 
 import re
-from typing import List, Dict
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 
+# 希腊字母 -> 英文名称（单次str.translate完成全部替换）
+GREEK_LETTER_NAMES = {
+    'α': 'alpha',
+    'β': 'beta',
+    'γ': 'gamma',
+    'δ': 'delta',
+    'ε': 'epsilon',
+    'ζ': 'zeta',
+    'η': 'eta',
+    'θ': 'theta',
+    'ι': 'iota',
+    'κ': 'kappa',
+    'λ': 'lambda',
+    'μ': 'mu',
+    'ν': 'nu',
+    'ξ': 'xi',
+    'ο': 'omicron',
+    'π': 'pi',
+    'ρ': 'rho',
+    'σ': 'sigma',
+    'τ': 'tau',
+    'υ': 'upsilon',
+    'φ': 'phi',
+    'χ': 'chi',
+    'ψ': 'psi',
+    'ω': 'omega'
+}
+_GREEK_TRANSLATION = str.maketrans(GREEK_LETTER_NAMES)
+
+# 常见的缩写（只有当缩写是独立的词时才替换）
+ABBREVIATIONS = {
+    'hch': 'hexachlorocyclohexane',
+    'pcb': 'polychlorinated_biphenyl',
+    'pah': 'polycyclic_aromatic_hydrocarbon'
+}
+_ABBREVIATION_PATTERN = re.compile(r'\b(?:' + '|'.join(map(re.escape, ABBREVIATIONS)) + r')\b')
+
+# 连字符、空白、特殊字符及下划线的连续片段统一替换为单个下划线
+_SEPARATOR_PATTERN = re.compile(r'[\W_]+')
+
+# 标准化结果缓存的最大条目数
+STANDARDIZE_CACHE_SIZE = 65536
+
+
+def _standardize(pollutant_name: str) -> str:
+    """
+    标准化的实际实现（不带缓存）
+    """
+    if not pollutant_name:
+        return ""
+    name = pollutant_name.lower().translate(_GREEK_TRANSLATION)
+    name = _ABBREVIATION_PATTERN.sub(lambda match: ABBREVIATIONS[match.group(0)], name)
+    return _SEPARATOR_PATTERN.sub('_', name).strip('_')
+
+
+@lru_cache(maxsize=STANDARDIZE_CACHE_SIZE)
 def standardize_pollutant_name(pollutant_name: str) -> str:
     """
     将污染物名称标准化为数据库中存储的格式
     
     转换规则:
     1. 转换为小写
-    2. 将连字符(-)替换为下划线(_)
-    3. 将空格替换为下划线(_)
-    4. 移除特殊字符
-    5. 处理希腊字母(如β -> beta)
+    2. 处理希腊字母(如β -> beta)
+    3. 展开独立的缩写(hch、pcb、pah)
+    4. 将连字符、空格和特殊字符替换为下划线，合并连续下划线并去掉首尾下划线
+    
+    结果按输入缓存（LRU），重复的名称只计算一次
     
     Args:
         pollutant_name (str): 原始污染物名称
@@ -24,117 +86,468 @@ def standardize_pollutant_name(pollutant_name: str) -> str:
     Returns:
         str: 标准化后的污染物名称
     """
-    if not pollutant_name:
-        return ""
+    return _standardize(pollutant_name)
+
+
+def standardize_many(pollutant_names: Iterable[str]) -> List[str]:
+    """
+    批量标准化污染物名称，批内重复的名称只计算一次（不占用全局缓存）
+    
+    Args:
+        pollutant_names (Iterable[str]): 原始污染物名称
+        
+    Returns:
+        List[str]: 标准化后的名称，顺序与输入一致
+    """
+    seen: Dict[str, str] = {}
+    results = []
+    for name in pollutant_names:
+        standardized = seen.get(name)
+        if standardized is None:
+            standardized = seen[name] = _standardize(name)
+        results.append(standardized)
+    return results
+
+def like_pattern_regex(fragment: str) -> "re.Pattern":
+    """
+    将 LIKE '%fragment%' 转换为等价的正则（不区分大小写，下划线匹配任意单个字符）
+    
+    Args:
+        fragment (str): LIKE模式中%之间的片段
+        
+    Returns:
+        re.Pattern: 编译后的正则，对小写文本调用search
+    """
+    return re.compile("".join("[^\n]" if char == "_" else re.escape(char) for char in fragment.lower()))
+
+
+def generate_pollutant_name_variants(pollutant_name: str, prune: bool = True) -> List[str]:
+    """
+    生成污染物名称的多种可能变体，用于搜索和匹配，按命中可能性从高到低排序
     
-    # 转换为小写
-    name = pollutant_name.lower()
-    
-    # 处理希腊字母
-    greek_map = {
-        'α': 'alpha',
-        'β': 'beta',
-        'γ': 'gamma',
-        'δ': 'delta',
-        'ε': 'epsilon',
-        'ζ': 'zeta',
-        'η': 'eta',
-        'θ': 'theta',
-        'ι': 'iota',
-        'κ': 'kappa',
-        'λ': 'lambda',
-        'μ': 'mu',
-        'ν': 'nu',
-        'ξ': 'xi',
-        'ο': 'omicron',
-        'π': 'pi',
-        'ρ': 'rho',
-        'σ': 'sigma',
-        'τ': 'tau',
-        'υ': 'upsilon',
-        'φ': 'phi',
-        'χ': 'chi',
-        'ψ': 'psi',
-        'ω': 'omega'
-    }
-    
-    for greek_char, english_name in greek_map.items():
-        name = name.replace(greek_char, english_name)
-    
-    # 处理常见的缩写
-    abbreviations = {
-        'hch': 'hexachlorocyclohexane',
-        'pcb': 'polychlorinated_biphenyl',
-        'pah': 'polycyclic_aromatic_hydrocarbon'
-    }
-    
-    for abbrev, full_name in abbreviations.items():
-        # 只有当缩写是独立的词时才替换
-        name = re.sub(r'\b' + re.escape(abbrev) + r'\b', full_name, name)
-    
-    # 将连字符和空格替换为下划线
-    name = re.sub(r'[-\s]+', '_', name)
-    
-    # 移除特殊字符，只保留字母、数字和下划线
-    name = re.sub(r'[^\w]', '_', name)
-    
-    # 合并多个下划线为单个下划线
-    name = re.sub(r'_+', '_', name)
-    
-    # 移除开头和结尾的下划线
-    name = name.strip('_')
-    
-    return name
-
-def generate_pollutant_name_variants(pollutant_name: str) -> List[str]:
-    """
-    生成污染物名称的多种可能变体，用于搜索和匹配
+    数据库中存储的是标准化名称，因此排序为：别名表中的规范名称、名称索引中存在的名称、
+    标准化名称、下划线形式、小写形式、连字符形式、无分隔符形式、希腊字母形式。
+    变体用于不区分大小写的 LIKE '%变体%' 查询，因此：
+    1. 忽略大小写去重
+    2. 被排序更靠前的变体作为LIKE模式覆盖的变体被剪除（如 beta_hch 覆盖 beta-hch）
+    3. 名称索引已加载时，剪除不可能匹配任何已知名称的变体（至少保留排序第一的变体，以防索引尚未刷新）
     
     Args:
         pollutant_name (str): 原始污染物名称
+        prune (bool): 是否剪除不可能命中或被覆盖的变体，为False时只去重和排序
         
     Returns:
-        List[str]: 可能的名称变体列表
+        List[str]: 按可能性排序的名称变体列表
     """
-    variants = set()
+    if not pollutant_name:
+        return []
+    from tools.pollutant_aliases import get_pollutant_alias_map
+    
     original = pollutant_name
+    lowered = original.lower()
+    standardized = standardize_pollutant_name(original)
     
-    # 原始名称
-    variants.add(original)
+    greek_version = lowered
+    for english, greek in (('beta', 'β'), ('alpha', 'α'), ('gamma', 'γ'), ('delta', 'δ')):
+        greek_version = greek_version.replace(english, greek)
     
-    # 标准化名称
-    standardized = standardize_pollutant_name(original)
-    variants.add(standardized)
+    candidates = [
+        get_pollutant_alias_map().canonical_name(standardized),
+        standardized,
+        original.replace('-', '_').replace(' ', '_'),
+        lowered,
+        original,
+        original.replace('_', '-').replace(' ', '-'),
+        re.sub(r'[-_\s]+', '', original),
+        greek_version,
+    ]
     
-    # 小写版本
-    variants.add(original.lower())
+    # 名称索引中确实存在的名称排在最前
+    index_loaded = _name_index.loaded
+    if index_loaded:
+        candidates.sort(key=lambda variant: 0 if variant and variant in _name_index else 1)
     
-    # 处理连字符和下划线的变体
-    with_underscores = original.replace('-', '_').replace(' ', '_')
-    variants.add(with_underscores)
+    # 忽略大小写去重
+    variants, seen = [], set()
+    for variant in candidates:
+        if variant and variant.lower() not in seen:
+            seen.add(variant.lower())
+            variants.append(variant)
+    if not prune:
+        return variants
     
-    with_hyphens = original.replace('_', '-').replace(' ', '-')
-    variants.add(with_hyphens)
+    # 剪除被更靠前的变体覆盖的变体
+    kept: List[str] = []
+    for variant in variants:
+        if not any(like_pattern_regex(existing).search(variant.lower()) for existing in kept):
+            kept.append(variant)
     
-    # 无分隔符版本
-    no_separators = re.sub(r'[-_\s]+', '', original)
-    variants.add(no_separators)
+    # 剪除名称索引中没有任何名称能匹配的变体
+    if index_loaded:
+        kept = [kept[0]] + [variant for variant in kept[1:] if _name_index.may_match(variant)]
+    return kept
+
+def _name_trigrams(name: str) -> set:
+    """
+    生成名称的三元组集合（与pg_trgm一致，首尾补空格）
     
-    # 处理希腊字母的变体
-    greek_variants = {
-        'beta': 'β',
-        'alpha': 'α',
-        'gamma': 'γ',
-        'delta': 'δ'
-    }
+    Args:
+        name (str): 标准化后的名称
+        
+    Returns:
+        set: 三元组集合
+    """
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PollutantNameIndex:
+    """
+    污染物名称内存索引
     
-    greek_version = original.lower()
-    for english, greek in greek_variants.items():
-        greek_version = greek_version.replace(english, greek)
-    variants.add(greek_version)
+    保存数据库中所有不同的pollutant_name，建立前缀索引（有序数组+二分查找）和
+    三元组倒排索引，搜索/自动补全/名称解析都不需要访问数据库
+    """
+    
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        初始化污染物名称索引
+        
+        Args:
+            names (Iterable[str]): 初始名称集合
+        """
+        self._lock = threading.RLock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.loaded_at: Optional[float] = None
+        self._build(names)
+    
+    def _build(self, names: Iterable[str]):
+        """
+        根据名称集合重建索引，构建完成后原子替换
+        
+        Args:
+            names (Iterable[str]): 名称集合
+        """
+        unique_names = sorted({name for name in names if name})
+        # 标准化键 -> 数据库中的原始名称
+        canonical = {}
+        for name, key in zip(unique_names, standardize_many(unique_names)):
+            canonical.setdefault(key, name)
+        keys = sorted(canonical)
+        
+        trigram_sets = [_name_trigrams(key) for key in keys]
+        postings: Dict[str, List[int]] = {}
+        for key_id, trigrams in enumerate(trigram_sets):
+            for trigram in trigrams:
+                postings.setdefault(trigram, []).append(key_id)
+        
+        # 全部原始名称（小写、换行分隔），用于检查LIKE模式能否匹配任一名称
+        names_text = "\n".join(name.lower() for name in unique_names)
+        
+        with self._lock:
+            self._keys = keys
+            self._canonical = canonical
+            self._names_text = names_text
+            self._trigram_sizes = [len(trigrams) for trigrams in trigram_sets]
+            self._postings = postings
+    
+    def load(self, names: Iterable[str]):
+        """
+        加载名称集合并记录加载时间
+        
+        Args:
+            names (Iterable[str]): 名称集合
+        """
+        self._build(names)
+        self.loaded_at = time.time()
+    
+    def load_from_engine(self, engine):
+        """
+        从数据库加载genes_data和organism_data中所有不同的污染物名称
+        
+        Args:
+            engine: SQLAlchemy引擎
+        """
+        from sqlalchemy import text
+        
+        with engine.connect() as connection:
+            result = connection.execute(text("""
+                SELECT DISTINCT pollutant_name FROM genes_data
+                UNION
+                SELECT DISTINCT pollutant_name FROM organism_data
+            """))
+            names = [row[0] for row in result.fetchall()]
+        self.load(names)
+    
+    @property
+    def loaded(self) -> bool:
+        """索引是否已加载"""
+        return self.loaded_at is not None
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __contains__(self, pollutant_name: str) -> bool:
+        return standardize_pollutant_name(pollutant_name) in self._canonical
     
-    # 返回变体列表
-    return list(variants)
+    def may_match(self, fragment: str) -> bool:
+        """
+        判断 LIKE '%fragment%'（不区分大小写）能否匹配索引中的任一原始名称
+        
+        Args:
+            fragment (str): LIKE模式片段
+            
+        Returns:
+            bool: 是否可能匹配
+        """
+        return like_pattern_regex(fragment).search(self._names_text) is not None
+    
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        按前缀补全污染物名称
+        
+        Args:
+            prefix (str): 名称前缀
+            limit (int): 最多返回数量
+            
+        Returns:
+            List[str]: 数据库中存储的污染物名称
+        """
+        key_prefix = standardize_pollutant_name(prefix)
+        with self._lock:
+            keys, canonical = self._keys, self._canonical
+        
+        matches = []
+        position = bisect_left(keys, key_prefix)
+        while position < len(keys) and len(matches) < limit:
+            key = keys[position]
+            if not key.startswith(key_prefix):
+                break
+            matches.append(canonical[key])
+            position += 1
+        return matches
+    
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """
+        按三元组相似度搜索污染物名称，包含查询串的名称也会返回
+        
+        Args:
+            query (str): 搜索关键词
+            limit (int): 最多返回数量
+            min_score (float): 最低相似度
+            
+        Returns:
+            List[Tuple[str, float]]: (数据库中存储的名称, 相似度) 列表，按相似度降序
+        """
+        key_query = standardize_pollutant_name(query)
+        if not key_query:
+            return []
+        with self._lock:
+            keys, canonical = self._keys, self._canonical
+            sizes, postings = self._trigram_sizes, self._postings
+        
+        query_trigrams = _name_trigrams(key_query)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(postings.get(trigram, ()))
+        
+        scored = []
+        for key_id, overlap in shared.items():
+            key = keys[key_id]
+            score = overlap / (len(query_trigrams) + sizes[key_id] - overlap)
+            if score >= min_score or key_query in key:
+                scored.append((key == key_query, score, key))
+        
+        scored.sort(key=lambda item: (not item[0], -item[1], item[2]))
+        return [(canonical[key], round(score, 4)) for _, score, key in scored[:limit]]
+    
+    def resolve(self, pollutant_name: str) -> Optional[str]:
+        """
+        将用户输入解析为数据库中存储的规范名称（只做精确匹配）
+        
+        相似名称往往是不同的化合物（如2,4,5-与2,4,6-三氯苯酚、三氯乙烷与三氯乙烯），
+        模糊匹配结果只能作为建议（见suggest），不能直接替换查询的污染物
+        
+        Args:
+            pollutant_name (str): 用户输入的污染物名称
+            
+        Returns:
+            str: 规范名称，标准化后不在索引中时返回None
+        """
+        return self._canonical.get(standardize_pollutant_name(pollutant_name))
+    
+    def suggest(self, pollutant_name: str, limit: int = 5, min_score: float = 0.4) -> List[str]:
+        """
+        为无法精确解析的名称给出相似的候选名称
+        
+        Args:
+            pollutant_name (str): 用户输入的污染物名称
+            limit (int): 最多返回数量
+            min_score (float): 最低相似度
+            
+        Returns:
+            List[str]: 数据库中存储的候选名称，名称可以精确解析时返回空列表
+        """
+        if self.resolve(pollutant_name) is not None:
+            return []
+        return [name for name, _ in self.search(pollutant_name, limit=limit, min_score=min_score)]
+    
+    def start_background_refresh(self, loader: Callable[["PollutantNameIndex"], None],
+                                 interval: float) -> threading.Thread:
+        """
+        启动后台线程定期刷新索引
+        
+        Args:
+            loader (callable): 刷新函数，接收索引实例作为参数
+            interval (float): 刷新间隔（秒）
+            
+        Returns:
+            threading.Thread: 后台刷新线程
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return self._refresh_thread
+        
+        def refresh_loop():
+            while not self._stop_event.wait(interval):
+                try:
+                    loader(self)
+                except Exception as e:
+                    print(f"刷新污染物名称索引失败: {e}")
+        
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=refresh_loop, name="pollutant-name-index-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+        return self._refresh_thread
+    
+    def stop_background_refresh(self):
+        """
+        停止后台刷新线程
+        """
+        self._stop_event.set()
+
+
+_name_index = PollutantNameIndex()
+_name_index_lock = threading.Lock()
+_name_index_failed_at: Optional[float] = None
+
+
+def get_pollutant_name_index() -> PollutantNameIndex:
+    """
+    获取进程内共享的污染物名称索引
+    
+    Returns:
+        PollutantNameIndex: 名称索引（可能尚未加载）
+    """
+    return _name_index
+
+
+def ensure_pollutant_name_index(engine, wait: bool = True) -> PollutantNameIndex:
+    """
+    首次调用时从数据库加载名称索引并启动后台刷新，之后直接返回
+    
+    Args:
+        engine: SQLAlchemy引擎
+        wait (bool): 是否等待加载完成；为False时在后台线程中加载并立即返回（索引加载前查询工具直接使用标准化名称）
+        
+    Returns:
+        PollutantNameIndex: 名称索引
+    """
+    global _name_index_failed_at
+    from config.config import Config
+    
+    if not Config.NAME_INDEX_ENABLED or _name_index.loaded:
+        return _name_index
+    if not wait:
+        threading.Thread(
+            target=ensure_pollutant_name_index, args=(engine,), name="pollutant-name-index-load", daemon=True
+        ).start()
+        return _name_index
+    
+    with _name_index_lock:
+        # 加载失败后在一个刷新周期内不再重试，避免每次创建工具都等待数据库超时
+        recently_failed = (
+            _name_index_failed_at is not None
+            and time.time() - _name_index_failed_at < Config.NAME_INDEX_REFRESH_INTERVAL
+        )
+        if not _name_index.loaded and not recently_failed:
+            try:
+                _name_index.load_from_engine(engine)
+                _name_index.start_background_refresh(
+                    lambda index: index.load_from_engine(engine),
+                    Config.NAME_INDEX_REFRESH_INTERVAL
+                )
+            except Exception as e:
+                _name_index_failed_at = time.time()
+                print(f"加载污染物名称索引失败，将直接查询数据库: {e}")
+    return _name_index
+
+
+def resolve_pollutant_name(pollutant_name: str) -> str:
+    """
+    将用户输入解析为查询使用的污染物名称：
+    输入本身是数据库中存储的名称时直接使用；否则查找别名哈希表，
+    规范名称在名称索引中（或索引尚未加载）时使用规范名称，
+    都不满足时返回标准化名称（不做模糊替换，相似名称见suggest_pollutant_names）
+    
+    Args:
+        pollutant_name (str): 用户输入的污染物名称
+        
+    Returns:
+        str: 查询使用的污染物名称
+    """
+    from config.config import Config
+    from tools.pollutant_aliases import get_pollutant_alias_map
+    
+    standardized = standardize_pollutant_name(pollutant_name)
+    # 数据库中原样存储的名称优先于别名，避免别名把已有数据的名称（如lindane、bhc）改写成查不到的规范名称
+    stored = _name_index.resolve(standardized) if _name_index.loaded else None
+    if stored:
+        return stored
+    if Config.POLLUTANT_ALIAS_ENABLED:
+        canonical = get_pollutant_alias_map().canonical_name(standardized)
+        if canonical:
+            if not _name_index.loaded:
+                return canonical
+            stored = _name_index.resolve(canonical)
+            if stored:
+                return stored
+    return standardized
+
+
+def suggest_pollutant_names(resolved_name: str) -> List[str]:
+    """
+    查询名称不在名称索引中时，返回相似的候选名称供调用方确认（索引未加载时返回空列表）
+    
+    Args:
+        resolved_name (str): resolve_pollutant_name返回的名称
+        
+    Returns:
+        List[str]: 数据库中存储的候选名称
+    """
+    from config.config import Config
+    
+    if not _name_index.loaded:
+        return []
+    return _name_index.suggest(
+        resolved_name, Config.NAME_INDEX_SUGGEST_LIMIT, Config.NAME_INDEX_SUGGEST_MIN_SCORE
+    )
+
+
+def suggest_pollutant_names_batch(resolved: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    批量查询时为无法精确解析的名称给出相似名称建议
+    
+    Args:
+        resolved (dict): 用户输入的名称 -> resolve_pollutant_name返回的名称
+        
+    Returns:
+        dict: 用户输入的名称 -> 候选名称（只包含有建议的名称）
+    """
+    suggestions = {name: suggest_pollutant_names(standardized) for name, standardized in resolved.items()}
+    return {name: names for name, names in suggestions.items() if names}
 
 # 测试函数
 def test_standardize_pollutant_name():
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+污染物数据查询公共模块
+集中管理genes_data/organism_data的查询语句，供各数据库工具共享，
+查询结果经过共享的读穿缓存；分页查询按主键做keyset分页（主键通过inspect检测，
+没有可用主键时退化为不分页查询），多个污染物合并为一次查询，全量遍历使用服务端游标流式读取
+"""
+
+import threading
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, text
+
+from config.config import Config
+from tools.query_cache import cached_query
+
+
+# 各数据表允许作为过滤条件的列（白名单，防止拼接任意列名）
+TABLE_FILTER_COLUMNS = {
+    "genes_data": ("enzyme_type",),
+    "organism_data": ("organism_type",),
+}
+
+# 检测到的排序主键：引擎 -> {表名: 列名}，None表示没有可用主键
+_primary_keys: "weakref.WeakKeyDictionary[Any, Dict[str, Optional[str]]]" = weakref.WeakKeyDictionary()
+_primary_keys_lock = threading.Lock()
+
+
+def _validate_table(table: str):
+    """
+    校验表名是否在白名单内
+    """
+    if table not in TABLE_FILTER_COLUMNS:
+        raise ValueError(f"不支持的数据表: {table}")
+
+
+def _build_conditions(table: str, standardized_name: str,
+                      filters: Optional[Dict[str, str]]) -> Tuple[Dict[str, str], List[str], Dict[str, Any]]:
+    """
+    校验过滤条件并生成WHERE子句和参数
+
+    Args:
+        table (str): 数据表名
+        standardized_name (str): 标准化后的污染物名称
+        filters (dict, optional): 额外的等值过滤条件
+
+    Returns:
+        tuple: (生效的过滤条件, WHERE条件列表, 绑定参数)
+    """
+    _validate_table(table)
+    active_filters = {
+        column: value for column, value in (filters or {}).items() if value
+    }
+    for column in active_filters:
+        if column not in TABLE_FILTER_COLUMNS[table]:
+            raise ValueError(f"数据表 {table} 不支持按 {column} 过滤")
+
+    conditions = ["pollutant_name = :pollutant_name"]
+    conditions.extend(f"{column} = :{column}" for column in active_filters)
+    params = {"pollutant_name": standardized_name, **active_filters}
+    return active_filters, conditions, params
+
+
+def resolve_primary_key(engine, table: str) -> Optional[str]:
+    """
+    检测数据表用于排序和分页的主键列：优先使用Config.DB_PRIMARY_KEY，
+    该列不存在时使用表上定义的单列主键；都没有时返回None（查询不排序、不分页）
+
+    Args:
+        engine: SQLAlchemy引擎
+        table (str): 数据表名
+
+    Returns:
+        str: 主键列名，没有可用主键或检测失败时返回None
+    """
+    _validate_table(table)
+    detected = _primary_keys.get(engine, {})
+    if table in detected:
+        return detected[table]
+
+    with _primary_keys_lock:
+        detected = _primary_keys.setdefault(engine, {})
+        if table in detected:
+            return detected[table]
+        try:
+            inspector = inspect(engine)
+            columns = {column["name"] for column in inspector.get_columns(table)}
+            constrained = inspector.get_pk_constraint(table).get("constrained_columns") or []
+        except Exception as e:
+            # 检测失败不缓存，下次查询时重试
+            print(f"[警告] 无法检测数据表 {table} 的主键，本次查询不分页: {e}")
+            return None
+
+        if Config.DB_PRIMARY_KEY in columns:
+            primary_key = Config.DB_PRIMARY_KEY
+        elif len(constrained) == 1:
+            primary_key = constrained[0]
+        else:
+            primary_key = None
+            print(f"[警告] 数据表 {table} 没有 {Config.DB_PRIMARY_KEY} 列或单列主键，查询结果不排序、不分页")
+        detected[table] = primary_key
+        return primary_key
+
+
+def build_page_sql(table: str, conditions: List[str], page_size: int,
+                   primary_key: Optional[str]) -> str:
+    """
+    生成按主键keyset分页的查询语句（多取一条用于判断是否还有下一页）
+
+    Args:
+        table (str): 数据表名
+        conditions (list): WHERE条件列表
+        page_size (int): 每页记录数
+        primary_key (str, optional): 排序主键，为空时不排序
+
+    Returns:
+        str: SQL语句
+    """
+    order_clause = f"ORDER BY {primary_key}" if primary_key else ""
+    return f"""
+        SELECT *
+        FROM {table}
+        WHERE {' AND '.join(conditions)}
+        {order_clause}
+        LIMIT {page_size + 1}
+    """
+
+
+def build_batch_conditions(engine, table: str, standardized_names: List[str],
+                           filters: Optional[Dict[str, str]]) -> Tuple[Dict[str, str], List[str], Dict[str, Any], bool]:
+    """
+    生成批量查询的WHERE子句和参数：PostgreSQL使用 = ANY(:names)，其他数据库使用展开的 IN (:names)
+
+    Args:
+        engine: SQLAlchemy引擎
+        table (str): 数据表名
+        standardized_names (list): 标准化后的污染物名称列表
+        filters (dict, optional): 额外的等值过滤条件
+
+    Returns:
+        tuple: (生效的过滤条件, WHERE条件列表, 绑定参数, 是否使用ANY)
+    """
+    active_filters, conditions, params = _build_conditions(table, "", filters)
+    use_any = engine.dialect.name == "postgresql"
+    conditions[0] = "pollutant_name = ANY(:names)" if use_any else "pollutant_name IN :names"
+    params.pop("pollutant_name")
+    params["names"] = list(standardized_names)
+    return active_filters, conditions, params, use_any
+
+
+def build_batch_sql(table: str, conditions: List[str], primary_key: Optional[str]) -> str:
+    """
+    生成批量查询语句，每个污染物的记录数通过窗口函数ROW_NUMBER()限制
+
+    Args:
+        table (str): 数据表名
+        conditions (list): WHERE条件列表
+        primary_key (str, optional): 排序主键，为空时每个污染物内部不排序
+
+    Returns:
+        str: SQL语句（记录数上限绑定为 :limit_per_pollutant）
+    """
+    window_order = f" ORDER BY {primary_key}" if primary_key else ""
+    result_order = f"pollutant_name, {primary_key}" if primary_key else "pollutant_name"
+    return f"""
+        SELECT *
+        FROM (
+            SELECT {table}.*, ROW_NUMBER() OVER (
+                PARTITION BY pollutant_name{window_order}
+            ) AS row_rank
+            FROM {table}
+            WHERE {' AND '.join(conditions)}
+        ) ranked
+        WHERE row_rank <= :limit_per_pollutant
+        ORDER BY {result_order}
+    """
+
+
+def build_ranked_search_sql() -> str:
+    """
+    生成按pg_trgm相似度排序的污染物搜索语句，单次查询合并两张表（仅PostgreSQL）
+
+    Returns:
+        str: SQL语句（参数为 :keyword、:pattern、:top_k，见build_ranked_search_params）
+    """
+    candidates = "\n                UNION ALL".join(f"""
+                SELECT pollutant_name, similarity(pollutant_name, :keyword) AS score
+                FROM {table}
+                WHERE pollutant_name % :keyword OR pollutant_name ILIKE :pattern""" for table in TABLE_FILTER_COLUMNS)
+    return f"""
+        SELECT pollutant_name, MAX(score) AS score
+        FROM ({candidates}
+        ) AS candidates
+        GROUP BY pollutant_name
+        ORDER BY score DESC, pollutant_name
+        LIMIT :top_k
+    """
+
+
+def build_ranked_search_params(standardized_keyword: str, top_k: int) -> Dict[str, Any]:
+    """
+    生成相似度排序搜索语句的参数
+
+    Args:
+        standardized_keyword (str): 标准化后的搜索关键词
+        top_k (int): 最多返回的污染物数量
+
+    Returns:
+        dict: 查询参数
+    """
+    return {"keyword": standardized_keyword, "pattern": f"%{standardized_keyword}%", "top_k": top_k}
+
+
+def build_variant_search_sql(table: str, like: str) -> str:
+    """
+    生成单个名称变体在一张表中的模糊匹配语句
+
+    Args:
+        table (str): 数据表名
+        like (str): 模糊匹配运算符（见db_engine_registry.like_operator）
+
+    Returns:
+        str: SQL语句（模式绑定为 :keyword，形如 %变体%）
+    """
+    _validate_table(table)
+    return f"""
+        SELECT DISTINCT pollutant_name
+        FROM {table}
+        WHERE pollutant_name {like} :keyword
+        LIMIT 20
+    """
+
+
+def fetch_pollutant_page(engine, table: str, standardized_name: str,
+                         filters: Optional[Dict[str, str]] = None,
+                         page_size: int = 50, after: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    按主键keyset分页查询指定污染物在某张数据表中的记录（经过共享缓存）；
+    数据表没有可用主键时只返回前page_size条，next_cursor为空
+
+    Args:
+        engine: SQLAlchemy引擎
+        table (str): 数据表名 (genes_data, organism_data)
+        standardized_name (str): 标准化后的污染物名称
+        filters (dict, optional): 额外的等值过滤条件，如 {"enzyme_type": "..."}
+        page_size (int): 每页记录数，不超过Config.DB_MAX_PAGE_SIZE
+        after (optional): 上一页返回的游标（最后一条记录的主键），为空时从第一页开始
+
+    Returns:
+        dict: 包含 rows（记录字典列表）、next_cursor、has_more、primary_key（排序主键，可能为空）
+    """
+    active_filters, conditions, params = _build_conditions(table, standardized_name, filters)
+    primary_key = resolve_primary_key(engine, table)
+    page_size = max(1, min(int(page_size), Config.DB_MAX_PAGE_SIZE))
+    if after is not None:
+        if primary_key is None:
+            raise ValueError(f"数据表 {table} 没有可用于分页的主键，不支持after游标")
+        conditions.append(f"{primary_key} > :after")
+        params["after"] = after
+
+    def load() -> List[Dict]:
+        with engine.connect() as connection:
+            result = connection.execute(text(build_page_sql(table, conditions, page_size, primary_key)), params)
+
+            # 转换为字典列表
+            columns = list(result.keys())
+            return [dict(zip(columns, row)) for row in result.fetchall()]
+
+    cache_filters = dict(active_filters, limit=page_size, after=after)
+    rows = cached_query(engine, table, standardized_name, cache_filters, load)
+
+    has_more = len(rows) > page_size
+    # 返回副本，避免调用方修改缓存中的数据
+    page_rows = [dict(row) for row in rows[:page_size]]
+    return {
+        "rows": page_rows,
+        "next_cursor": page_rows[-1].get(primary_key) if has_more and page_rows and primary_key else None,
+        "has_more": has_more,
+        "primary_key": primary_key
+    }
+
+
+def fetch_pollutant_rows(engine, table: str, standardized_name: str,
+                         filters: Optional[Dict[str, str]] = None,
+                         limit: int = 50) -> List[Dict]:
+    """
+    查询指定污染物在某张数据表中按主键排序的前limit条记录（经过共享缓存）
+
+    Args:
+        engine: SQLAlchemy引擎
+        table (str): 数据表名 (genes_data, organism_data)
+        standardized_name (str): 标准化后的污染物名称
+        filters (dict, optional): 额外的等值过滤条件
+        limit (int): 最大返回记录数
+
+    Returns:
+        list: 记录字典列表
+    """
+    return fetch_pollutant_page(engine, table, standardized_name, filters, page_size=limit)["rows"]
+
+
+def fetch_pollutant_rows_batch(engine, table: str, standardized_names: List[str],
+                               filters: Optional[Dict[str, str]] = None,
+                               limit_per_pollutant: int = 50) -> Dict[str, List[Dict]]:
+    """
+    一次查询多个污染物的记录，按污染物分组返回（经过共享缓存）；
+    每个污染物的记录数通过窗口函数ROW_NUMBER()限制，PostgreSQL使用 = ANY(:names)，
+    其他数据库使用展开的 IN (:names)
+
+    Args:
+        engine: SQLAlchemy引擎
+        table (str): 数据表名 (genes_data, organism_data)
+        standardized_names (list): 标准化后的污染物名称列表
+        filters (dict, optional): 额外的等值过滤条件
+        limit_per_pollutant (int): 每个污染物最多返回的记录数
+
+    Returns:
+        dict: 污染物名称 -> 记录字典列表（按主键排序，没有记录的污染物为空列表）
+    """
+    names = sorted(set(standardized_names))
+    if not names:
+        return {}
+    active_filters, conditions, params, use_any = build_batch_conditions(engine, table, names, filters)
+    limit_per_pollutant = max(1, min(int(limit_per_pollutant), Config.DB_MAX_PAGE_SIZE))
+    params["limit_per_pollutant"] = limit_per_pollutant
+
+    primary_key = resolve_primary_key(engine, table)
+
+    def load() -> List[Dict]:
+        statement = text(build_batch_sql(table, conditions, primary_key))
+        if not use_any:
+            statement = statement.bindparams(bindparam("names", expanding=True))
+
+        with engine.connect() as connection:
+            result = connection.execute(statement, params)
+            columns = list(result.keys())
+            return [dict(zip(columns, row)) for row in result.fetchall()]
+
+    cache_filters = dict(active_filters, limit=limit_per_pollutant, batch=True)
+    rows = cached_query(engine, table, ",".join(names), cache_filters, load)
+
+    grouped = {name: [] for name in names}
+    for row in rows:
+        row = dict(row)
+        row.pop("row_rank", None)
+        grouped.setdefault(row["pollutant_name"], []).append(row)
+    return grouped
+
+
+def iter_pollutant_rows(engine, table: str, standardized_name: Optional[str] = None,
+                        filters: Optional[Dict[str, str]] = None,
+                        batch_size: Optional[int] = None) -> Iterator[Dict]:
+    """
+    使用服务端游标流式遍历记录，内存占用与结果集大小无关（不经过缓存）
+
+    Args:
+        engine: SQLAlchemy引擎
+        table (str): 数据表名 (genes_data, organism_data)
+        standardized_name (str, optional): 标准化后的污染物名称，为空时遍历整张表
+        filters (dict, optional): 额外的等值过滤条件
+        batch_size (int, optional): 每批从数据库读取的记录数，默认Config.DB_STREAM_BATCH_SIZE
+
+    Yields:
+        dict: 单条记录
+    """
+    _, conditions, params = _build_conditions(table, standardized_name or "", filters)
+    if standardized_name is None:
+        conditions = conditions[1:]
+        params.pop("pollutant_name")
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    primary_key = resolve_primary_key(engine, table)
+    order_clause = f"ORDER BY {primary_key}" if primary_key else ""
+
+    with engine.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True,
+            yield_per=batch_size or Config.DB_STREAM_BATCH_SIZE
+        ).execute(text(f"""
+            SELECT *
+            FROM {table}
+            {where_clause}
+            {order_clause}
+        """), params)
+
+        columns = list(result.keys())
+        for row in result:
+            yield dict(zip(columns, row))
@@ -5,18 +5,26 @@
 """
 
 from crewai.tools import BaseTool
-from config.config import Config
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from typing import Dict, Any, List, Optional
 import requests
 import json
 from pydantic import BaseModel, Field
-from tools.pollutant_name_utils import generate_pollutant_name_variants
+from tools.db_engine_registry import get_engine, like_operator
+from tools.pollutant_name_utils import (
+    generate_pollutant_name_variants,
+    get_pollutant_name_index,
+    standardize_pollutant_name
+)
+from tools.db_schema import is_postgresql
+from tools.pollutant_queries import build_ranked_search_params, build_ranked_search_sql, build_variant_search_sql
 
 
 class PollutantSearchInput(BaseModel):
     """污染物搜索输入参数"""
     keyword: str = Field(..., description="搜索关键词")
+    top_k: int = Field(20, description="最多返回的污染物数量")
+    search_mode: str = Field("auto", description="搜索模式 (auto: 自动选择, index: 内存名称索引, ranked: 相似度排序单次查询, variants: 逐个变体模糊匹配)")
 
 
 class PollutantSearchTool(BaseTool):
@@ -36,80 +44,148 @@ class PollutantSearchTool(BaseTool):
     
     def _get_database_connection(self):
         """
-        创建数据库连接
+        获取共享的数据库引擎（进程内按DSN复用连接池）
         """
-        db_type = Config.DB_TYPE
-        db_host = Config.DB_HOST
-        db_port = Config.DB_PORT
-        db_name = Config.DB_NAME
-        db_user = Config.DB_USER
-        db_password = Config.DB_PASSWORD
-        
-        if db_type == 'postgresql':
-            database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        elif db_type == 'mysql':
-            database_url = f"mysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        else:
-            raise ValueError(f"不支持的数据库类型: {db_type}")
-        
-        engine = create_engine(database_url)
-        return engine
+        return get_engine()
     
-    def _run(self, keyword: str) -> Dict[Any, Any]:
+    def _run(self, keyword: str, top_k: int = 20, search_mode: str = "auto") -> Dict[Any, Any]:
         """
         搜索污染物
         
         Args:
             keyword (str): 搜索关键词
+            top_k (int): 最多返回的污染物数量
+            search_mode (str): 搜索模式 ("auto", "index", "ranked", "variants")
             
         Returns:
             dict: 搜索结果
         """
         try:
-            # 生成关键词的多种变体
-            keyword_variants = generate_pollutant_name_variants(keyword)
+            # 名称索引已加载时直接在内存中搜索，不访问数据库
+            name_index = get_pollutant_name_index()
+            if search_mode in ("auto", "index") and name_index.loaded:
+                return self._index_search(keyword, top_k)
             
-            with self.db_engine.connect() as connection:
-                all_pollutants = set()
-                
-                # 对每个变体进行搜索
-                for variant in keyword_variants:
-                    # 搜索基因数据中的污染物
-                    gene_result = connection.execute(text("""
-                        SELECT DISTINCT pollutant_name
-                        FROM genes_data
-                        WHERE pollutant_name ILIKE :keyword
-                        LIMIT 20
-                    """), {"keyword": f"%{variant}%"})
-                    
-                    gene_pollutants = [row[0] for row in gene_result.fetchall()]
-                    all_pollutants.update(gene_pollutants)
-                    
-                    # 搜索微生物数据中的污染物
-                    organism_result = connection.execute(text("""
-                        SELECT DISTINCT pollutant_name
-                        FROM organism_data
-                        WHERE pollutant_name ILIKE :keyword
-                        LIMIT 20
-                    """), {"keyword": f"%{variant}%"})
-                    
-                    organism_pollutants = [row[0] for row in organism_result.fetchall()]
-                    all_pollutants.update(organism_pollutants)
-                
-                # 转换为列表
-                pollutants_list = list(all_pollutants)
-                
-                return {
-                    "status": "success",
-                    "keyword": keyword,
-                    "variants_searched": keyword_variants[:5],  # 只显示前5个变体
-                    "pollutants": pollutants_list,
-                    "count": len(pollutants_list)
-                }
+            # 相似度排序搜索依赖pg_trgm，其他数据库回退到变体模糊匹配
+            if search_mode in ("auto", "ranked") and is_postgresql(self.db_engine):
+                try:
+                    return self._ranked_search(keyword, top_k)
+                except Exception as e:
+                    print(f"相似度搜索失败，回退到变体搜索: {e}")
+            
+            return self._variant_search(keyword, top_k)
                 
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"搜索污染物时出错: {str(e)}",
                 "keyword": keyword
-            }
\ No newline at end of file
+            }
+    
+    def _index_search(self, keyword: str, top_k: int) -> Dict[Any, Any]:
+        """
+        使用内存中的污染物名称索引搜索
+        
+        Args:
+            keyword (str): 搜索关键词
+            top_k (int): 最多返回的污染物数量
+            
+        Returns:
+            dict: 搜索结果
+        """
+        matches = [
+            {"pollutant_name": name, "score": score}
+            for name, score in get_pollutant_name_index().search(keyword, limit=top_k)
+        ]
+        
+        return {
+            "status": "success",
+            "keyword": keyword,
+            "search_mode": "index",
+            "matches": matches,
+            "pollutants": [match["pollutant_name"] for match in matches],
+            "count": len(matches)
+        }
+    
+    def _ranked_search(self, keyword: str, top_k: int) -> Dict[Any, Any]:
+        """
+        单次查询合并两张表，按pg_trgm相似度排序返回前top_k个污染物
+        （需先执行 python -m tools.db_schema 创建三元组索引）
+        
+        Args:
+            keyword (str): 搜索关键词
+            top_k (int): 最多返回的污染物数量
+            
+        Returns:
+            dict: 搜索结果
+        """
+        standardized_keyword = standardize_pollutant_name(keyword) or keyword
+        
+        with self.db_engine.connect() as connection:
+            result = connection.execute(
+                text(build_ranked_search_sql()),
+                build_ranked_search_params(standardized_keyword, top_k)
+            )
+            
+            matches = [
+                {"pollutant_name": row[0], "score": round(float(row[1]), 4)}
+                for row in result.fetchall()
+            ]
+        
+        return {
+            "status": "success",
+            "keyword": keyword,
+            "search_mode": "ranked",
+            "matches": matches,
+            "pollutants": [match["pollutant_name"] for match in matches],
+            "count": len(matches)
+        }
+    
+    def _variant_search(self, keyword: str, top_k: int) -> Dict[Any, Any]:
+        """
+        对关键词的每个变体分别在两张表中做模糊匹配
+        （变体经过去重、覆盖剪除和名称索引剪除，只有可能命中的变体才会查询数据库）
+        
+        Args:
+            keyword (str): 搜索关键词
+            top_k (int): 最多返回的污染物数量
+            
+        Returns:
+            dict: 搜索结果
+        """
+        # 生成关键词的多种变体（按可能性排序并剪除不可能命中的变体）
+        keyword_variants = generate_pollutant_name_variants(keyword)
+        like = like_operator(self.db_engine)
+        
+        with self.db_engine.connect() as connection:
+            all_pollutants = set()
+            
+            # 对每个变体进行搜索
+            for variant in keyword_variants:
+                # 搜索基因数据中的污染物
+                gene_result = connection.execute(
+                    text(build_variant_search_sql("genes_data", like)), {"keyword": f"%{variant}%"}
+                )
+                
+                gene_pollutants = [row[0] for row in gene_result.fetchall()]
+                all_pollutants.update(gene_pollutants)
+                
+                # 搜索微生物数据中的污染物
+                organism_result = connection.execute(
+                    text(build_variant_search_sql("organism_data", like)), {"keyword": f"%{variant}%"}
+                )
+                
+                organism_pollutants = [row[0] for row in organism_result.fetchall()]
+                all_pollutants.update(organism_pollutants)
+            
+            # 转换为列表
+            pollutants_list = sorted(all_pollutants)[:top_k]
+            
+            return {
+                "status": "success",
+                "keyword": keyword,
+                "search_mode": "variants",
+                "variants_searched": keyword_variants,
+                "pollutants": pollutants_list,
+                "count": len(pollutants_list)
+            }
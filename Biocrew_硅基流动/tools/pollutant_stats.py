@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+污染物统计表
+维护按污染物预先汇总的pollutant_stats表（记录数、不同酶/微生物类型数、主要微生物、更新时间），
+PollutantSummaryTool通过主键点查读取，数据导入后按内容指纹增量刷新
+
+用法（在项目根目录执行）:
+    python -m tools.pollutant_stats                 # 增量刷新内容指纹发生变化的污染物
+    python -m tools.pollutant_stats endrin lindane  # 强制刷新指定污染物
+"""
+
+import hashlib
+import json
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, text
+
+from config.config import Config
+from tools.db_engine_registry import get_engine
+from tools.pollutant_queries import TABLE_FILTER_COLUMNS, resolve_primary_key
+from tools.query_cache import get_query_cache
+
+
+STATS_TABLE = "pollutant_stats"
+
+CREATE_STATS_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+        pollutant_name VARCHAR(255) PRIMARY KEY,
+        gene_records INTEGER NOT NULL DEFAULT 0,
+        enzyme_types INTEGER NOT NULL DEFAULT 0,
+        organism_records INTEGER NOT NULL DEFAULT 0,
+        organism_types INTEGER NOT NULL DEFAULT 0,
+        top_organisms TEXT,
+        content_fingerprint VARCHAR(64),
+        last_updated TIMESTAMP
+    )
+"""
+
+
+def ensure_pollutant_stats_table(engine) -> List[str]:
+    """
+    创建污染物统计表；已存在的旧表缺少content_fingerprint列时补上该列
+    （旧记录的指纹为空，下次增量刷新时全部重新统计）
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        list: 已执行的DDL语句
+    """
+    statements = [f"CREATE TABLE IF NOT EXISTS {STATS_TABLE}"]
+    with engine.begin() as connection:
+        connection.execute(text(CREATE_STATS_TABLE_SQL))
+        columns = {column["name"] for column in inspect(connection).get_columns(STATS_TABLE)}
+        if "content_fingerprint" not in columns:
+            statement = f"ALTER TABLE {STATS_TABLE} ADD COLUMN content_fingerprint VARCHAR(64)"
+            connection.execute(text(statement))
+            statements.append(statement)
+    return statements
+
+
+def _aggregate_by_pollutant(connection, table: str, primary_key: Optional[str],
+                            names: Optional[List[str]] = None) -> Dict[str, Tuple]:
+    """
+    按污染物分组汇总数据表：记录数、不同类型数，以及用于内容指纹的最大主键和类型列的长度和、最小值、最大值
+
+    Args:
+        connection: 数据库连接
+        table (str): 数据表名
+        primary_key (str, optional): 表的主键，没有主键时指纹不包含最大主键
+        names (list, optional): 只汇总指定污染物，为空时汇总全部污染物
+
+    Returns:
+        dict: 污染物名称 -> (记录数, 不同类型数, 最大主键, 类型长度和, 最小类型, 最大类型)
+    """
+    type_column = TABLE_FILTER_COLUMNS[table][0]
+    max_key = f"MAX({primary_key})" if primary_key else "NULL"
+    where = "WHERE pollutant_name IN :names" if names is not None else ""
+    statement = text(f"""
+        SELECT pollutant_name, COUNT(*), COUNT(DISTINCT {type_column}), {max_key},
+               SUM(LENGTH({type_column})), MIN({type_column}), MAX({type_column})
+        FROM {table}
+        {where}
+        GROUP BY pollutant_name
+    """)
+    if names is not None:
+        statement = statement.bindparams(bindparam("names", expanding=True))
+    result = connection.execute(statement, {"names": names} if names is not None else {})
+    return {row[0]: tuple(row[1:]) for row in result if row[0]}
+
+
+def _content_fingerprint(gene_aggregate: Optional[Tuple], organism_aggregate: Optional[Tuple]) -> str:
+    """
+    由两张表的分组汇总结果生成污染物的内容指纹；
+    记录数不变的重新导入（主键变化）或类型修正（类型列变化）都会改变指纹
+    """
+    parts = [
+        "|".join("" if value is None else str(value) for value in aggregate or ())
+        for aggregate in (gene_aggregate, organism_aggregate)
+    ]
+    return hashlib.md5("/".join(parts).encode("utf-8")).hexdigest()
+
+
+def find_stale_pollutants(engine) -> Dict[str, List[str]]:
+    """
+    对比数据表的内容指纹与统计表中保存的指纹，找出需要刷新和需要删除的污染物
+
+    Args:
+        engine: SQLAlchemy引擎
+
+    Returns:
+        dict: {"refresh": [...], "delete": [...]}
+    """
+    gene_key = resolve_primary_key(engine, "genes_data")
+    organism_key = resolve_primary_key(engine, "organism_data")
+    with engine.connect() as connection:
+        gene_aggregates = _aggregate_by_pollutant(connection, "genes_data", gene_key)
+        organism_aggregates = _aggregate_by_pollutant(connection, "organism_data", organism_key)
+        stats = {
+            row[0]: row[1]
+            for row in connection.execute(text(f"""
+                SELECT pollutant_name, content_fingerprint
+                FROM {STATS_TABLE}
+            """))
+        }
+
+    source_names = set(gene_aggregates) | set(organism_aggregates)
+    refresh = sorted(
+        name for name in source_names
+        if stats.get(name) != _content_fingerprint(gene_aggregates.get(name), organism_aggregates.get(name))
+    )
+    delete = sorted(set(stats) - source_names)
+    return {"refresh": refresh, "delete": delete}
+
+
+def compute_pollutant_stats(engine, pollutant_names: Iterable[str]) -> List[Dict]:
+    """
+    从数据表实时汇总指定污染物的统计信息（每张表一次分组查询）
+
+    Args:
+        engine: SQLAlchemy引擎
+        pollutant_names (Iterable[str]): 标准化后的污染物名称
+
+    Returns:
+        list: 统计记录列表
+    """
+    names = sorted(set(pollutant_names))
+    if not names:
+        return []
+
+    organism_column = Config.ORGANISM_NAME_COLUMN
+    stats = {
+        name: {
+            "pollutant_name": name,
+            "gene_records": 0,
+            "enzyme_types": 0,
+            "organism_records": 0,
+            "organism_types": 0,
+            "top_organisms": [],
+            "content_fingerprint": None
+        }
+        for name in names
+    }
+
+    gene_key = resolve_primary_key(engine, "genes_data")
+    organism_key = resolve_primary_key(engine, "organism_data")
+    with engine.connect() as connection:
+        gene_aggregates = _aggregate_by_pollutant(connection, "genes_data", gene_key, names)
+        organism_aggregates = _aggregate_by_pollutant(connection, "organism_data", organism_key, names)
+        for name in names:
+            gene_aggregate, organism_aggregate = gene_aggregates.get(name), organism_aggregates.get(name)
+            if gene_aggregate:
+                stats[name]["gene_records"], stats[name]["enzyme_types"] = gene_aggregate[:2]
+            if organism_aggregate:
+                stats[name]["organism_records"], stats[name]["organism_types"] = organism_aggregate[:2]
+            stats[name]["content_fingerprint"] = _content_fingerprint(gene_aggregate, organism_aggregate)
+
+        try:
+            top_result = connection.execute(text(f"""
+                SELECT pollutant_name, {organism_column}, COUNT(*)
+                FROM organism_data
+                WHERE pollutant_name IN :names
+                GROUP BY pollutant_name, {organism_column}
+            """).bindparams(bindparam("names", expanding=True)), {"names": names})
+            organism_counts = defaultdict(Counter)
+            for name, organism, count in top_result:
+                if organism:
+                    organism_counts[name][organism] = count
+            for name, counter in organism_counts.items():
+                stats[name]["top_organisms"] = [
+                    organism for organism, _ in counter.most_common(Config.POLLUTANT_STATS_TOP_ORGANISMS)
+                ]
+        except Exception as e:
+            print(f"统计主要微生物失败（请检查ORGANISM_NAME_COLUMN配置）: {e}")
+
+    return list(stats.values())
+
+
+def refresh_pollutant_stats(engine=None, pollutant_names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    增量刷新污染物统计表
+
+    Args:
+        engine: SQLAlchemy引擎，默认使用共享引擎
+        pollutant_names (Iterable[str], optional): 需要强制刷新的标准化污染物名称；
+            为空时自动对比内容指纹，只刷新发生变化的污染物并删除已不存在的污染物
+
+    Returns:
+        dict: 刷新和删除的污染物数量
+    """
+    engine = engine or get_engine()
+    ensure_pollutant_stats_table(engine)
+
+    if pollutant_names is None:
+        stale = find_stale_pollutants(engine)
+        refresh_names, delete_names = stale["refresh"], stale["delete"]
+    else:
+        refresh_names, delete_names = sorted(set(pollutant_names)), []
+
+    rows = compute_pollutant_stats(engine, refresh_names)
+    # 统计表的last_updated为不带时区的TIMESTAMP列，统一写入UTC时间
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    # 没有任何数据的污染物不写入统计表
+    rows_to_insert = [row for row in rows if row["gene_records"] or row["organism_records"]]
+
+    with engine.begin() as connection:
+        names_to_delete = refresh_names + delete_names
+        if names_to_delete:
+            connection.execute(text(f"""
+                DELETE FROM {STATS_TABLE}
+                WHERE pollutant_name IN :names
+            """).bindparams(bindparam("names", expanding=True)), {"names": names_to_delete})
+        if rows_to_insert:
+            connection.execute(text(f"""
+                INSERT INTO {STATS_TABLE} (
+                    pollutant_name, gene_records, enzyme_types,
+                    organism_records, organism_types, top_organisms, content_fingerprint, last_updated
+                ) VALUES (
+                    :pollutant_name, :gene_records, :enzyme_types,
+                    :organism_records, :organism_types, :top_organisms, :content_fingerprint, :last_updated
+                )
+            """), [
+                {
+                    **row,
+                    "top_organisms": json.dumps(row["top_organisms"], ensure_ascii=False),
+                    "last_updated": now
+                }
+                for row in rows_to_insert
+            ])
+
+    get_query_cache().invalidate(STATS_TABLE)
+    return {"refreshed": len(rows_to_insert), "deleted": len(names_to_delete) - len(rows_to_insert)}
+
+
+def fetch_pollutant_stats(engine, pollutant_names: Iterable[str]) -> Dict[str, Dict]:
+    """
+    按主键批量读取污染物统计信息
+
+    Args:
+        engine: SQLAlchemy引擎
+        pollutant_names (Iterable[str]): 标准化后的污染物名称
+
+    Returns:
+        dict: 污染物名称 -> 统计记录（统计表中不存在的污染物不包含在内）
+    """
+    names = sorted(set(pollutant_names))
+    if not names:
+        return {}
+
+    with engine.connect() as connection:
+        result = connection.execute(text(f"""
+            SELECT pollutant_name, gene_records, enzyme_types, organism_records,
+                   organism_types, top_organisms, last_updated
+            FROM {STATS_TABLE}
+            WHERE pollutant_name IN :names
+        """).bindparams(bindparam("names", expanding=True)), {"names": names})
+        columns = list(result.keys())
+        rows = [dict(zip(columns, row)) for row in result.fetchall()]
+
+    stats = {}
+    for row in rows:
+        row["top_organisms"] = json.loads(row["top_organisms"]) if row["top_organisms"] else []
+        if row["last_updated"] is not None and not isinstance(row["last_updated"], str):
+            row["last_updated"] = row["last_updated"].isoformat()
+        stats[row["pollutant_name"]] = row
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+    """
+    from tools.pollutant_name_utils import standardize_many
+
+    argv = sys.argv[1:] if argv is None else argv
+    names = standardize_many(argv) or None
+    try:
+        outcome = refresh_pollutant_stats(pollutant_names=names)
+    except Exception as e:
+        print(f"刷新污染物统计表失败: {e}")
+        return 1
+
+    print(f"✓ 已刷新 {outcome['refreshed']} 个污染物，删除 {outcome['deleted']} 个污染物")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
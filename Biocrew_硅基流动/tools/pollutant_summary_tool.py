@@ -5,24 +5,27 @@
 """
 
 from crewai.tools import BaseTool
-from config.config import Config
-from sqlalchemy import create_engine, text
 from typing import Dict, Any, List, Optional
 import requests
 import json
 from pydantic import BaseModel, Field
+from tools.db_engine_registry import get_engine
+from tools.query_cache import cached_query
+from tools.pollutant_name_utils import resolve_pollutant_name, suggest_pollutant_names
+from tools.pollutant_stats import STATS_TABLE, compute_pollutant_stats, fetch_pollutant_stats
 
 
 class PollutantSummaryInput(BaseModel):
     """污染物摘要输入参数"""
-    pollutant_name: str = Field(..., description="污染物名称")
+    pollutant_name: Optional[str] = Field(None, description="污染物名称")
+    pollutant_names: Optional[List[str]] = Field(None, description="批量查询的污染物名称列表")
 
 
 class PollutantSummaryTool(BaseTool):
     """污染物摘要工具"""
     
     name: str = "PollutantSummaryTool"
-    description: str = "获取指定污染物的数据摘要，包括基因数据和微生物数据的统计信息"
+    description: str = "获取指定污染物的数据摘要，包括基因数据和微生物数据的统计信息，支持批量查询多个污染物"
     args_schema: type[BaseModel] = PollutantSummaryInput
     
     def __init__(self):
@@ -35,71 +38,116 @@ class PollutantSummaryTool(BaseTool):
     
     def _get_database_connection(self):
         """
-        创建数据库连接
+        获取共享的数据库引擎（进程内按DSN复用连接池）
         """
-        db_type = Config.DB_TYPE
-        db_host = Config.DB_HOST
-        db_port = Config.DB_PORT
-        db_name = Config.DB_NAME
-        db_user = Config.DB_USER
-        db_password = Config.DB_PASSWORD
-        
-        if db_type == 'postgresql':
-            database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        elif db_type == 'mysql':
-            database_url = f"mysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        else:
-            raise ValueError(f"不支持的数据库类型: {db_type}")
-        
-        engine = create_engine(database_url)
-        return engine
+        return get_engine()
     
-    def _run(self, pollutant_name: str) -> Dict[Any, Any]:
+    def _run(self, pollutant_name: Optional[str] = None,
+             pollutant_names: Optional[List[str]] = None) -> Dict[Any, Any]:
         """
         获取污染物数据摘要
         
         Args:
-            pollutant_name (str): 污染物名称
+            pollutant_name (str, optional): 污染物名称
+            pollutant_names (list, optional): 批量查询的污染物名称列表
             
         Returns:
-            dict: 数据摘要
+            dict: 数据摘要（批量查询时summaries中每个污染物一条）
         """
+        requested = list(pollutant_names or [])
+        if pollutant_name:
+            requested.append(pollutant_name)
+        if not requested:
+            return {"status": "error", "message": "缺少必需参数: pollutant_name 或 pollutant_names"}
+        
         try:
-            with self.db_engine.connect() as connection:
-                # 获取基因数据统计
-                gene_result = connection.execute(text("""
-                    SELECT COUNT(*) as count, COUNT(DISTINCT enzyme_type) as enzyme_types
-                    FROM genes_data
-                    WHERE pollutant_name = :pollutant_name
-                """), {"pollutant_name": pollutant_name.lower().replace(' ', '_')})
-                
-                gene_stats = gene_result.fetchone()
-                
-                # 获取微生物数据统计
-                organism_result = connection.execute(text("""
-                    SELECT COUNT(*) as count, COUNT(DISTINCT organism_type) as organism_types
-                    FROM organism_data
-                    WHERE pollutant_name = :pollutant_name
-                """), {"pollutant_name": pollutant_name.lower().replace(' ', '_')})
-                
-                organism_stats = organism_result.fetchone()
-                
-                return {
-                    "status": "success",
-                    "pollutant_name": pollutant_name,
-                    "gene_data": {
-                        "total_records": gene_stats[0] if gene_stats else 0,
-                        "enzyme_types": gene_stats[1] if gene_stats else 0
-                    },
-                    "organism_data": {
-                        "total_records": organism_stats[0] if organism_stats else 0,
-                        "organism_types": organism_stats[1] if organism_stats else 0
-                    }
-                }
+            resolved = {name: resolve_pollutant_name(name) for name in requested}
+            stats = self._get_stats(set(resolved.values()))
+            summaries = [
+                self._format_summary(name, resolved[name], stats.get(resolved[name]))
+                for name in requested
+            ]
+            
+            if pollutant_names is None:
+                return {"status": "success", **summaries[0]}
+            return {
+                "status": "success",
+                "summaries": summaries,
+                "count": len(summaries)
+            }
                 
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"获取污染物摘要时出错: {str(e)}",
-                "pollutant_name": pollutant_name
-            }
\ No newline at end of file
+                "pollutant_name": pollutant_name or requested
+            }
+    
+    def _get_stats(self, standardized_names: set) -> Dict[str, Dict]:
+        """
+        优先从pollutant_stats统计表按主键读取，统计表不存在或缺少记录时实时汇总
+        
+        Args:
+            standardized_names (set): 标准化后的污染物名称
+            
+        Returns:
+            dict: 污染物名称 -> 统计记录
+        """
+        cache_key = ",".join(sorted(standardized_names))
+        try:
+            stats = cached_query(
+                self.db_engine, STATS_TABLE, cache_key, {"aggregate": "stats"},
+                lambda: fetch_pollutant_stats(self.db_engine, standardized_names)
+            )
+            stats = {name: dict(row, source=STATS_TABLE) for name, row in stats.items()}
+        except Exception as e:
+            print(f"读取污染物统计表失败，改为实时统计（可执行 python -m tools.pollutant_stats 初始化）: {e}")
+            stats = {}
+        
+        missing = standardized_names - set(stats)
+        if missing:
+            # 实时统计同时读取两张表，任一表的版本变化都会使缓存失效
+            live_rows = cached_query(
+                self.db_engine, "genes_data", ",".join(sorted(missing)), {"aggregate": "live_summary"},
+                lambda: compute_pollutant_stats(self.db_engine, missing),
+                depends_on=("organism_data",)
+            )
+            for row in live_rows:
+                stats[row["pollutant_name"]] = dict(row, last_updated=None, source="live")
+        return stats
+    
+    @staticmethod
+    def _format_summary(pollutant_name: str, standardized_name: str, stats: Optional[Dict]) -> Dict[str, Any]:
+        """
+        将统计记录整理为工具输出格式
+        
+        Args:
+            pollutant_name (str): 用户输入的污染物名称
+            standardized_name (str): 标准化后的污染物名称
+            stats (dict, optional): 统计记录
+            
+        Returns:
+            dict: 污染物摘要
+        """
+        stats = stats or {}
+        summary = {
+            "pollutant_name": pollutant_name,
+            "resolved_name": standardized_name,
+            "standardized_name": standardized_name,
+            "gene_data": {
+                "total_records": stats.get("gene_records", 0),
+                "enzyme_types": stats.get("enzyme_types", 0)
+            },
+            "organism_data": {
+                "total_records": stats.get("organism_records", 0),
+                "organism_types": stats.get("organism_types", 0),
+                "top_organisms": stats.get("top_organisms", [])
+            },
+            "last_updated": stats.get("last_updated"),
+            "source": stats.get("source")
+        }
+        # 名称不在数据库中时只给出相似名称作为建议，不替换查询的污染物
+        suggestions = suggest_pollutant_names(standardized_name)
+        if suggestions:
+            summary["suggestions"] = suggestions
+        return summary
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+查询结果缓存
+为基因/微生物数据查询提供进程内共享的LRU+TTL读穿缓存，
+通过廉价的表版本探测在数据更新后自动失效：PostgreSQL读取pg_stat_user_tables的
+插入/更新/删除计数（不扫描表，行数不变的更新也能发现），其他数据库使用行数指纹
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+
+from config.config import Config
+
+
+class QueryResultCache:
+    """LRU+TTL查询结果缓存，按(表名, 标准化污染物名称, 过滤条件)缓存"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 600,
+                 version_check_interval: float = 30):
+        """
+        初始化查询结果缓存
+
+        Args:
+            max_entries (int): 最大缓存条目数，超出时淘汰最久未使用的条目
+            ttl_seconds (float): 缓存条目有效期（秒）
+            version_check_interval (float): 表版本探测的最小间隔（秒）
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_interval = version_check_interval
+        # key -> (过期时间, 表版本, 缓存值)
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any, Any]]" = OrderedDict()
+        # (DSN, 表名) -> (表版本, 探测时间)
+        self._versions: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(engine, table: str, standardized_name: str,
+                 filters: Optional[Dict[str, Hashable]] = None) -> Tuple:
+        """
+        生成缓存键
+
+        Args:
+            engine: SQLAlchemy引擎
+            table (str): 表名
+            standardized_name (str): 标准化后的污染物名称
+            filters (dict, optional): 过滤条件
+
+        Returns:
+            tuple: 缓存键
+        """
+        filter_items = tuple(sorted((filters or {}).items()))
+        return (str(engine.url), table, standardized_name, filter_items)
+
+    @staticmethod
+    def _read_table_version(connection, table: str) -> Any:
+        """
+        读取表版本指纹：PostgreSQL为累计的插入/更新/删除行数，其他数据库为行数
+
+        Args:
+            connection: 数据库连接
+            table (str): 表名
+
+        Returns:
+            表版本指纹，PostgreSQL统计视图中没有该表时为None
+        """
+        if connection.dialect.name == "postgresql":
+            # 计数在写入事务提交后由后端异步刷新（通常数秒内可见），远小于探测间隔
+            row = connection.execute(text("""
+                SELECT n_tup_ins, n_tup_upd, n_tup_del
+                FROM pg_stat_user_tables
+                WHERE relname = :table
+                ORDER BY schemaname = ANY(current_schemas(false)) DESC
+                LIMIT 1
+            """), {"table": table}).fetchone()
+            return tuple(row) if row else None
+        return connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+    def _probe_table_version(self, engine, table: str) -> Any:
+        """
+        探测表版本，在探测间隔内复用上一次结果
+
+        Args:
+            engine: SQLAlchemy引擎
+            table (str): 表名
+
+        Returns:
+            表版本指纹
+        """
+        version_key = (str(engine.url), table)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(version_key)
+            if cached and now - cached[1] < self.version_check_interval:
+                return cached[0]
+
+        with engine.connect() as connection:
+            version = self._read_table_version(connection, table)
+
+        with self._lock:
+            previous = self._versions.get(version_key)
+            self._versions[version_key] = (version, now)
+            if previous and previous[0] != version:
+                self._invalidate_locked(str(engine.url), table)
+        return version
+
+    def get_or_load(self, engine, table: str, standardized_name: str,
+                    filters: Optional[Dict[str, Hashable]], loader: Callable[[], Any],
+                    depends_on: Iterable[str] = ()) -> Any:
+        """
+        读穿缓存：命中则直接返回，否则调用loader查询数据库并写入缓存
+
+        Args:
+            engine: SQLAlchemy引擎
+            table (str): 表名
+            standardized_name (str): 标准化后的污染物名称
+            filters (dict, optional): 过滤条件（包括LIMIT等影响结果的参数）
+            loader (callable): 缓存未命中时执行的查询函数
+            depends_on (Iterable[str]): 查询同时读取的其他表，任一表版本变化时缓存条目失效
+
+        Returns:
+            查询结果
+        """
+        key = self.make_key(engine, table, standardized_name, filters)
+        version = tuple(self._probe_table_version(engine, name) for name in (table, *depends_on))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_version, value = entry
+                if expires_at > now and entry_version == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _invalidate_locked(self, dsn: Optional[str] = None, table: Optional[str] = None):
+        """
+        删除匹配的缓存条目（调用方需持有锁）
+        """
+        stale_keys = [
+            key for key in self._entries
+            if (dsn is None or key[0] == dsn) and (table is None or key[1] == table)
+        ]
+        for key in stale_keys:
+            del self._entries[key]
+        self.invalidations += len(stale_keys)
+
+    def invalidate(self, table: Optional[str] = None):
+        """
+        手动失效缓存（如数据导入完成后）
+
+        Args:
+            table (str, optional): 表名，为空时清空全部缓存
+        """
+        with self._lock:
+            self._invalidate_locked(table=table)
+            self._versions = {
+                key: value for key, value in self._versions.items()
+                if table is not None and key[1] != table
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 命中数、未命中数、命中率、失效数和当前条目数
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries
+            }
+
+
+_query_cache: Optional[QueryResultCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryResultCache:
+    """
+    获取进程内共享的查询结果缓存
+
+    Returns:
+        QueryResultCache: 查询结果缓存实例
+    """
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryResultCache(
+                    max_entries=Config.QUERY_CACHE_MAX_ENTRIES,
+                    ttl_seconds=Config.QUERY_CACHE_TTL,
+                    version_check_interval=Config.QUERY_CACHE_VERSION_CHECK_INTERVAL
+                )
+    return _query_cache
+
+
+def cached_query(engine, table: str, standardized_name: str,
+                 filters: Optional[Dict[str, Hashable]], loader: Callable[[], Any],
+                 depends_on: Iterable[str] = ()) -> Any:
+    """
+    按配置决定是否走缓存执行查询
+
+    Args:
+        engine: SQLAlchemy引擎
+        table (str): 表名
+        standardized_name (str): 标准化后的污染物名称
+        filters (dict, optional): 过滤条件
+        loader (callable): 实际执行查询的函数
+        depends_on (Iterable[str]): 查询同时读取的其他表
+
+    Returns:
+        查询结果
+    """
+    if not Config.QUERY_CACHE_ENABLED:
+        return loader()
+    return get_query_cache().get_or_load(engine, table, standardized_name, filters, loader, depends_on)
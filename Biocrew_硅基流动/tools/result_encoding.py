@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+数据库工具输出编码
+按列配置文件裁剪查询结果，使用列式编码（表头只出现一次）并截断长文本，
+保证每次工具调用写入智能体上下文的数据量不超过字节预算
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+from config.config import Config
+
+
+# 各数据表的列配置文件：minimal 只保留识别所需字段，evidence 额外保留证据字段，full 为全部列
+# 实际输出列为配置列与查询结果列的交集（保持配置顺序）；配置列是按常见命名预设的，
+# 交集中除键列外没有其他列时（数据库使用了不同的列名）退回全部列，避免丢掉证据字段
+COLUMN_PROFILES = {
+    "genes_data": {
+        "minimal": ("pollutant_name", "gene_name", "enzyme_type"),
+        "evidence": (
+            "pollutant_name", "gene_name", "gene_id", "enzyme_type", "enzyme_name",
+            "ec_number", "ko_id", "organism_name", "reference", "doi"
+        ),
+    },
+    "organism_data": {
+        "minimal": ("pollutant_name", "organism_name", "organism_type"),
+        "evidence": (
+            "pollutant_name", "organism_name", "organism_type", "strain",
+            "degradation_rate", "conditions", "reference", "doi"
+        ),
+    },
+}
+
+# 各数据表的键列：只匹配到键列时不能提供任何证据，视为配置不适用
+KEY_COLUMNS = {
+    "genes_data": ("pollutant_name",),
+    "organism_data": ("pollutant_name",),
+}
+
+PROFILES = ("minimal", "evidence", "full")
+OUTPUT_FORMATS = ("columnar", "records")
+
+
+def select_columns(table: str, columns: Sequence[str], profile: str) -> List[str]:
+    """
+    根据列配置文件选择输出列
+
+    Args:
+        table (str): 数据表名
+        columns (Sequence[str]): 查询结果中的全部列
+        profile (str): 列配置文件 (minimal, evidence, full)
+
+    Returns:
+        list: 输出列（配置列中除键列外没有匹配的列时为全部列）
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"不支持的列配置: {profile}，可选值: {', '.join(PROFILES)}")
+    if profile == "full":
+        return list(columns)
+
+    available = set(columns)
+    selected = [column for column in COLUMN_PROFILES.get(table, {}).get(profile, ()) if column in available]
+    key_columns = KEY_COLUMNS.get(table, ())
+    if not any(column not in key_columns for column in selected):
+        return list(columns)
+    return selected
+
+
+def _compact_value(value: Any, max_text_length: int) -> Any:
+    """
+    将单元格值转换为可JSON序列化的紧凑形式，超长文本截断
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    text_value = str(value)
+    if max_text_length and len(text_value) > max_text_length:
+        return text_value[:max_text_length] + "…"
+    return text_value
+
+
+def _encoded_size(value: Any) -> int:
+    """
+    计算值序列化为JSON后的UTF-8字节数
+    """
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def encode_rows(table: str, rows: List[Dict], profile: Optional[str] = None,
+                output_format: str = "columnar", max_bytes: Optional[int] = None,
+                max_text_length: Optional[int] = None) -> Dict[str, Any]:
+    """
+    按列配置和字节预算编码查询结果
+
+    Args:
+        table (str): 数据表名
+        rows (list): 记录字典列表
+        profile (str, optional): 列配置文件，默认取Config.TOOL_OUTPUT_DEFAULT_PROFILE
+        output_format (str): columnar（表头+值数组）或 records（字典列表）
+        max_bytes (int, optional): 字节预算，默认取Config.TOOL_OUTPUT_MAX_BYTES，0表示不限制
+        max_text_length (int, optional): 单个文本字段最大长度，默认取Config.TOOL_OUTPUT_MAX_TEXT_LENGTH
+
+    Returns:
+        dict: 编码结果，包含 columns、rows、total_rows、returned_rows、truncated、bytes
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}，可选值: {', '.join(OUTPUT_FORMATS)}")
+    profile = profile or Config.TOOL_OUTPUT_DEFAULT_PROFILE
+    max_bytes = Config.TOOL_OUTPUT_MAX_BYTES if max_bytes is None else max_bytes
+    max_text_length = Config.TOOL_OUTPUT_MAX_TEXT_LENGTH if max_text_length is None else max_text_length
+
+    columns = select_columns(table, list(rows[0].keys()), profile) if rows else []
+    used_bytes = _encoded_size(columns)
+    encoded_rows = []
+    for row in rows:
+        values = [_compact_value(row.get(column), max_text_length) for column in columns]
+        encoded = values if output_format == "columnar" else dict(zip(columns, values))
+        row_bytes = _encoded_size(encoded) + 1
+        if max_bytes and used_bytes + row_bytes > max_bytes:
+            break
+        encoded_rows.append(encoded)
+        used_bytes += row_bytes
+
+    result = {
+        "rows": encoded_rows,
+        "total_rows": len(rows),
+        "returned_rows": len(encoded_rows),
+        "truncated": len(encoded_rows) < len(rows),
+        "bytes": used_bytes,
+        "approx_tokens": used_bytes // 4
+    }
+    if output_format == "columnar":
+        result = {"columns": columns, **result}
+    return result
+
+
+def encode_grouped_rows(table: str, rows_by_name: Dict[str, List[Dict]], profile: Optional[str] = None,
+                        output_format: str = "columnar", max_bytes: Optional[int] = None,
+                        max_text_length: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    按污染物分组编码查询结果，字节预算在各污染物之间平均分配
+
+    Args:
+        table (str): 数据表名
+        rows_by_name (dict): 污染物名称 -> 记录字典列表
+        profile (str, optional): 列配置文件
+        output_format (str): columnar 或 records
+        max_bytes (int, optional): 总字节预算，默认取Config.TOOL_OUTPUT_MAX_BYTES，0表示不限制
+        max_text_length (int, optional): 单个文本字段最大长度
+
+    Returns:
+        dict: 污染物名称 -> 编码结果
+    """
+    max_bytes = Config.TOOL_OUTPUT_MAX_BYTES if max_bytes is None else max_bytes
+    share = max(max_bytes // len(rows_by_name), 1) if max_bytes and rows_by_name else max_bytes
+    return {
+        name: encode_rows(table, rows, profile, output_format, share, max_text_length)
+        for name, rows in rows_by_name.items()
+    }